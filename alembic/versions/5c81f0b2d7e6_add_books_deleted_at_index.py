@@ -0,0 +1,35 @@
+"""Add partial index on deleted books
+
+Revision ID: 5c81f0b2d7e6
+Revises: e3a7c5d91f42
+Create Date: 2026-10-18 17:48:13.064221
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c81f0b2d7e6'
+down_revision: Union[str, Sequence[str], None] = 'e3a7c5d91f42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # очистка удалённых книг ищет их по дате удаления, индекс содержит только удалённые строки
+    op.create_index(
+        'ix_books_deleted_at',
+        'books',
+        ['deleted_at'],
+        unique=False,
+        postgresql_where=sa.text('deleted_at IS NOT NULL'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_books_deleted_at', table_name='books', postgresql_where=sa.text('deleted_at IS NOT NULL'))
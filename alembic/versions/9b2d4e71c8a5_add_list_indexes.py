@@ -0,0 +1,64 @@
+"""Add partial indexes for list filters
+
+Revision ID: 9b2d4e71c8a5
+Revises: c52e1a9f3d10
+Create Date: 2026-10-18 14:37:09.518342
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9b2d4e71c8a5'
+down_revision: Union[str, Sequence[str], None] = 'c52e1a9f3d10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Списки по умолчанию показывают только не удалённые записи и сортируются по (<колонка>, id),
+    # частичные индексы отдают первую страницу и страницы по курсору без сортировки всей таблицы
+    op.create_index(
+        'ix_books_active_title_id',
+        'books',
+        ['title', 'id'],
+        unique=False,
+        postgresql_where=sa.text('deleted_at IS NULL'),
+    )
+    op.create_index(
+        'ix_books_active_page_id',
+        'books',
+        ['page', 'id'],
+        unique=False,
+        postgresql_where=sa.text('deleted_at IS NULL'),
+    )
+    # фильтр по автору + сортировка по названию, он же обслуживает подсчёт книг в списке авторов
+    op.create_index(
+        'ix_books_active_author_id_title_id',
+        'books',
+        ['author_id', 'title', 'id'],
+        unique=False,
+        postgresql_where=sa.text('deleted_at IS NULL'),
+    )
+    # внешний ключ без индекса: списки с удалёнными книгами и проверки при удалении автора
+    op.create_index('ix_books_author_id', 'books', ['author_id'], unique=False)
+    op.create_index(
+        'ix_authors_active_name_id',
+        'authors',
+        ['name', 'id'],
+        unique=False,
+        postgresql_where=sa.text('deleted_at IS NULL'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_authors_active_name_id', table_name='authors', postgresql_where=sa.text('deleted_at IS NULL'))
+    op.drop_index('ix_books_author_id', table_name='books')
+    op.drop_index('ix_books_active_author_id_title_id', table_name='books', postgresql_where=sa.text('deleted_at IS NULL'))
+    op.drop_index('ix_books_active_page_id', table_name='books', postgresql_where=sa.text('deleted_at IS NULL'))
+    op.drop_index('ix_books_active_title_id', table_name='books', postgresql_where=sa.text('deleted_at IS NULL'))
@@ -0,0 +1,47 @@
+"""Add trigram search indexes
+
+Revision ID: c52e1a9f3d10
+Revises: b411876e0edd
+Create Date: 2026-10-18 10:12:41.305718
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c52e1a9f3d10'
+down_revision: Union[str, Sequence[str], None] = 'b411876e0edd'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # GIN-индексы по триграммам обслуживают ILIKE '%term%' и similarity() без seq scan
+    op.create_index(
+        'ix_books_title_trgm',
+        'books',
+        ['title'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_ops={'title': 'gin_trgm_ops'},
+    )
+    op.create_index(
+        'ix_authors_name_trgm',
+        'authors',
+        ['name'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_ops={'name': 'gin_trgm_ops'},
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_authors_name_trgm', table_name='authors', postgresql_using='gin')
+    op.drop_index('ix_books_title_trgm', table_name='books', postgresql_using='gin')
+    # расширение не удаляем: им могут пользоваться другие объекты БД
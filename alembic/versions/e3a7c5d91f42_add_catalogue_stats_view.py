@@ -0,0 +1,46 @@
+"""Add catalogue stats materialized view
+
+Revision ID: e3a7c5d91f42
+Revises: 9b2d4e71c8a5
+Create Date: 2026-10-18 16:05:22.731904
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3a7c5d91f42'
+down_revision: Union[str, Sequence[str], None] = '9b2d4e71c8a5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Статистика каталога по авторам для дашбордов (src/books/stats.py), обновляется фоном
+    op.execute("""
+        CREATE MATERIALIZED VIEW catalogue_stats AS
+        SELECT a.id AS author_id,
+               a.name AS author_name,
+               a.deleted_at IS NOT NULL AS author_deleted,
+               count(b.id) FILTER (WHERE b.deleted_at IS NULL) AS books_count,
+               count(b.id) FILTER (WHERE b.deleted_at IS NULL AND b.is_available) AS available_books_count,
+               count(b.id) FILTER (WHERE b.deleted_at IS NOT NULL) AS deleted_books_count,
+               coalesce(sum(m.images) FILTER (WHERE b.deleted_at IS NULL), 0)::bigint AS images_count
+        FROM authors a
+        LEFT JOIN books b ON b.author_id = a.id
+        LEFT JOIN (
+            SELECT entity_id, count(*) AS images FROM media WHERE entity_type = 'book' GROUP BY entity_id
+        ) m ON m.entity_id = b.id
+        GROUP BY a.id
+    """)
+    # уникальный индекс обязателен для REFRESH MATERIALIZED VIEW CONCURRENTLY
+    op.create_index('ix_catalogue_stats_author_id', 'catalogue_stats', ['author_id'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS catalogue_stats")
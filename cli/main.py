@@ -1,6 +1,9 @@
 import typer
 
 from cli.seed import seed_app
+from cli.stats import stats_app
+from cli.purge import purge_app
+from cli.tokens import tokens_app
 from cli.app_structure import app_structure
 
 # Импорт под-команд
@@ -8,6 +11,9 @@ app = typer.Typer(help="CLI управление проектом")
 
 # Регистрируем команды
 app.add_typer(seed_app, name="seed")
+app.add_typer(stats_app, name="stats")
+app.add_typer(purge_app, name="purge")
+app.add_typer(tokens_app, name="tokens")
 app.add_typer(app_structure, name="structure")
 
 if __name__ == "__main__":
@@ -0,0 +1,36 @@
+import typer
+
+from cli.seed import coro
+from src.books.purge import CataloguePurger
+from src.config import config
+from src.database import init_db, dispose
+
+purge_app = typer.Typer()
+
+
+@purge_app.command()
+@coro
+async def run(
+    days: int = typer.Option(
+        config.purge.retention_days, "--days", min=0, help="Удалять записи, удалённые больше N дней назад"
+    ),
+    batch_size: int = typer.Option(config.purge.batch_size, "--batch-size", min=1, help="Записей в одной транзакции"),
+    pause: float = typer.Option(config.purge.batch_pause, "--pause", min=0, help="Пауза между пачками (секунды)"),
+):
+    """Удалить из БД просроченные удалённые книги и авторов, запуск - python -m cli.main purge run --days 30"""
+    init_db()
+    from src.database import AsyncSessionLocal
+
+    async with AsyncSessionLocal() as db:
+        try:
+            stats = await CataloguePurger(db, days, batch_size, pause).run()
+            print(
+                f"✅ Удалено: книг {stats.books}, авторов {stats.authors}, картинок {stats.media} "
+                f"({stats.batches} пачек за {stats.elapsed:.2f} с)"
+            )
+            if stats.skipped_authors:
+                print(f"⚠️ Авторов с книгами оставлено: {stats.skipped_authors}")
+        except Exception as e:
+            print(f"❌ Ошибка: {e}")
+        finally:
+            await dispose()
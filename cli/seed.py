@@ -1,6 +1,7 @@
 import asyncio
 import typer
 from datetime import datetime
+from pathlib import Path
 from sqlalchemy import select
 
 from src.config import config, BASE_DIR
@@ -94,17 +95,27 @@ async def superadmin():
 
 @seed_app.command()
 @coro
-async def books():
-    """Запуск сидера для загрузки тестовых данных, запуск - python -m cli.main seed books"""
+async def books(
+    path: Path = typer.Argument(
+        BASE_DIR / "storage" / "book_data.json",
+        exists=True,
+        dir_okay=False,
+        help="Файл каталога: json-массив или NDJSON (читается потоково)",
+    ),
+    batch_size: int = typer.Option(config.importer.batch_size, "--batch-size", min=1, help="Книг в одной транзакции"),
+):
+    """Запуск сидера для загрузки тестовых данных, запуск - python -m cli.main seed books [PATH] --batch-size 1000"""
     init_db()
     from src.database import AsyncSessionLocal
 
     async with AsyncSessionLocal() as db:
-        path = BASE_DIR / "storage" / "book_data.json"
         service = BookService(db)
         try:
-            await service.import_json_to_db(path)
-            print("✅ Загружены книги")
+            stats = await service.import_json_to_db(path, batch_size)
+            print(
+                f"✅ Загружены книги: авторов {stats.authors}, книг {stats.books}, пропущено {stats.skipped} "
+                f"({stats.rows} строк за {stats.elapsed:.2f} с, {stats.rows_per_sec:.0f} строк/с)"
+            )
         except Exception as e:
             print(f"❌ Ошибка: {e}")
         finally:
@@ -0,0 +1,24 @@
+import typer
+
+from cli.seed import coro
+from src.books.stats import CatalogueStatsService
+from src.database import init_db, dispose
+
+stats_app = typer.Typer()
+
+
+@stats_app.command()
+@coro
+async def refresh():
+    """Пересчитать статистику каталога, запуск - python -m cli.main stats refresh"""
+    init_db()
+    from src.database import AsyncSessionLocal
+
+    async with AsyncSessionLocal() as db:
+        try:
+            elapsed = await CatalogueStatsService(db).refresh()
+            print(f"✅ Статистика каталога обновлена за {elapsed:.3f} с")
+        except Exception as e:
+            print(f"❌ Ошибка: {e}")
+        finally:
+            await dispose()
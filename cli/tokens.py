@@ -0,0 +1,68 @@
+import time
+from typing import Any, Callable
+
+import jwt
+import typer
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
+
+from src.auth.keys import KeyManager, SigningKey
+
+tokens_app = typer.Typer()
+
+PAYLOAD = {"sub": "1", "username": "bench", "email": "bench@example.com", "type": "access"}
+
+
+def ops_per_second(func: Callable[[], Any], iterations: int) -> float:
+    started_at = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return iterations / (time.perf_counter() - started_at)
+
+
+def pem(private_key) -> tuple[bytes, bytes]:
+    private = private_key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    )
+    public = private_key.public_key().public_bytes(
+        serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+    )
+    return private, public
+
+
+@tokens_app.command()
+def bench(iterations: int = typer.Option(2000, "--iterations", "-n", help="Сколько подписей и проверок на алгоритм")):
+    """
+    Скорость подписи и проверки JWT на этой машине, запуск - python -m cli.main tokens bench
+
+    RS256 (PEM) - как раньше: PyJWT разбирает PEM на каждый вызов;
+    остальные - через KeyManager с заранее разобранными ключами.
+    """
+    keys = {
+        "RS256": rsa.generate_private_key(public_exponent=65537, key_size=2048),
+        "ES256": ec.generate_private_key(ec.SECP256R1()),
+        "EdDSA": ed25519.Ed25519PrivateKey.generate(),
+    }
+
+    private_pem, public_pem = pem(keys["RS256"])
+    token = jwt.encode(PAYLOAD, private_pem, algorithm="RS256")
+    results = [(
+        "RS256 (PEM)",
+        ops_per_second(lambda: jwt.encode(PAYLOAD, private_pem, algorithm="RS256"), iterations),
+        ops_per_second(lambda: jwt.decode(token, public_pem, algorithms=["RS256"]), iterations),
+        len(token),
+    )]
+
+    for algorithm, private_key in keys.items():
+        manager = KeyManager([SigningKey.create(private_key.public_key(), private_key, algorithm)])
+        token = manager.sign(PAYLOAD)
+        results.append((
+            algorithm,
+            ops_per_second(lambda: manager.sign(PAYLOAD), iterations),
+            ops_per_second(lambda: manager.verify(token), iterations),
+            len(token),
+        ))
+
+    print(f"{'Алгоритм':<14}{'подпись/с':>12}{'проверка/с':>13}{'токен, байт':>14}")
+    for name, sign, verify, size in results:
+        print(f"{name:<14}{sign:>12.0f}{verify:>13.0f}{size:>14}")
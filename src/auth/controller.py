@@ -1,7 +1,8 @@
-from fastapi import APIRouter, status, Depends
+from fastapi import APIRouter, Response, status, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
 from src.auth.dependencies import AuthServiceDep, CurrentUserDep
+from src.auth.keys import get_key_manager
 from src.users.models import User
 from src.users.schemas import (
     UserRegister,
@@ -63,14 +64,28 @@ async def current_user(
     status_code=status.HTTP_200_OK,
     response_model=TokenResponse
 )
-def refresh_tokens(
+async def refresh_tokens(
     service: AuthServiceDep,
     credentials: HTTPAuthorizationCredentials = Depends(http_bearer),
 ) -> TokenResponse:
-    """Обновление токенов"""
+    """Обновление токенов (refresh-токен одноразовый, в ответе - новый)"""
     token = credentials.credentials
 
-    return service.refresh_tokens(token)
+    return await service.refresh_tokens(token)
+
+@router.post(
+    "/logout",
+    summary="Выход (отзыв refresh-токена)",
+    status_code=status.HTTP_200_OK,
+    response_model=SuccessResponse
+)
+async def logout(
+    service: AuthServiceDep,
+    credentials: HTTPAuthorizationCredentials = Depends(http_bearer),
+    all_devices: bool = False,
+) -> SuccessResponse:
+    """Выход: отзыв refresh-токена, all_devices - отзыв всех refresh-токенов пользователя"""
+    return await service.logout(credentials.credentials, all_devices=all_devices)
 
 @router.get(
     "/verify-email",
@@ -109,4 +124,14 @@ async def reset_password(
 ) -> SuccessResponse:
     """Обновление пароля"""
 
-    return await service.reset_password(data)
\ No newline at end of file
+    return await service.reset_password(data)
+
+@router.get(
+    "/.well-known/jwks.json",
+    summary="Публичные ключи для проверки токенов (JWKS)",
+    status_code=status.HTTP_200_OK,
+)
+async def jwks(response: Response) -> dict:
+    """Публичные ключи (текущий и ключи до ротации) для проверки токенов другими сервисами"""
+    response.headers["Cache-Control"] = "public, max-age=300"
+    return get_key_manager().jwks()
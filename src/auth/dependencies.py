@@ -4,6 +4,7 @@ from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from jwt import InvalidTokenError
 
 from src.auth.exceptions import UnauthorizedError
+from src.auth.principal import Principal
 from src.auth.service import AuthService
 from src.database import DbSessionDep
 from src.users.models import User
@@ -29,3 +30,17 @@ async def get_current_user(
         raise UnauthorizedError(detail=str(err))
 
 CurrentUserDep = Annotated[User, Depends(get_current_user)]
+
+
+async def get_current_principal(
+    service: AuthServiceDep,
+    credentials: HTTPAuthorizationCredentials = Depends(http_bearer),
+) -> Principal:
+    """Данные авторизации текущего пользователя (из кеша, без ORM-моделей)"""
+    token = credentials.credentials
+    try:
+        return await service.current_principal(token)
+    except InvalidTokenError as err:
+        raise UnauthorizedError(detail=str(err))
+
+CurrentPrincipalDep = Annotated[Principal, Depends(get_current_principal)]
@@ -5,4 +5,11 @@ class UnauthorizedError(HTTPException):
         super().__init__(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail=detail
-        )
\ No newline at end of file
+        )
+
+class PasswordHasherBusyError(HTTPException):
+    def __init__(self, detail: str = 'Too many authentication requests, try again later'):
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=detail
+        )
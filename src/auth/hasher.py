@@ -0,0 +1,104 @@
+"""
+Хеширование паролей (bcrypt) вне event loop.
+
+bcrypt считает хеш десятки-сотни миллисекунд и отпускает GIL, поэтому хеширование
+и проверка пароля выполняются в пуле потоков: обработчики register/login/reset_password
+не блокируют остальные запросы воркера.
+
+Одновременно считается не больше config.password.workers хешей, ещё до
+config.password.max_pending операций ждут свободный поток; сверх этого запрос
+получает 503 (PasswordHasherBusyError), а не растущую очередь при всплеске входов.
+
+Время ожидания в очереди и время расчёта - метрика app_password_hash_seconds
+(отдаётся на /__internal_metrics__).
+
+При изменении config.password.rounds пароль перехешируется при успешном входе (needs_rehash).
+"""
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, TypeVar
+
+from prometheus_client import Histogram
+
+from src.auth.exceptions import PasswordHasherBusyError
+from src.auth.utils import check_password, hash_password
+from src.config import config
+
+T = TypeVar("T")
+
+PASSWORD_HASH_SECONDS = Histogram(
+    "app_password_hash_seconds",
+    "Хеширование паролей: ожидание в очереди (queue) и расчёт (run)",
+    ["operation", "stage"],
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+)
+
+
+class PasswordHasher:
+    def __init__(self, rounds: int | None = None, workers: int | None = None, max_pending: int | None = None):
+        """
+        Args:
+            rounds: Стоимость bcrypt для новых хешей
+            workers: Сколько хешей считается одновременно
+            max_pending: Сколько операций может ждать свободный поток
+        """
+        self.rounds = rounds or config.password.rounds
+        self.workers = workers or config.password.workers
+        self.max_pending = config.password.max_pending if max_pending is None else max_pending
+        self._executor: ThreadPoolExecutor | None = None
+        # операции в пуле (выполняются и ждут), меняется только из event loop
+        self._pending = 0
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="password-hasher")
+        return self._executor
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    async def hash(self, password: str) -> bytes:
+        return await self._run("hash", hash_password, password, self.rounds)
+
+    async def verify(self, password: str, hashed_password: bytes) -> bool:
+        return await self._run("verify", check_password, password, hashed_password)
+
+    def needs_rehash(self, hashed_password: bytes) -> bool:
+        """Хеш посчитан с другой стоимостью ($2b$<rounds>$...)"""
+        try:
+            return int(hashed_password.split(b"$")[2]) != self.rounds
+        except (IndexError, ValueError):
+            return True
+
+    async def _run(self, operation: str, func: Callable[..., T], *args) -> T:
+        if self._pending >= self.workers + self.max_pending:
+            raise PasswordHasherBusyError()
+
+        submitted_at = time.perf_counter()
+
+        def call() -> T:
+            started_at = time.perf_counter()
+            PASSWORD_HASH_SECONDS.labels(operation, "queue").observe(started_at - submitted_at)
+            try:
+                return func(*args)
+            finally:
+                PASSWORD_HASH_SECONDS.labels(operation, "run").observe(time.perf_counter() - started_at)
+
+        self._pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self.executor, call)
+        finally:
+            self._pending -= 1
+
+    def shutdown(self) -> None:
+        """Остановить пул (при остановке приложения)"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasher()
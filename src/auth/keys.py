@@ -0,0 +1,143 @@
+"""
+Ключи подписи JWT.
+
+Ключи читаются из PEM и разбираются один раз (KeyManager.from_config), дальше PyJWT
+получает готовые объекты ключей cryptography и не разбирает PEM на каждую подпись и проверку.
+
+Ротация ключей: токены подписываются текущим ключом (config.auth.private_key_path),
+в заголовок токена пишется его kid. Публичные ключи из config.auth.previous_public_key_paths
+принимаются только для проверки - пока не истекут токены, выданные старым ключом.
+Токены без kid (выданные до ротации) проверяются текущим ключом.
+
+Все публичные ключи отдаются в формате JWKS на /auth/.well-known/jwks.json.
+"""
+
+import base64
+import hashlib
+import json
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+import jwt
+from cryptography.hazmat.primitives.asymmetric import ec, ed448, ed25519, rsa
+from cryptography.hazmat.primitives.serialization import load_pem_private_key, load_pem_public_key
+from jwt.algorithms import get_default_algorithms
+
+from src.config import config
+
+# обязательные поля JWK для отпечатка ключа (RFC 7638)
+THUMBPRINT_MEMBERS = {
+    "RSA": ("e", "kty", "n"),
+    "EC": ("crv", "kty", "x", "y"),
+    "OKP": ("crv", "kty", "x"),
+}
+
+
+def default_algorithm(public_key: Any) -> str:
+    """Алгоритм подписи по типу ключа (для ключей из previous_public_key_paths)"""
+    if isinstance(public_key, rsa.RSAPublicKey):
+        return "RS256"
+    if isinstance(public_key, ec.EllipticCurvePublicKey):
+        return {256: "ES256", 384: "ES384", 521: "ES512"}[public_key.curve.key_size]
+    if isinstance(public_key, (ed25519.Ed25519PublicKey, ed448.Ed448PublicKey)):
+        return "EdDSA"
+    raise ValueError(f"Unsupported key type: {type(public_key).__name__}")
+
+
+@dataclass(frozen=True, slots=True)
+class SigningKey:
+    """Разобранный ключ подписи"""
+
+    kid: str
+    algorithm: str
+    public_key: Any
+    private_key: Any = None  # None - ключ только для проверки
+
+    @classmethod
+    def create(cls, public_key: Any, private_key: Any = None, algorithm: str | None = None) -> "SigningKey":
+        """Ключ с kid - отпечатком публичного ключа"""
+        algorithm = algorithm or default_algorithm(public_key)
+        return cls(
+            kid=thumbprint(public_jwk(public_key, algorithm)),
+            algorithm=algorithm,
+            public_key=public_key,
+            private_key=private_key,
+        )
+
+    def to_jwk(self) -> dict:
+        return {
+            **public_jwk(self.public_key, self.algorithm),
+            "kid": self.kid,
+            "alg": self.algorithm,
+            "use": "sig",
+        }
+
+
+def public_jwk(public_key: Any, algorithm: str) -> dict:
+    return get_default_algorithms()[algorithm].to_jwk(public_key, as_dict=True)
+
+
+def thumbprint(jwk: dict) -> str:
+    """Отпечаток ключа (RFC 7638) - base64url(sha256) от обязательных полей JWK"""
+    members = {name: jwk[name] for name in THUMBPRINT_MEMBERS[jwk["kty"]]}
+    digest = hashlib.sha256(json.dumps(members, separators=(",", ":"), sort_keys=True).encode()).digest()
+    return base64.urlsafe_b64encode(digest).rstrip(b"=").decode()
+
+
+class KeyManager:
+    def __init__(self, keys: list[SigningKey]):
+        """
+        Args:
+            keys: Ключи, первый - текущий (им подписываются токены), остальные - только для проверки
+        """
+        if not keys or keys[0].private_key is None:
+            raise ValueError("Current signing key must have a private key")
+
+        self.current = keys[0]
+        self._keys = {key.kid: key for key in keys}
+
+    @classmethod
+    def from_config(cls) -> "KeyManager":
+        """Текущий ключ и ключи для проверки из config.auth"""
+        private_key = load_pem_private_key(config.auth.private_key_path.read_bytes(), password=None)
+        current = SigningKey.create(private_key.public_key(), private_key, config.auth.algorithm)
+        if config.auth.key_id:
+            current = SigningKey(config.auth.key_id, current.algorithm, current.public_key, private_key)
+
+        previous = [
+            SigningKey.create(load_pem_public_key(Path(path).read_bytes()))
+            for path in config.auth.previous_public_key_paths
+        ]
+        return cls([current, *previous])
+
+    @property
+    def keys(self) -> list[SigningKey]:
+        return list(self._keys.values())
+
+    def sign(self, payload: dict) -> str:
+        return jwt.encode(
+            payload,
+            self.current.private_key,
+            algorithm=self.current.algorithm,
+            headers={"kid": self.current.kid},
+        )
+
+    def verify(self, token: str | bytes) -> dict:
+        """Проверить подпись и срок действия, вернуть claims"""
+        kid = jwt.get_unverified_header(token).get("kid")
+        key = self._keys.get(kid) if kid else self.current
+        if key is None:
+            raise jwt.InvalidTokenError("Unknown signing key")
+
+        return jwt.decode(token, key.public_key, algorithms=[key.algorithm])
+
+    def jwks(self) -> dict:
+        return {"keys": [key.to_jwk() for key in self._keys.values()]}
+
+
+@lru_cache
+def get_key_manager() -> KeyManager:
+    """Ключи приложения (читаются при первом обращении)"""
+    return KeyManager.from_config()
@@ -0,0 +1,220 @@
+"""
+Данные авторизации текущего пользователя (Principal) и их кеш.
+
+Проверке прав на каждый запрос нужны только флаги пользователя и набор прав его роли,
+а не ORM-модели users/roles/permissions. Principal - неизменяемый снимок этих данных.
+
+Кеш двухуровневый:
+ - в памяти процесса на config.principal.ttl секунд (без обращений к Redis и БД);
+ - в Redis (если кеш данных включён) на config.principal.redis_ttl секунд,
+   с версией пространства имён principals.
+
+Изменения ролей и прав (RbacService) вызывают invalidate_all(): кеш процесса очищается,
+версия в Redis увеличивается. Остальные процессы увидят изменения не позже чем через ttl секунд.
+
+Режим config.auth.permission_claims: права роли записываются в access-токен битовой маской
+(to_claims) вместе с версией principals на момент выдачи. Пока версия в Redis не изменилась,
+Principal собирается из проверенных claims (from_claims) без кеша и БД; после изменения ролей
+токен проверяется обычным путём. Флаги пользователя (is_active, is_deleted) в claims не пишутся
+и в этом режиме не перепроверяются до истечения access-токена (config.auth.access_token_expired):
+код, который блокирует или удаляет пользователя, должен вызвать invalidate_principals() -
+версия увеличится, и токены перестанут проходить по claims.
+"""
+
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from typing import Awaitable, Callable
+
+from src.config import config
+from src.core.cache import RedisCache, is_cache_enabled
+from src.rbac.compiled import role_registry
+from src.rbac.permissions import (
+    DefaultRole,
+    PERMISSIONS_LAYOUT,
+    mask_to_permissions,
+    permissions_to_mask,
+)
+from src.users.models import User
+
+# claims access-токена в режиме permission_claims
+ROLE_ID_CLAIM = "rid"
+ROLE_CLAIM = "role"
+PERMISSIONS_CLAIM = "perms"  # битовая маска прав (src/rbac/permissions.py)
+LAYOUT_CLAIM = "pl"  # раскладка битов маски (PERMISSIONS_LAYOUT)
+VERSION_CLAIM = "rv"  # версия principals при выдаче токена
+
+
+@dataclass(frozen=True, slots=True)
+class Principal:
+    """Снимок пользователя для авторизации"""
+
+    id: int
+    role_id: int
+    role_alias: str
+    is_superadmin: bool
+    is_active: bool
+    is_deleted: bool
+    permissions: frozenset[str]
+    mask: int = field(init=False, compare=False)  # биты прав (PERMISSION_BITS)
+
+    def __post_init__(self):
+        object.__setattr__(self, "mask", permissions_to_mask(self.permissions))
+
+    @classmethod
+    def from_user(cls, user: User) -> "Principal":
+        """Собрать из пользователя с загруженной ролью и правами"""
+        role = user.role.compiled
+        return cls(
+            id=user.id,
+            role_id=user.role_id,
+            role_alias=role.alias,
+            is_superadmin=role.is_superadmin,
+            is_active=user.is_active,
+            is_deleted=user.is_deleted,
+            permissions=role.permissions,
+        )
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Principal":
+        return cls(**{**data, "permissions": frozenset(data["permissions"])})
+
+    def to_dict(self) -> dict:
+        data = {**asdict(self), "permissions": sorted(self.permissions)}
+        del data["mask"]
+        return data
+
+    def to_claims(self, version: int) -> dict:
+        """Claims access-токена с правами роли"""
+        return {
+            ROLE_ID_CLAIM: self.role_id,
+            ROLE_CLAIM: self.role_alias,
+            PERMISSIONS_CLAIM: self.mask,
+            LAYOUT_CLAIM: PERMISSIONS_LAYOUT,
+            VERSION_CLAIM: version,
+        }
+
+    @classmethod
+    def from_claims(cls, payload: dict) -> "Principal":
+        """Собрать из проверенного access-токена (флаги пользователя - как при выдаче токена)"""
+        return cls(
+            id=int(payload["sub"]),
+            role_id=payload[ROLE_ID_CLAIM],
+            role_alias=payload[ROLE_CLAIM],
+            is_superadmin=payload[ROLE_CLAIM] == DefaultRole.SUPERADMIN.value,
+            is_active=True,
+            is_deleted=False,
+            permissions=mask_to_permissions(payload[PERMISSIONS_CLAIM]),
+        )
+
+    def has_permission(self, permission_alias: str) -> bool:
+        """Проверка прав: если superadmin или есть нужный алиас в правах роли"""
+        return self.is_superadmin or permission_alias in self.permissions
+
+    def allows(self, bit: int) -> bool:
+        """Проверка прав по биту права (PERMISSION_BITS)"""
+        return self.is_superadmin or bool(self.mask & bit)
+
+
+def is_principal_cache_enabled() -> bool:
+    """В тестах выключен: права ролей меняются напрямую через БД, в обход RbacService"""
+    return config.principal.ttl > 0 and not config.app.is_testing_env
+
+
+class PrincipalCache:
+    def __init__(self, ttl: int | None = None, max_size: int | None = None):
+        """
+        Args:
+            ttl: Сколько секунд Principal хранится в памяти процесса
+            max_size: Сколько пользователей хранится в памяти (давно не запрашиваемые вытесняются)
+        """
+        self.ttl = config.principal.ttl if ttl is None else ttl
+        self.max_size = max_size or config.principal.max_size
+        # user_id -> (истекает в, principal); порядок - от давно запрошенных к недавним
+        self._items: OrderedDict[int, tuple[float, Principal | None]] = OrderedDict()
+        # (истекает в, версия principals в Redis)
+        self._version: tuple[float, int | None] = (0.0, None)
+
+    async def get(
+            self,
+            user_id: int,
+            loader: Callable[[], Awaitable[Principal | None]],
+            redis: RedisCache | None = None,
+    ) -> Principal | None:
+        """
+        Principal пользователя: из памяти, затем из Redis (если передан), при промахе - loader() (БД)
+
+        Args:
+            user_id: id пользователя
+            loader: Загрузка из БД, None - пользователь не найден
+            redis: Кеш второго уровня
+        """
+        item = self._items.get(user_id)
+        if item and item[0] > time.monotonic():
+            self._items.move_to_end(user_id)
+            return item[1]
+
+        if redis is None:
+            principal = await loader()
+        else:
+            async def load() -> dict | None:
+                loaded = await loader()
+                return loaded.to_dict() if loaded else None
+
+            data = await redis.remember(
+                config.cache.namespace.principals, "principal", user_id, config.principal.redis_ttl, load
+            )
+            principal = Principal.from_dict(data) if data else None
+
+        self._set(user_id, principal)
+        return principal
+
+    def _set(self, user_id: int, principal: Principal | None) -> None:
+        self._items[user_id] = (time.monotonic() + self.ttl, principal)
+        self._items.move_to_end(user_id)
+
+        while len(self._items) > self.max_size:
+            self._items.popitem(last=False)
+
+    async def version(self, redis: RedisCache) -> int | None:
+        """Версия principals в Redis (запрашивается не чаще раза в ttl секунд), None - Redis недоступен"""
+        expires_at, version = self._version
+        if expires_at > time.monotonic():
+            return version
+
+        version = await redis.version(config.cache.namespace.principals)
+        self._version = (time.monotonic() + self.ttl, version)
+        return version
+
+    async def invalidate_all(self, redis: RedisCache | None = None) -> None:
+        """Сбросить кеш всех пользователей (изменились роли или права)"""
+        self._items.clear()
+        self._version = (0.0, None)
+        role_registry.clear()
+        if redis is not None:
+            await redis.bump(config.cache.namespace.principals)
+
+
+principal_cache = PrincipalCache()
+
+
+async def invalidate_principals() -> None:
+    """Сбросить кеш авторизации после изменения ролей, прав или пользователей"""
+    await principal_cache.invalidate_all(RedisCache() if is_cache_enabled() else None)
+
+
+async def current_version() -> int | None:
+    """Версия principals для claims токена, None - режим claims недоступен (кеш выключен, Redis недоступен)"""
+    if not config.auth.permission_claims or not is_cache_enabled():
+        return None
+    return await principal_cache.version(RedisCache())
+
+
+def is_valid_claims(payload: dict, version: int | None) -> bool:
+    """Можно ли авторизовать по claims токена: права записаны при текущей версии и раскладке"""
+    return (
+        version is not None
+        and PERMISSIONS_CLAIM in payload
+        and payload.get(VERSION_CLAIM) == version
+        and payload.get(LAYOUT_CLAIM) == PERMISSIONS_LAYOUT
+    )
@@ -0,0 +1,172 @@
+"""
+Отзыв refresh-токенов.
+
+Каждый refresh-токен получает jti и семейство (fam): семейство выдаётся при входе
+и переходит к новым токенам при обновлении. Обновление токенов одноразовое (ротация):
+jti использованного токена помечается в Redis (SET NX), повторное предъявление того же токена
+означает его утечку - отзывается всё семейство (reuse detection).
+
+Отзыв хранится в Redis до истечения токенов:
+ - семейство - выход (logout) и повторное использование токена;
+ - пользователь - выход на всех устройствах и сброс пароля: отзываются токены, выданные до этого момента.
+
+Проверка отзыва идёт через фильтр Блума в памяти процесса: в обычном случае
+("не отозван") запроса к Redis нет, в Redis проверяются только срабатывания фильтра.
+Фильтр заполняется из Redis при старте, новые отзывы приходят от других воркеров
+через pub/sub (run()), раз в config.revocation.rebuild_interval секунд фильтр
+пересобирается, и истёкшие записи из него выпадают.
+
+Недоступность Redis не блокирует вход и выход: проверки и отзыв пропускаются с предупреждением в логе.
+Access-токены не отзываются и действуют до своего exp (config.auth.access_token_expired).
+"""
+
+import asyncio
+import hashlib
+import time
+import uuid
+
+from loguru import logger
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from src.config import config
+from src.core.bloom import BloomFilter
+from src.core.cache import cache_key
+from src.core.dependencies.redis import get_redis
+
+JTI_FIELD = "jti"
+FAMILY_FIELD = "fam"
+
+
+def is_revocation_enabled() -> bool:
+    """В тестах выключен: сервер Redis не поднимается"""
+    return config.revocation.enabled and not config.app.is_testing_env
+
+
+def new_token_id() -> str:
+    return uuid.uuid4().hex
+
+
+def token_id(token: str, payload: dict) -> str:
+    """jti токена (у токенов, выданных до появления jti - хеш токена)"""
+    return payload.get(JTI_FIELD) or hashlib.sha256(token.encode()).hexdigest()
+
+
+def token_family(token: str, payload: dict) -> str:
+    """Семейство токена (у токенов, выданных до появления семейств - jti)"""
+    return payload.get(FAMILY_FIELD) or token_id(token, payload)
+
+
+def token_ttl(payload: dict) -> int:
+    """Сколько секунд токен ещё действует (столько хранятся записи о нём)"""
+    return max(1, int(payload["exp"] - time.time()))
+
+
+class RevocationStore:
+    def __init__(self, redis: Redis | None = None):
+        self._redis = redis
+        self.channel = cache_key("revoked")
+        self.bloom = self._new_bloom()
+
+    @property
+    def redis(self) -> Redis:
+        if self._redis is None:
+            self._redis = get_redis()
+        return self._redis
+
+    @staticmethod
+    def _new_bloom() -> BloomFilter:
+        return BloomFilter(config.revocation.bloom_capacity, config.revocation.bloom_error_rate)
+
+    @staticmethod
+    def family_key(family: str) -> str:
+        return cache_key("revoked", "family", family)
+
+    @staticmethod
+    def user_key(user_id: int | str) -> str:
+        return cache_key("revoked", "user", user_id)
+
+    async def is_revoked(self, token: str, payload: dict) -> bool:
+        """Отозван ли refresh-токен (семейство или все токены пользователя)"""
+        family_key = self.family_key(token_family(token, payload))
+        user_key = self.user_key(payload["sub"])
+
+        # ✨ Обычный случай - обоих ключей нет в фильтре, Redis не нужен
+        if family_key not in self.bloom and user_key not in self.bloom:
+            return False
+
+        try:
+            family_revoked, user_revoked_at = await self.redis.mget(family_key, user_key)
+        except RedisError as e:
+            logger.warning(f"Revocation check failed: {e}")
+            return False
+
+        if family_revoked is not None:
+            return True
+        # int(float()) - записи, сохранённые до перехода на целые секунды
+        return user_revoked_at is not None and payload["iat"] < int(float(user_revoked_at))
+
+    async def consume(self, token: str, payload: dict) -> bool:
+        """Пометить токен использованным, False - токен уже использовали (повторное предъявление)"""
+        try:
+            return bool(await self.redis.set(
+                cache_key("used", token_id(token, payload)), 1, ex=token_ttl(payload), nx=True
+            ))
+        except RedisError as e:
+            logger.warning(f"Refresh token rotation check failed: {e}")
+            return True
+
+    async def revoke_family(self, family: str) -> None:
+        """
+        Отозвать все токены семейства (выход с устройства, утечка токена).
+        Запись хранится полный срок жизни refresh-токена: токены семейства, выданные позже
+        предъявленного, действуют дольше него
+        """
+        await self._revoke(self.family_key(family), 1, config.auth.refresh_token_expired * 60)
+
+    async def revoke_user(self, user_id: int) -> None:
+        """
+        Отозвать все refresh-токены пользователя, выданные до этого момента.
+        iat токена - целые секунды: токены, выданные в ту же секунду (вход сразу после сброса пароля), действуют
+        """
+        await self._revoke(self.user_key(user_id), int(time.time()), config.auth.refresh_token_expired * 60)
+
+    async def _revoke(self, key: str, value, ttl: int) -> None:
+        self.bloom.add(key)
+        try:
+            await self.redis.set(key, value, ex=ttl)
+            # остальные воркеры добавят ключ в свои фильтры
+            await self.redis.publish(self.channel, key)
+        except RedisError as e:
+            logger.warning(f"Token revocation failed [{key}]: {e}")
+
+    async def rebuild(self) -> None:
+        """Пересобрать фильтр из записей об отзыве в Redis"""
+        bloom = self._new_bloom()
+        async for key in self.redis.scan_iter(match=cache_key("revoked", "*"), count=1000):
+            bloom.add(key.decode() if isinstance(key, bytes) else key)
+        self.bloom = bloom
+
+    async def run(self) -> None:
+        """Получать отзывы других воркеров и пересобирать фильтр до отмены задачи"""
+        while True:
+            try:
+                async with self.redis.pubsub() as pubsub:
+                    # подписка до сборки фильтра: отзывы во время сборки не теряются
+                    await pubsub.subscribe(self.channel)
+                    await self.rebuild()
+                    rebuild_at = time.monotonic() + config.revocation.rebuild_interval
+
+                    while True:
+                        message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                        if message:
+                            self.bloom.add(message["data"].decode())
+                        if time.monotonic() > rebuild_at:
+                            await self.rebuild()
+                            rebuild_at = time.monotonic() + config.revocation.rebuild_interval
+            except RedisError as e:
+                logger.warning(f"Revocation listener failed: {e}")
+                await asyncio.sleep(5)
+
+
+revocation_store = RevocationStore()
@@ -10,6 +10,22 @@ from src.notifications.send_email import (
     send_email_reset_password
 )
 from src.auth import utils as auth_utils
+from src.auth.hasher import password_hasher
+from src.auth.revocation import (
+    is_revocation_enabled,
+    revocation_store,
+    token_family,
+)
+from src.auth.token_cache import verified_tokens
+from src.config import config
+from src.auth.principal import (
+    Principal,
+    current_version,
+    is_principal_cache_enabled,
+    is_valid_claims,
+    principal_cache,
+)
+from src.core.cache import RedisCache, is_cache_enabled
 from src.users.service import UserService
 from src.users.models import User
 from src.rbac.models import Role
@@ -59,7 +75,7 @@ class AuthService:
 
         model = User(**data.model_dump())
 
-        model.password = auth_utils.hash_password(data.password)
+        model.password = await password_hasher.hash(data.password)
         model.role_id = role.id
 
         self.session.add(model)
@@ -90,31 +106,51 @@ class AuthService:
                 not user
                 or not user.is_active
                 or user.deleted_at is not None
-                or not auth_utils.check_password(data.password, user.password)
+                or not await password_hasher.verify(data.password, user.password)
             ):
             raise UnauthorizedError(detail="Invalid credentials")
 
+        # ✨ Стоимость bcrypt изменилась (config.password.rounds) - пароль известен, перехешируем
+        if password_hasher.needs_rehash(user.password):
+            user.password = await password_hasher.hash(data.password)
+            await self.session.commit()
+
+        if config.auth.permission_claims:
+            # для claims нужны роль и права пользователя
+            user = await self.user_service.find_by_id(id=user.id)
+
         return TokenResponse(
             token_type="Bearer",
-            access_token=self._create_access_token(user),
+            access_token=await self._create_access_token_with_claims(user),
             refresh_token=auth_utils.create_refresh_token({"sub": str(user.id)}),
         )
 
-    def _create_access_token(self, user: User)->str:
+    def _create_access_token(self, user: User, version: int | None = None)->str:
         payload = {
             "sub": str(user.id),
             "username": user.username,
             "email": user.email,
         }
 
+        # ✨ Права роли в токене (режим permission_claims), user - с загруженной ролью и правами
+        if version is not None:
+            payload.update(Principal.from_user(user).to_claims(version))
+
         return auth_utils.create_access_token(payload)
 
+    async def _create_access_token_with_claims(self, user: User) -> str:
+        """Access-токен, в режиме permission_claims - с правами роли (user - с загруженной ролью и правами)"""
+        return self._create_access_token(user, await current_version())
+
     async def refresh_tokens(self, token: str) -> TokenResponse:
         payload = auth_utils.decode_jwt(token=token)
 
         if payload.get(TOKEN_TYPE_FIELD) != REFRESH_TOKEN_TYPE:
             raise UnauthorizedError(detail="Invalid token type")
 
+        if is_revocation_enabled():
+            await self._use_refresh_token(token, payload)
+
         user = await self.user_service.find_by_id(id=int(payload.get("sub")))
 
         if (
@@ -124,21 +160,44 @@ class AuthService:
             ):
             raise UnauthorizedError(detail="Invalid credentials")
 
-        payload = {
-            "sub": str(user.id),
-            "username": user.username,
-            "email": user.email,
-        }
-
         return TokenResponse(
             token_type="Bearer",
-            access_token=auth_utils.create_access_token(payload),
-            refresh_token=auth_utils.create_refresh_token({"sub": str(user.id)}),
+            access_token=await self._create_access_token_with_claims(user),
+            refresh_token=auth_utils.create_refresh_token(
+                {"sub": str(user.id)}, family=token_family(token, payload)
+            ),
         )
 
-    async def current_user(self, token: str)->User | None :
+    async def _use_refresh_token(self, token: str, payload: dict) -> None:
+        """Проверить отзыв и пометить refresh-токен использованным (src/auth/revocation.py)"""
+        if await revocation_store.is_revoked(token, payload):
+            raise UnauthorizedError(detail="Token revoked")
+
+        # ✨ Токен уже обменивали - он утёк: отзываем всё семейство, включая выданный по нему токен
+        if not await revocation_store.consume(token, payload):
+            await revocation_store.revoke_family(token_family(token, payload))
+            logger.warning(f"Refresh token reuse detected, user {payload.get('sub')}")
+            raise UnauthorizedError(detail="Token revoked")
+
+    async def logout(self, token: str, all_devices: bool = False) -> SuccessResponse:
+        """Отозвать refresh-токен (его семейство) или все refresh-токены пользователя"""
         payload = auth_utils.decode_jwt(token=token)
 
+        if payload.get(TOKEN_TYPE_FIELD) != REFRESH_TOKEN_TYPE:
+            raise UnauthorizedError(detail="Invalid token type")
+
+        if is_revocation_enabled():
+            if all_devices:
+                await revocation_store.revoke_user(int(payload.get("sub")))
+            else:
+                await revocation_store.revoke_family(token_family(token, payload))
+
+        return SuccessResponse(msg="Logged out")
+
+    async def current_user(self, token: str)->User | None :
+        # ✨ Подпись повторно присланного токена не проверяется (src/auth/token_cache.py)
+        payload = verified_tokens.decode(token)
+
         if payload.get(TOKEN_TYPE_FIELD) != ACCESS_TOKEN_TYPE:
             raise UnauthorizedError(detail="Invalid token type")
 
@@ -153,6 +212,40 @@ class AuthService:
 
         return user
 
+    async def current_principal(self, token: str) -> Principal:
+        """
+        Данные авторизации по access-токену. Кешируются (src/auth/principal.py),
+        поэтому проверка прав обычно обходится без запроса к БД
+        """
+        payload = verified_tokens.decode(token)
+
+        if payload.get(TOKEN_TYPE_FIELD) != ACCESS_TOKEN_TYPE:
+            raise UnauthorizedError(detail="Invalid token type")
+
+        # ✨ Режим permission_claims: права берутся из токена, если роли не менялись после его выдачи
+        if is_valid_claims(payload, await current_version()):
+            return Principal.from_claims(payload)
+
+        user_id = int(payload.get("sub"))
+
+        async def load() -> Principal | None:
+            user = await self.user_service.find_by_id(id=user_id)
+            return Principal.from_user(user) if user else None
+
+        if is_principal_cache_enabled():
+            principal = await principal_cache.get(user_id, load, RedisCache() if is_cache_enabled() else None)
+        else:
+            principal = await load()
+
+        if (
+                not principal
+                or not principal.is_active
+                or principal.is_deleted
+            ):
+            raise UnauthorizedError(detail="Invalid credentials")
+
+        return principal
+
     async def verify_email(self, token: str)-> SuccessResponse:
         payload = auth_utils.decode_jwt(token=token)
 
@@ -221,12 +314,16 @@ class AuthService:
         ):
             raise UserNotFoundError()
 
-        model.password = auth_utils.hash_password(data.password)
+        model.password = await password_hasher.hash(data.password)
 
         self.session.add(model)
         await self.session.commit()
         await self.session.refresh(model)
 
+        # после сброса пароля входы со старыми refresh-токенами не принимаются
+        if is_revocation_enabled():
+            await revocation_store.revoke_user(model.id)
+
         await send_email_reset_password(model, data.password)
 
         logger.info(f"Password reset successfully by - {model.email}")
@@ -0,0 +1,72 @@
+"""
+Кеш проверенных access-токенов.
+
+Клиент отправляет один и тот же access-токен в каждом запросе, пока тот не истечёт,
+а проверка подписи (RSA) - самая дорогая часть авторизации запроса. Проверенные claims
+хранятся в памяти процесса по sha256 от токена до exp токена, повторные запросы
+с тем же токеном обходятся без криптографии.
+
+Размер ограничен config.auth.verified_tokens_cache_size (давно не использованные токены
+вытесняются), 0 - кеш выключен. Попадания и промахи - метрика app_cache_requests_total{cache="token"},
+размер - app_token_cache_size (отдаются на /__internal_metrics__).
+"""
+
+import hashlib
+import time
+from collections import OrderedDict
+
+from prometheus_client import Gauge
+
+from src.auth.utils import decode_jwt
+from src.config import config
+from src.core.cache import CACHE_REQUESTS
+
+TOKEN_CACHE_SIZE = Gauge("app_token_cache_size", "Проверенных access-токенов в памяти процесса")
+
+
+class VerifiedTokenCache:
+    def __init__(self, max_size: int | None = None):
+        """
+        Args:
+            max_size: Сколько токенов хранится в памяти процесса (0 - не кешировать)
+        """
+        self.max_size = config.auth.verified_tokens_cache_size if max_size is None else max_size
+        # sha256(токен) -> claims; порядок - от давно использованных к недавним
+        self._items: OrderedDict[bytes, dict] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def decode(self, token: str) -> dict:
+        """Claims токена: из кеша или после проверки подписи (ошибки проверки - как у decode_jwt)"""
+        if not self.max_size:
+            return decode_jwt(token)
+
+        key = hashlib.sha256(token.encode()).digest()
+        payload = self._items.get(key)
+        if payload is not None:
+            if payload["exp"] > time.time():
+                self._items.move_to_end(key)
+                CACHE_REQUESTS.labels(cache="token", result="hit").inc()
+                return dict(payload)
+            del self._items[key]
+
+        CACHE_REQUESTS.labels(cache="token", result="miss").inc()
+        payload = decode_jwt(token)
+        # без exp неизвестно, до какого момента claims можно отдавать без проверки
+        if isinstance(payload.get("exp"), (int, float)):
+            self._set(key, payload)
+        return dict(payload)
+
+    def _set(self, key: bytes, payload: dict) -> None:
+        self._items[key] = payload
+        while len(self._items) > self.max_size:
+            self._items.popitem(last=False)
+        TOKEN_CACHE_SIZE.set(len(self._items))
+
+    def clear(self) -> None:
+        self._items.clear()
+        TOKEN_CACHE_SIZE.set(0)
+
+
+verified_tokens = VerifiedTokenCache()
@@ -1,7 +1,8 @@
 from datetime import datetime, timezone, timedelta
 
 import bcrypt
-import jwt
+from src.auth.keys import get_key_manager
+from src.auth.revocation import FAMILY_FIELD, JTI_FIELD, new_token_id
 from src.config import Config
 
 config = Config()
@@ -16,8 +17,13 @@ def create_access_token(payload: dict)->str:
     payload.update({TOKEN_TYPE_FIELD: ACCESS_TOKEN_TYPE})
     return encode_jwt(payload)
 
-def create_refresh_token(payload: dict)->str:
-    payload.update({TOKEN_TYPE_FIELD: REFRESH_TOKEN_TYPE})
+def create_refresh_token(payload: dict, family: str | None = None)->str:
+    """Refresh-токен с jti, family - семейство токенов (src/auth/revocation.py), при входе - новое"""
+    payload.update({
+        TOKEN_TYPE_FIELD: REFRESH_TOKEN_TYPE,
+        JTI_FIELD: new_token_id(),
+        FAMILY_FIELD: family or new_token_id(),
+    })
     return encode_jwt(payload=payload, expired=config.auth.refresh_token_expired)
 
 def create_verify_email_token(payload: dict)->str:
@@ -30,8 +36,6 @@ def create_reset_password_token(payload: dict)->str:
 
 def encode_jwt(
         payload: dict,
-        private_key: str = config.auth.private_key_path.read_text(),
-        algorithm: str = config.auth.algorithm,
         expired: int = config.auth.access_token_expired
 ):
     to_encode = payload.copy()
@@ -42,20 +46,15 @@ def encode_jwt(
         "iat": now,
     })
 
-    encoded = jwt.encode(to_encode, private_key, algorithm=algorithm)
-    return encoded
-
-def decode_jwt(
-        token: str | bytes,
-        public_key: str = config.auth.public_key_path.read_text(),
-        algorithm: str = config.auth.algorithm
-):
-    decoded = jwt.decode(token, public_key, algorithms=[algorithm])
-    return decoded
+    # ключи разобраны заранее (src/auth/keys.py), в заголовок пишется kid ключа
+    return get_key_manager().sign(to_encode)
 
-def hash_password(password: str) -> bytes:
+def decode_jwt(token: str | bytes):
+    return get_key_manager().verify(token)
 
-    salt = bcrypt.gensalt()
+def hash_password(password: str, rounds: int | None = None) -> bytes:
+    """Хеш пароля в текущем потоке, в обработчиках запросов - password_hasher (src/auth/hasher.py)"""
+    salt = bcrypt.gensalt(rounds or config.password.rounds)
     pwd_bytes: bytes = password.encode()
 
     return bcrypt.hashpw(pwd_bytes, salt)
@@ -1,7 +1,9 @@
 from typing import Annotated
 from fastapi import Depends
 
+from src.books.export_jobs import ExportJobService
 from src.books.service import BookService
+from src.books.stats import CatalogueStatsService
 from src.database import DbSessionDep
 
 def get_book_service(session: DbSessionDep) -> BookService:
@@ -9,4 +11,16 @@ def get_book_service(session: DbSessionDep) -> BookService:
     return BookService(session)
 
 # Type alias для удобства
-BookServiceDep = Annotated[BookService, Depends(get_book_service)]
\ No newline at end of file
+BookServiceDep = Annotated[BookService, Depends(get_book_service)]
+
+def get_export_job_service(session: DbSessionDep) -> ExportJobService:
+    """Получить сервис фоновых выгрузок"""
+    return ExportJobService(session)
+
+ExportJobServiceDep = Annotated[ExportJobService, Depends(get_export_job_service)]
+
+def get_catalogue_stats_service(session: DbSessionDep) -> CatalogueStatsService:
+    """Получить сервис статистики каталога"""
+    return CatalogueStatsService(session)
+
+CatalogueStatsServiceDep = Annotated[CatalogueStatsService, Depends(get_catalogue_stats_service)]
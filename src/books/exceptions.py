@@ -9,3 +9,26 @@ class BookNotFoundError(HTTPException):
 class AuthorNotFoundError(HTTPException):
     def __init__(self, author_id: int):
         super().__init__(status_code=status.HTTP_404_NOT_FOUND, detail=f"Author with id {author_id} not found")
+
+
+class BookBatchConflictError(HTTPException):
+    def __init__(self):
+        super().__init__(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Batch conflicts with the current state of books (duplicate titles), nothing was changed",
+        )
+
+
+class ExportJobNotFoundError(HTTPException):
+    def __init__(self, job_id: str):
+        super().__init__(status_code=status.HTTP_404_NOT_FOUND, detail=f"Export job {job_id} not found")
+
+
+class ExportJobNotReadyError(HTTPException):
+    def __init__(self, job_id: str):
+        super().__init__(status_code=status.HTTP_409_CONFLICT, detail=f"Export job {job_id} is not finished")
+
+
+class BulkConditionRequiredError(HTTPException):
+    def __init__(self):
+        super().__init__(status_code=status.HTTP_422_UNPROCESSABLE_CONTENT, detail="Bulk operation needs a condition")
@@ -0,0 +1,227 @@
+"""
+Выгрузка каталога книг.
+
+Строки читаются из БД пачками через серверный курсор (yield_per),
+поэтому в памяти одновременно находится не больше одной пачки,
+сколько бы книг ни было в каталоге.
+"""
+
+import asyncio
+import csv
+import io
+import os
+import tempfile
+from pathlib import Path
+from typing import AsyncIterator, Awaitable, Callable, Iterable, Sequence
+
+import aiofiles
+import pyarrow as pa
+import pyarrow.parquet as pq
+from openpyxl import Workbook
+from openpyxl.worksheet._write_only import WriteOnlyWorksheet
+from sqlalchemy import Row, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.books.models import Author, Book
+from src.books.schemas import ExportFormat
+from src.config import config
+
+CSV_HEADER = ("ID", "Title", "Author")
+CSV_DELIMITER = ";"
+CSV_ENCODING = "utf-8"
+# BOM - чтобы Excel правильно определил кодировку (как utf-8-sig)
+CSV_BOM = "\ufeff"
+
+XLSX_HEADER = ("ID", "Название", "Описание", "Автор")
+XLSX_SHEET = "Books"
+
+# Parquet хранит типы колонок, имена совпадают с полями строк выгрузки (rows())
+PARQUET_SCHEMA = pa.schema([
+    ("id", pa.int64()),
+    ("title", pa.string()),
+    ("description", pa.string()),
+    ("page", pa.int32()),
+    ("is_available", pa.bool_()),
+    ("author_id", pa.int64()),
+    ("author_name", pa.string()),
+    ("created_at", pa.timestamp("us")),
+    ("updated_at", pa.timestamp("us")),
+    ("deleted_at", pa.timestamp("us")),
+])
+PARQUET_COMPRESSION = "zstd"
+
+MEDIA_TYPES = {
+    ExportFormat.CSV: "text/csv",
+    ExportFormat.XLSX: "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    ExportFormat.PARQUET: "application/vnd.apache.parquet",
+}
+
+
+class BookExporter:
+    def __init__(
+            self,
+            session: AsyncSession,
+            batch_size: int | None = None,
+            on_progress: Callable[[int], Awaitable[None]] | None = None,
+    ):
+        """
+        Args:
+            session: SQLAlchemy сессия
+            batch_size: Сколько строк читается из БД за раз
+            on_progress: Вызывается после обработки каждой пачки с количеством выгруженных строк
+        """
+        self.session = session
+        self.batch_size = batch_size or config.export.batch_size
+        self.on_progress = on_progress
+
+    async def count(self) -> int:
+        """Сколько строк будет выгружено"""
+        return await self.session.scalar(select(func.count(Book.id))) or 0
+
+    async def fingerprint(self) -> tuple:
+        """
+        Дешёвый отпечаток данных выгрузки: меняется при добавлении, изменении и удалении книг
+        и при добавлении/удалении авторов (updated_at книг обновляется при каждом изменении)
+        """
+        books = (await self.session.execute(
+            select(func.count(Book.id), func.max(Book.id), func.max(Book.updated_at))
+        )).one()
+        authors = (await self.session.execute(
+            select(func.count(Author.id), func.max(Author.id))
+        )).one()
+
+        return *books, *authors
+
+    async def rows(self) -> AsyncIterator[Sequence[Row]]:
+        """Строки выгрузки (колонки PARQUET_SCHEMA) пачками по batch_size"""
+        stmt = (
+            select(
+                Book.id,
+                Book.title,
+                Book.description,
+                Book.page,
+                Book.is_available,
+                Book.author_id,
+                Author.name.label("author_name"),
+                Book.created_at,
+                Book.updated_at,
+                Book.deleted_at,
+            )
+            .outerjoin(Book.author)
+            .order_by(Book.id)
+            .execution_options(yield_per=self.batch_size)
+        )
+
+        exported = 0
+        result = await self.session.stream(stmt)
+        async for partition in result.partitions():
+            yield partition
+
+            exported += len(partition)
+            if self.on_progress:
+                await self.on_progress(exported)
+
+    async def save(self, export_format: ExportFormat, path: Path) -> Path:
+        """Записать выгрузку в файл"""
+        if export_format == ExportFormat.XLSX:
+            return await self.xlsx(path)
+        if export_format == ExportFormat.PARQUET:
+            return await self.parquet(path)
+
+        async with aiofiles.open(path, mode="wb") as f:
+            async for chunk in self.csv():
+                await f.write(chunk)
+
+        return path
+
+    async def csv(self) -> AsyncIterator[bytes]:
+        """CSV по частям: каждая пачка строк кодируется и отдаётся отдельным куском"""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, delimiter=CSV_DELIMITER, lineterminator="\n")
+
+        buffer.write(CSV_BOM)
+        writer.writerow(CSV_HEADER)
+        yield self._flush(buffer)
+
+        async for partition in self.rows():
+            writer.writerows(
+                (row.id, row.title, row.author_name or "N/A")
+                for row in partition
+            )
+            yield self._flush(buffer)
+
+    async def xlsx(self, path: Path | None = None) -> Path:
+        """
+        XLSX в файл path, по умолчанию - во временный файл (удаляет вызывающий).
+
+        Книга пишется в режиме write_only: строки сразу уходят в xml листа на диске,
+        а не копятся в памяти. Добавление строк и упаковка zip выполняются в отдельном потоке,
+        чтобы не блокировать event loop на время выгрузки.
+        """
+        path = path or self._temp_path(".xlsx")
+
+        try:
+            workbook = Workbook(write_only=True)
+            sheet = workbook.create_sheet(XLSX_SHEET)
+            sheet.append(XLSX_HEADER)
+
+            async for partition in self.rows():
+                await asyncio.to_thread(
+                    self._append_rows,
+                    sheet,
+                    [(row.id, row.title, row.description, row.author_name or "Не указан") for row in partition],
+                )
+
+            await asyncio.to_thread(workbook.save, path)
+        except BaseException:
+            path.unlink(missing_ok=True)
+            raise
+
+        return path
+
+    async def parquet(self, path: Path | None = None) -> Path:
+        """
+        Parquet в файл path, по умолчанию - во временный файл (удаляет вызывающий).
+
+        Каждая пачка строк из курсора становится отдельной row group, поэтому в памяти
+        не больше одной пачки. Перекладка в колонки и сжатие - в отдельном потоке.
+        """
+        path = path or self._temp_path(".parquet")
+
+        try:
+            with pq.ParquetWriter(path, PARQUET_SCHEMA, compression=PARQUET_COMPRESSION) as writer:
+                async for partition in self.rows():
+                    await asyncio.to_thread(self._write_row_group, writer, partition)
+        except BaseException:
+            path.unlink(missing_ok=True)
+            raise
+
+        return path
+
+    @staticmethod
+    def _write_row_group(writer: pq.ParquetWriter, rows: Sequence[Row]) -> None:
+        columns = list(zip(*rows))
+        batch = pa.RecordBatch.from_arrays(
+            [pa.array(column, type=field.type) for column, field in zip(columns, PARQUET_SCHEMA)],
+            schema=PARQUET_SCHEMA,
+        )
+        writer.write_batch(batch)
+
+    @staticmethod
+    def _temp_path(suffix: str) -> Path:
+        fd, name = tempfile.mkstemp(prefix="books_export_", suffix=suffix)
+        os.close(fd)
+        return Path(name)
+
+    @staticmethod
+    def _append_rows(sheet: WriteOnlyWorksheet, rows: Iterable[tuple]) -> None:
+        for row in rows:
+            sheet.append(row)
+
+    @staticmethod
+    def _flush(buffer: io.StringIO) -> bytes:
+        """Забрать накопленный текст из буфера и очистить его"""
+        chunk = buffer.getvalue().encode(CSV_ENCODING)
+        buffer.seek(0)
+        buffer.truncate(0)
+        return chunk
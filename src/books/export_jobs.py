@@ -0,0 +1,180 @@
+"""
+Фоновые выгрузки книг.
+
+POST создаёт задачу и публикует её id в очередь RabbitMQ, файл пишет обработчик
+src/faststream/subscribers/exports.py. Задачи хранятся в Redis (json, с TTL),
+клиент опрашивает статус и скачивает готовый файл.
+
+Если данные не менялись (тот же отпечаток), новая задача сразу получает
+файл последней успешной выгрузки того же формата.
+"""
+
+import os
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+from loguru import logger
+from redis.asyncio import Redis
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.books.exceptions import ExportJobNotFoundError, ExportJobNotReadyError
+from src.books.export import BookExporter
+from src.books.schemas import ExportFormat, ExportJob, ExportJobStatus
+from src.config import config
+from src.core.cache import RedisCache, cache_key, hash_key
+from src.core.dependencies.redis import get_redis
+from src.faststream.broker import broker
+
+EXPORT_QUEUE = "books-export"
+
+
+class ExportJobStore:
+    """Хранилище задач выгрузки в Redis"""
+
+    def __init__(self, redis: Redis | None = None):
+        self.redis = redis or get_redis()
+
+    async def get(self, job_id: str) -> ExportJob | None:
+        value = await self.redis.get(cache_key("export-job", job_id))
+        return None if value is None else ExportJob.model_validate_json(value)
+
+    async def save(self, job: ExportJob) -> None:
+        await self.redis.set(cache_key("export-job", job.id), job.model_dump_json(), ex=config.export.job_ttl)
+
+    async def get_latest(self, export_format: ExportFormat, fingerprint: str) -> ExportJob | None:
+        """Последняя успешная выгрузка формата по тем же данным"""
+        job_id = await self.redis.get(cache_key("export-job", "latest", export_format.value, fingerprint))
+        return None if job_id is None else await self.get(job_id.decode())
+
+    async def set_latest(self, job: ExportJob) -> None:
+        await self.redis.set(
+            cache_key("export-job", "latest", job.format.value, job.fingerprint), job.id, ex=config.export.job_ttl
+        )
+
+
+class ExportJobService:
+    def __init__(self, session: AsyncSession, store: ExportJobStore | None = None):
+        self.session = session
+        self.store = store or ExportJobStore()
+
+    async def create(self, export_format: ExportFormat, user_id: int) -> ExportJob:
+        """Создать задачу выгрузки (или сразу отдать недавний результат, если данные не менялись)"""
+        fingerprint = await self._fingerprint()
+
+        job = ExportJob(
+            id=uuid.uuid4().hex,
+            format=export_format,
+            status=ExportJobStatus.PENDING,
+            user_id=user_id,
+            fingerprint=fingerprint,
+            created_at=datetime.now(),
+        )
+
+        # ✨ Переиспользуем файл последней выгрузки, если он ещё на месте
+        latest = await self.store.get_latest(export_format, fingerprint)
+        if latest and latest.file and self.file_path(latest).exists():
+            # файл снова нужен на job_ttl: иначе _remove_expired_files удалит его по старому mtime
+            os.utime(self.file_path(latest))
+            job = job.model_copy(update={
+                "status": ExportJobStatus.DONE,
+                "progress": 100,
+                "rows": latest.rows,
+                "total": latest.total,
+                "file": latest.file,
+                "reused": True,
+                "finished_at": datetime.now(),
+            })
+            await self.store.save(job)
+            return job
+
+        await self.store.save(job)
+        try:
+            await broker.publish(message=job.id, queue=EXPORT_QUEUE)
+        except Exception as e:
+            # задача не попала в очередь, и обработчик её не выполнит
+            await self._fail(job, e)
+            raise
+
+        return job
+
+    async def get(self, job_id: str, user_id: int) -> ExportJob:
+        """Получить задачу (видна только создавшему её пользователю)"""
+        job = await self.store.get(job_id)
+        if not job or job.user_id != user_id:
+            raise ExportJobNotFoundError(job_id)
+        return job
+
+    async def get_file(self, job_id: str, user_id: int) -> tuple[ExportJob, Path]:
+        """Получить файл готовой выгрузки"""
+        job = await self.get(job_id, user_id)
+
+        path = self.file_path(job) if job.file else None
+        if job.status != ExportJobStatus.DONE or path is None or not path.exists():
+            raise ExportJobNotReadyError(job_id)
+
+        return job, path
+
+    async def run(self, job_id: str) -> None:
+        """Выполнить задачу (вызывается обработчиком очереди)"""
+        job = await self.store.get(job_id)
+        if not job or job.status != ExportJobStatus.PENDING:
+            logger.warning(f"Export job [{job_id}] not found or already processed")
+            return
+
+        async def on_progress(rows: int) -> None:
+            job.rows = rows
+            job.progress = min(99, rows * 100 // job.total) if job.total else 99
+            await self.store.save(job)
+
+        exporter = BookExporter(self.session, on_progress=on_progress)
+
+        try:
+            job.status = ExportJobStatus.RUNNING
+            job.total = await exporter.count()
+            await self.store.save(job)
+
+            root = config.export.root_path
+            root.mkdir(parents=True, exist_ok=True)
+            job.file = f"books_{job.id}.{job.format.value}"
+
+            await exporter.save(job.format, root / job.file)
+        except Exception as e:
+            logger.exception(f"Export job [{job.id}] failed")
+            if job.file:
+                self.file_path(job).unlink(missing_ok=True)
+            await self._fail(job, e)
+            return
+
+        job.status = ExportJobStatus.DONE
+        job.progress = 100
+        job.finished_at = datetime.now()
+        await self.store.save(job)
+        await self.store.set_latest(job)
+
+        self._remove_expired_files()
+
+    async def _fail(self, job: ExportJob, error: Exception) -> None:
+        job.status = ExportJobStatus.FAILED
+        job.file = None
+        job.error = str(error)
+        job.finished_at = datetime.now()
+        await self.store.save(job)
+
+    @staticmethod
+    def file_path(job: ExportJob) -> Path:
+        return config.export.root_path / job.file
+
+    async def _fingerprint(self) -> str:
+        # версия кеша книг меняется при любом изменении через API (в том числе авторов)
+        version = await RedisCache(self.store.redis).version(config.cache.namespace.books)
+        return hash_key(await BookExporter(self.session).fingerprint(), version)
+
+    @staticmethod
+    def _remove_expired_files() -> None:
+        """Удалить файлы, задачи которых уже истекли"""
+        expired_at = time.time() - config.export.job_ttl
+        for path in config.export.root_path.glob("books_*"):
+            if path.stat().st_mtime < expired_at:
+                path.unlink(missing_ok=True)
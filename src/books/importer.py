@@ -0,0 +1,222 @@
+"""
+Загрузка каталога книг (seed books).
+
+Формат записи каталога:
+    {"author": "...", "description": "...", "titles": [{"name": "...", "description": "...", "page": 100}]}
+
+Файл - json-массив таких записей или NDJSON (по записи на строку). Файл читается
+по частям (iter_catalogue), в памяти находится только текущая запись (не больше MAX_ENTRY_SIZE)
+и пачка для записи в БД.
+
+Книги копятся в пачки по batch_size и пишутся multi-row INSERT ... ON CONFLICT DO NOTHING,
+одна транзакция на пачку: книги с уже существующими названиями пропускает сама БД,
+повторы названий проверяются только внутри пачки. Авторы пачки добавляются тем же способом,
+их id - одним запросом на пачку. Память не зависит ни от размера каталога в БД, ни от размера файла.
+"""
+
+import json
+import re
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterable, Iterator, TextIO
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.books.models import Author, Book
+from src.config import config
+
+READ_CHUNK_SIZE = 64 * 1024
+MAX_ENTRY_SIZE = 16 * 1024 * 1024  # запись каталога больше этого считается ошибкой формата
+SEPARATORS = re.compile(r"[\s,]*")
+
+
+class CatalogueFormatError(ValueError):
+    pass
+
+
+def iter_catalogue(path: str | Path) -> Iterator[dict[str, Any]]:
+    """
+    Записи каталога по одной, без чтения всего файла в память.
+    Формат определяется по первому символу: "[" - json-массив, иначе NDJSON.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        first = f.read(1)
+        while first.isspace():
+            first = f.read(1)
+
+        if first == "[":
+            yield from _iter_json_array(f)
+        elif first:
+            yield from _iter_ndjson(first + f.readline(MAX_ENTRY_SIZE), f)
+
+
+def _iter_ndjson(first_line: str, f: TextIO) -> Iterator[dict[str, Any]]:
+    """Записи NDJSON (первая строка уже прочитана)"""
+    line = first_line
+    while line:
+        if len(line) >= MAX_ENTRY_SIZE and not line.endswith("\n"):
+            raise CatalogueFormatError(f"Catalogue entry is larger than {MAX_ENTRY_SIZE} characters")
+
+        line = line.strip()
+        if line:
+            yield json.loads(line)
+
+        line = f.readline(MAX_ENTRY_SIZE)
+
+
+def _iter_json_array(f: TextIO) -> Iterator[dict[str, Any]]:
+    """Элементы json-массива (открывающая "[" уже прочитана) по мере чтения файла"""
+    decoder = json.JSONDecoder()
+    buffer = ""
+    pos = 0
+    eof = False
+
+    while True:
+        # ✨ Пропускаем пробелы и запятые между элементами
+        pos = SEPARATORS.match(buffer, pos).end()
+
+        if pos < len(buffer):
+            if buffer[pos] == "]":
+                return
+
+            try:
+                item, pos = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                # элемент прочитан не полностью - дочитываем файл
+                if eof:
+                    raise CatalogueFormatError(f"Invalid json near: {buffer[pos:pos + 100]!r}")
+                # битый элемент не должен дочитать в память весь оставшийся файл
+                if len(buffer) - pos > MAX_ENTRY_SIZE:
+                    raise CatalogueFormatError(
+                        f"Catalogue entry is larger than {MAX_ENTRY_SIZE} characters near: {buffer[pos:pos + 100]!r}"
+                    )
+            else:
+                yield item
+                continue
+        elif eof:
+            raise CatalogueFormatError("Unexpected end of json array")
+
+        chunk = f.read(READ_CHUNK_SIZE)
+        eof = not chunk
+        buffer = buffer[pos:] + chunk
+        pos = 0
+
+
+@dataclass
+class ImportStats:
+    """Итоги загрузки"""
+
+    rows: int = 0  # прочитано книг
+    authors: int = 0  # добавлено авторов
+    books: int = 0  # добавлено книг
+    skipped: int = 0  # книг пропущено (название уже есть в БД или в пачке)
+    batches: int = 0
+    started_at: float = field(default_factory=time.perf_counter)
+    elapsed: float = 0.0
+
+    @property
+    def rows_per_sec(self) -> float:
+        return self.rows / self.elapsed if self.elapsed else 0.0
+
+
+class BookImporter:
+    def __init__(self, session: AsyncSession, batch_size: int | None = None):
+        self.session = session
+        self.batch_size = batch_size or config.importer.batch_size
+
+        # авторы и названия книг текущей пачки
+        self._authors: dict[str, dict[str, Any]] = {}
+        self._titles: set[str] = set()
+        self._new_books: list[dict[str, Any]] = []
+
+    async def run(self, entries: Iterable[dict[str, Any]]) -> ImportStats:
+        """Загрузить записи каталога"""
+        stats = ImportStats()
+
+        for entry in entries:
+            author_name = entry.get("author")
+            author = {"name": author_name, "description": entry.get("description")}
+            self._authors.setdefault(author_name, author)
+
+            for item in entry.get("titles", []):
+                stats.rows += 1
+
+                title = item.get("name")
+                if title in self._titles:
+                    stats.skipped += 1
+                    continue
+
+                # пачка могла записаться посреди книг автора
+                self._authors.setdefault(author_name, author)
+                self._titles.add(title)
+                self._new_books.append({
+                    "title": title,
+                    "description": item.get("description"),
+                    "page": item.get("page") or 0,
+                    "author": author_name,
+                })
+
+                if len(self._new_books) >= self.batch_size:
+                    await self._flush(stats)
+
+            if len(self._authors) >= self.batch_size:
+                await self._flush(stats)
+
+        await self._flush(stats)
+
+        stats.elapsed = time.perf_counter() - stats.started_at
+        return stats
+
+    async def _flush(self, stats: ImportStats) -> None:
+        """Записать накопленную пачку (авторы, затем их книги) в одной транзакции"""
+        if not self._authors and not self._new_books:
+            return
+
+        author_ids = await self._save_authors(stats)
+
+        rows = [
+            {
+                "title": book["title"],
+                "description": book["description"],
+                "page": book["page"],
+                "author_id": author_ids[book["author"]],
+            }
+            for book in self._new_books
+        ]
+        stmt = (
+            insert(Book)
+            .on_conflict_do_nothing(index_elements=[Book.title])
+            .returning(Book.id)
+        )
+        inserted = len((await self.session.execute(stmt, rows)).all()) if rows else 0
+        stats.books += inserted
+        stats.skipped += len(rows) - inserted
+
+        self._authors.clear()
+        self._titles.clear()
+        self._new_books.clear()
+
+        await self.session.commit()
+        stats.batches += 1
+
+    async def _save_authors(self, stats: ImportStats) -> dict[str, int]:
+        """Добавить новых авторов пачки, вернуть id всех авторов пачки"""
+        stmt = (
+            insert(Author)
+            .on_conflict_do_nothing(index_elements=[Author.name])
+            .returning(Author.name, Author.id)
+        )
+        result = await self.session.execute(stmt, list(self._authors.values()))
+        author_ids = {name: author_id for name, author_id in result}
+        stats.authors += len(author_ids)
+
+        # ✨ Остальные авторы уже были в БД - их id одним запросом
+        existing = [name for name in self._authors if name not in author_ids]
+        if existing:
+            result = await self.session.execute(select(Author.name, Author.id).where(Author.name.in_(existing)))
+            author_ids.update({name: author_id for name, author_id in result})
+
+        return author_ids
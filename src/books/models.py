@@ -1,15 +1,73 @@
 from datetime import datetime
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, Integer, String, Text, func, select
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import (
+    DDL, BigInteger, Boolean, DateTime, ForeignKey, Index, Integer, String, Text,
+    column, event, func, table, text,
+)
+from sqlalchemy.orm import Mapped, mapped_column, query_expression, relationship
 
 from src.database import Base
 from src.media.models import Media
 
 BOOK_MORPH_NAME = "book"
 
+# Триграммные индексы (см. миграцию c52e1a9f3d10) требуют расширения pg_trgm,
+# при создании схемы через metadata.create_all (тесты) включаем его заранее
+event.listen(Base.metadata, "before_create", DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+
+# Списки по умолчанию показывают только не удалённые записи, поэтому индексы под сортировку
+# и фильтры списков частичные (WHERE deleted_at IS NULL, см. миграцию 9b2d4e71c8a5).
+# id в конце индекса - второй ключ keyset-пагинации (ORDER BY <колонка>, id)
+ACTIVE = text("deleted_at IS NULL")
+
+# Статистика каталога по авторам - материализованное представление (см. миграцию e3a7c5d91f42),
+# обновляется CONCURRENTLY (src/books/stats.py), для этого нужен уникальный индекс по author_id.
+# Удалённые книги в books_count/available_books_count/images_count не входят
+CATALOGUE_STATS_QUERY = """
+SELECT a.id AS author_id,
+       a.name AS author_name,
+       a.deleted_at IS NOT NULL AS author_deleted,
+       count(b.id) FILTER (WHERE b.deleted_at IS NULL) AS books_count,
+       count(b.id) FILTER (WHERE b.deleted_at IS NULL AND b.is_available) AS available_books_count,
+       count(b.id) FILTER (WHERE b.deleted_at IS NOT NULL) AS deleted_books_count,
+       coalesce(sum(m.images) FILTER (WHERE b.deleted_at IS NULL), 0)::bigint AS images_count
+FROM authors a
+LEFT JOIN books b ON b.author_id = a.id
+LEFT JOIN (
+    SELECT entity_id, count(*) AS images FROM media WHERE entity_type = 'book' GROUP BY entity_id
+) m ON m.entity_id = b.id
+GROUP BY a.id
+"""
+
+catalogue_stats = table(
+    "catalogue_stats",
+    column("author_id", Integer),
+    column("author_name", String),
+    column("author_deleted", Boolean),
+    column("books_count", BigInteger),
+    column("available_books_count", BigInteger),
+    column("deleted_books_count", BigInteger),
+    column("images_count", BigInteger),
+)
+
+# Представление не является таблицей metadata, в тестах (metadata.create_all) создаём его после таблиц
+event.listen(
+    Base.metadata,
+    "after_create",
+    DDL(f"CREATE MATERIALIZED VIEW IF NOT EXISTS catalogue_stats AS {CATALOGUE_STATS_QUERY}"),
+)
+event.listen(
+    Base.metadata,
+    "after_create",
+    DDL("CREATE UNIQUE INDEX IF NOT EXISTS ix_catalogue_stats_author_id ON catalogue_stats (author_id)"),
+)
+
 class Author(Base):
     __tablename__ = "authors"
+    __table_args__ = (
+        Index("ix_authors_name_trgm", "name", postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}),
+        Index("ix_authors_active_name_id", "name", "id", postgresql_where=ACTIVE),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     name: Mapped[str] = mapped_column(String(255), unique=True, nullable=False)
@@ -19,6 +77,10 @@ class Author(Base):
     # Связь один ко многим: у автора много книг
     books: Mapped[list["Book"]] = relationship("Book", back_populates="author")
 
+    # Вычисляются в запросе списка авторов (with_expression), в остальных запросах - None
+    books_count: Mapped[int | None] = query_expression()
+    available_books_count: Mapped[int | None] = query_expression()
+
     @property
     def is_deleted(self) -> bool:
         """Проверить, удалена ли запись"""
@@ -27,6 +89,17 @@ class Author(Base):
 
 class Book(Base):
     __tablename__ = "books"
+    __table_args__ = (
+        Index("ix_books_title_trgm", "title", postgresql_using="gin", postgresql_ops={"title": "gin_trgm_ops"}),
+        Index("ix_books_active_title_id", "title", "id", postgresql_where=ACTIVE),
+        Index("ix_books_active_page_id", "page", "id", postgresql_where=ACTIVE),
+        # фильтр по автору + сортировка по названию; он же - подсчёт книг авторов (index only scan)
+        Index("ix_books_active_author_id_title_id", "author_id", "title", "id", postgresql_where=ACTIVE),
+        # внешний ключ: списки с удалёнными книгами и удаление автора
+        Index("ix_books_author_id", "author_id"),
+        # удалённые книги: фильтр deleted=deleted и очистка просроченных (src/books/purge.py)
+        Index("ix_books_deleted_at", "deleted_at", postgresql_where=text("deleted_at IS NOT NULL")),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     title: Mapped[str] = mapped_column(String(255), unique=True, nullable=False)
@@ -0,0 +1,171 @@
+"""
+Очистка каталога от удалённых записей.
+
+Книги и авторы, удалённые (soft delete) больше config.purge.retention_days дней назад,
+удаляются из БД вместе с картинками книг (записи media и файлы). Удаление идёт
+небольшими пачками: одна транзакция на пачку, строки выбираются FOR UPDATE SKIP LOCKED
+в MATERIALIZED CTE (подзапрос с LIMIT внутри IN планировщик может выполнить повторно,
+и пачка получится больше batch_size), между пачками пауза - блокировки короткие, а нагрузка на БД ограничена.
+
+Автор удаляется, только когда у него не осталось книг (в том числе не удалённых).
+
+Запуск - python -m cli.main purge run, воркер FastStream запускает очистку
+раз в config.purge.interval секунд (PurgeScheduler).
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+
+from loguru import logger
+from sqlalchemy import delete, exists, func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.books.models import BOOK_MORPH_NAME, Author, Book
+from src.config import config
+from src.core.cache import RedisCache, is_cache_enabled
+from src.media.models import Media
+from src.media.service import MediaService
+
+
+@dataclass
+class PurgeStats:
+    """Итоги очистки"""
+
+    books: int = 0  # удалено книг
+    authors: int = 0  # удалено авторов
+    media: int = 0  # удалено картинок
+    skipped_authors: int = 0  # удалённых авторов оставлено (у них есть книги)
+    batches: int = 0
+    started_at: float = field(default_factory=time.perf_counter)
+    elapsed: float = 0.0
+
+
+class CataloguePurger:
+    def __init__(
+            self,
+            session: AsyncSession,
+            retention_days: int | None = None,
+            batch_size: int | None = None,
+            batch_pause: float | None = None,
+    ):
+        """
+        Args:
+            session: SQLAlchemy сессия
+            retention_days: Удалять записи, удалённые больше чем столько дней назад
+            batch_size: Сколько записей удаляется за одну транзакцию
+            batch_pause: Пауза между пачками в секундах
+        """
+        self.session = session
+        self.retention_days = config.purge.retention_days if retention_days is None else retention_days
+        self.batch_size = batch_size or config.purge.batch_size
+        self.batch_pause = config.purge.batch_pause if batch_pause is None else batch_pause
+        self.storage = MediaService(session).storage
+
+    async def run(self) -> PurgeStats:
+        """Удалить просроченные книги, затем авторов, у которых не осталось книг"""
+        stats = PurgeStats()
+        deleted_before = datetime.now() - timedelta(days=self.retention_days)
+
+        while await self._purge_books(deleted_before, stats):
+            await asyncio.sleep(self.batch_pause)
+
+        while await self._purge_authors(deleted_before, stats):
+            await asyncio.sleep(self.batch_pause)
+
+        stats.skipped_authors = await self.session.scalar(
+            select(func.count()).select_from(Author).where(Author.deleted_at < deleted_before)
+        ) or 0
+
+        if (stats.books or stats.authors) and is_cache_enabled():
+            await RedisCache().bump(config.cache.namespace.books)
+
+        stats.elapsed = time.perf_counter() - stats.started_at
+        return stats
+
+    async def _purge_books(self, deleted_before: datetime, stats: PurgeStats) -> bool:
+        """Удалить пачку книг и их картинки, False - удалять больше нечего"""
+        batch = (
+            select(Book.id)
+            .where(Book.deleted_at < deleted_before)
+            .limit(self.batch_size)
+            .with_for_update(skip_locked=True)
+            .cte("batch")
+            .prefix_with("MATERIALIZED")
+        )
+        book_ids = list(await self.session.scalars(
+            delete(Book).where(Book.id.in_(select(batch.c.id))).returning(Book.id)
+        ))
+        if not book_ids:
+            await self.session.commit()
+            return False
+
+        media = (await self.session.execute(
+            delete(Media)
+            .where(Media.entity_type == BOOK_MORPH_NAME, Media.entity_id.in_(book_ids))
+            .returning(Media.path, Media.thumbnails)
+        )).all()
+
+        await self.session.commit()
+
+        # ✨ Файлы удаляем после коммита: при откате транзакции картинки остаются на месте
+        for path, thumbnails in media:
+            for file_path in [path, *(thumbnails or {}).values()]:
+                try:
+                    await self.storage.delete(file_path)
+                except OSError as e:
+                    logger.warning(f"Purge: media file [{file_path}] not deleted: {e}")
+
+        stats.books += len(book_ids)
+        stats.media += len(media)
+        stats.batches += 1
+        return True
+
+    async def _purge_authors(self, deleted_before: datetime, stats: PurgeStats) -> bool:
+        """Удалить пачку авторов без книг, False - удалять больше нечего"""
+        batch = (
+            select(Author.id)
+            .where(Author.deleted_at < deleted_before, ~exists().where(Book.author_id == Author.id))
+            .limit(self.batch_size)
+            .with_for_update(skip_locked=True)
+            .cte("batch")
+            .prefix_with("MATERIALIZED")
+        )
+        author_ids = list(await self.session.scalars(
+            delete(Author).where(Author.id.in_(select(batch.c.id))).returning(Author.id)
+        ))
+        await self.session.commit()
+
+        if not author_ids:
+            return False
+
+        stats.authors += len(author_ids)
+        stats.batches += 1
+        return True
+
+
+class PurgeScheduler:
+    """Периодическая очистка (запускается воркером FastStream)"""
+
+    def __init__(self, session_factory: async_sessionmaker[AsyncSession], interval: int | None = None):
+        self.session_factory = session_factory
+        self.interval = interval or config.purge.interval
+
+    async def run(self) -> None:
+        """Запускать очистку раз в interval секунд до отмены задачи"""
+        while True:
+            try:
+                async with self.session_factory() as session:
+                    stats = await CataloguePurger(session).run()
+
+                if stats.books or stats.authors:
+                    logger.info(
+                        f"Catalogue purged: books {stats.books}, authors {stats.authors}, "
+                        f"media {stats.media} in {stats.elapsed:.2f} s"
+                    )
+            except Exception:
+                # ошибка одного запуска не должна останавливать задачу
+                logger.exception("Catalogue purge failed")
+
+            await asyncio.sleep(self.interval)
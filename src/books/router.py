@@ -1,29 +1,44 @@
 import io
-from typing import Annotated
+from typing import Annotated, Any
 
 import pandas as pd
 from fastapi import APIRouter, Query, status, Depends, UploadFile, File, HTTPException
-from starlette.responses import StreamingResponse
+from fastapi.responses import ORJSONResponse
+from starlette.background import BackgroundTask
+from starlette.responses import FileResponse, StreamingResponse
 
 from src.media.schemas import ImageUploadValidation
 from src.rbac.dependencies import PermissionRequired
 from src.rbac.permissions import Permissions
-from src.books.dependencies import BookServiceDep
+from src.books.dependencies import BookServiceDep, CatalogueStatsServiceDep, ExportJobServiceDep
+from src.books.export import MEDIA_TYPES
 from src.books.schemas import (
+    AuthorBulkRequest,
     AuthorCreate,
     AuthorDetailResponse,
     AuthorFilterSchema,
     AuthorShortResponse,
     AuthorUpdate,
+    BookBatchCreate,
+    BookBatchResponse,
+    BookBatchUpdate,
+    BookBulkRequest,
     BookCreate,
     BookDetailResponse,
+    BookFacetsResponse,
+    BookListItemResponse,
+    BookListView,
     BookResponse,
     BookUpdate,
-    BookFilterSchema
+    BookFilterSchema,
+    BulkOperationResponse,
+    CatalogueStatsResponse,
+    ExportJobCreate,
+    ExportJobResponse,
 )
 from src.books.models import Book, Author
-from src.users.models import User
-from src.utils.pagination import PaginatedResponse, PaginationHelper
+from src.auth.principal import Principal
+from src.utils.pagination import CountStrategy, PaginatedResponse, PaginationHelper
 from fastapi.security import HTTPBearer
 
 security = HTTPBearer()
@@ -42,13 +57,21 @@ router = APIRouter(
 )
 async def get_authors(
     service: BookServiceDep,
-    user: Annotated[User, Depends(PermissionRequired(Permissions.AUTHOR_LIST))],
+    user: Annotated[Principal, Depends(PermissionRequired(Permissions.AUTHOR_LIST))],
     skip: int = Query(0, ge=0, description="Количество пропускаемых записей"),
     limit: int = Query(10, ge=1, le=100, description="Максимальное количество записей"),
     search: str | None = Query(None, description="Поиск по имени автора"),
     deleted: str = Query("active", description="Фильтр по статусу удаления (active, deleted, all)"),
-    sort_by: str = Query("name", description="Поле для сортировки (name)"),
+    sort_by: str = Query("name", description="Поле для сортировки (name, books_count, available_books_count)"),
     sort_order: str = Query("asc", description="Порядок сортировки (asc, desc)"),
+    cursor: str | None = Query(None, description="Курсор следующей страницы из meta.next_cursor (вместо skip)"),
+    count_strategy: CountStrategy = Query(
+        CountStrategy.EXACT,
+        description=(
+            "Подсчёт total: exact - точно, cached - кеш на несколько секунд, "
+            "estimated - оценка для больших выборок без фильтров"
+        ),
+    ),
 )->list[Author]:
     filters = AuthorFilterSchema(
         skip=skip,
@@ -56,12 +79,14 @@ async def get_authors(
         search=search,
         deleted=deleted,
         sort_by=sort_by,
-        sort_order=sort_order
+        sort_order=sort_order,
+        cursor=cursor,
+        count_strategy=count_strategy,
     )
 
-    authors, total = await service.get_all_authors(filters=filters)
+    page = await service.get_all_authors(filters=filters)
 
-    return PaginationHelper.build_paginated_response(data=authors, total=total, skip=skip, limit=limit)
+    return PaginationHelper.build_page_response(page, skip=skip, limit=limit)
 
 
 @router.get(
@@ -73,10 +98,10 @@ async def get_authors(
 async def get_author(
     author_id: int,
     service: BookServiceDep,
-    user: Annotated[User, Depends(PermissionRequired(Permissions.AUTHOR_SHOW))]
-)->Author:
+    user: Annotated[Principal, Depends(PermissionRequired(Permissions.AUTHOR_SHOW))]
+)->dict[str, Any]:
     """Получить автора по ID"""
-    return await service.get_author_by_id(author_id)
+    return await service.get_author_detail(author_id)
 
 
 @router.post(
@@ -89,7 +114,7 @@ async def get_author(
 async def create_authors(
     data: AuthorCreate,
     service: BookServiceDep,
-    user: Annotated[User, Depends(PermissionRequired(Permissions.AUTHOR_CREATE))]
+    user: Annotated[Principal, Depends(PermissionRequired(Permissions.AUTHOR_CREATE))]
 )->Author:
     """Создать новую книгу"""
     return await service.create_author(data)
@@ -100,7 +125,7 @@ async def update_authors(
     author_id: int,
     data: AuthorUpdate,
     service: BookServiceDep,
-    user: Annotated[User, Depends(PermissionRequired(Permissions.AUTHOR_UPDATE))]
+    user: Annotated[Principal, Depends(PermissionRequired(Permissions.AUTHOR_UPDATE))]
 )->Author:
     """Обновить книгу"""
     return await service.update_author(author_id, data)
@@ -115,7 +140,7 @@ async def update_authors(
 async def delete_author(
     author_id: int,
     service: BookServiceDep,
-    user: Annotated[User, Depends(PermissionRequired(Permissions.AUTHOR_DELETE))]
+    user: Annotated[Principal, Depends(PermissionRequired(Permissions.AUTHOR_DELETE))]
 )->None:
     """Удалить автора (soft delete)"""
     await service.delete_author(author_id)
@@ -130,12 +155,42 @@ async def delete_author(
 async def restore_author(
     author_id: int,
     service: BookServiceDep,
-    user: Annotated[User, Depends(PermissionRequired(Permissions.AUTHOR_RESTORE))]
+    user: Annotated[Principal, Depends(PermissionRequired(Permissions.AUTHOR_RESTORE))]
 )->Author:
     """Восстановить удалённого автора"""
     return await service.restore_author(author_id)
 
 
+@router.post(
+    "/authors/bulk-delete",
+    tags=["Authors"],
+    summary="Удалить авторов (soft delete) по списку id или фильтру",
+    response_model=BulkOperationResponse,
+)
+async def bulk_delete_authors(
+    data: AuthorBulkRequest,
+    service: BookServiceDep,
+    user: Annotated[Principal, Depends(PermissionRequired(Permissions.AUTHOR_DELETE))]
+):
+    """Удалить авторов одним запросом к БД, возвращает id удалённых (уже удалённые не учитываются)"""
+    return await service.bulk_delete_authors(data)
+
+
+@router.post(
+    "/authors/bulk-restore",
+    tags=["Authors"],
+    summary="Восстановить авторов по списку id или фильтру",
+    response_model=BulkOperationResponse,
+)
+async def bulk_restore_authors(
+    data: AuthorBulkRequest,
+    service: BookServiceDep,
+    user: Annotated[Principal, Depends(PermissionRequired(Permissions.AUTHOR_RESTORE))]
+):
+    """Восстановить удалённых авторов одним запросом к БД, возвращает id восстановленных"""
+    return await service.bulk_restore_authors(data)
+
+
 @router.delete(
     "/authors/{author_id}/force",
     tags=["Authors"],
@@ -145,7 +200,7 @@ async def restore_author(
 async def force_delete_author(
     author_id: int,
     service: BookServiceDep,
-    user: Annotated[User, Depends(PermissionRequired(Permissions.AUTHOR_FORCE_DELETE))]
+    user: Annotated[Principal, Depends(PermissionRequired(Permissions.AUTHOR_FORCE_DELETE))]
 )->None:
     """
     Полностью удалить автора из БД.
@@ -164,18 +219,40 @@ async def force_delete_author(
     tags=["Books"],
     summary="Получить список всех книг",
     response_model=PaginatedResponse[BookDetailResponse],
+    responses={
+        200: {
+            "model": PaginatedResponse[BookListItemResponse],
+            "description": "При view=slim - облегчённый список (без описания, книг автора и картинок)",
+        }
+    }
 )
 async def get_books(
     service: BookServiceDep,
-    user: Annotated[User, Depends(PermissionRequired(Permissions.BOOK_LIST))],
+    user: Annotated[Principal, Depends(PermissionRequired(Permissions.BOOK_LIST))],
     skip: int = Query(0, ge=0, description="Количество пропускаемых записей"),
     limit: int = Query(10, ge=1, le=100, description="Максимальное количество записей"),
     search: str | None = Query(None, description="Поиск по названию"),
     author_id: int | None = Query(0, description="Поиск по автору"),
     is_available: bool | None = Query(None, description="Поиск книги по наличию"),
     deleted: str = Query("active", description="Фильтр по статусу удаления (active, deleted, all)"),
-    sort_by: str = Query("name", description="Поле для сортировки (title, page, is_available, created_at)"),
-    sort_order: str = Query("asc", description="Порядок сортировки (asc, desc)"),):
+    sort_by: str = Query(
+        "name",
+        description="Поле для сортировки (title, page, relevance - сначала наиболее похожие на search)"
+    ),
+    sort_order: str = Query("asc", description="Порядок сортировки (asc, desc)"),
+    cursor: str | None = Query(None, description="Курсор следующей страницы из meta.next_cursor (вместо skip)"),
+    count_strategy: CountStrategy = Query(
+        CountStrategy.EXACT,
+        description=(
+            "Подсчёт total: exact - точно, cached - кеш на несколько секунд, "
+            "estimated - оценка для больших выборок без фильтров"
+        ),
+    ),
+    view: BookListView = Query(
+        BookListView.FULL,
+        description="Представление: full - с автором, его книгами и картинками, slim - только поля списка"
+    ),
+):
     """Получить список всех книг"""
 
     filters = BookFilterSchema(
@@ -186,12 +263,144 @@ async def get_books(
         is_available=is_available,
         deleted=deleted,
         sort_by=sort_by,
-        sort_order=sort_order
+        sort_order=sort_order,
+        cursor=cursor,
+        count_strategy=count_strategy,
+    )
+
+    if view == BookListView.SLIM:
+        # ✨ Словари сериализуются сразу в ORJSON, без валидации через response_model
+        page = await service.get_books_list(filters=filters)
+        meta = PaginationHelper.build_pagination_meta(
+            page.total,
+            skip,
+            limit,
+            count=len(page.items),
+            next_cursor=page.next_cursor,
+            total_is_exact=page.total_is_exact,
+        )
+        return ORJSONResponse({"data": page.items, "meta": meta.model_dump()})
+
+    page = await service.get_all_books(filters=filters)
+
+    return PaginationHelper.build_page_response(page, skip=skip, limit=limit)
+
+
+@router.get(
+    "/books/facets",
+    tags=["Books"],
+    summary="Счётчики для фильтров списка книг",
+    response_model=BookFacetsResponse,
+)
+async def get_books_facets(
+    service: BookServiceDep,
+    user: Annotated[Principal, Depends(PermissionRequired(Permissions.BOOK_LIST))],
+    search: str | None = Query(None, description="Поиск по названию"),
+    author_id: int | None = Query(0, description="Поиск по автору"),
+    is_available: bool | None = Query(None, description="Поиск книги по наличию"),
+    deleted: str = Query("active", description="Фильтр по статусу удаления (active, deleted, all)"),
+    authors_limit: int = Query(20, ge=1, le=100, description="Сколько авторов вернуть"),
+):
+    """
+    Счётчики по наличию, статусу удаления и авторам для тех же фильтров, что и у списка книг,
+    одним запросом. Каждый фасет считается без учёта собственного фильтра
+    """
+    filters = BookFilterSchema(
+        search=search,
+        author_id=author_id,
+        is_available=is_available,
+        deleted=deleted,
     )
 
-    recs, total = await service.get_all_books(filters=filters)
+    return await service.get_book_facets(filters, authors_limit)
+
+
+@router.get(
+    "/books/stats",
+    tags=["Books"],
+    summary="Статистика каталога",
+    response_model=CatalogueStatsResponse,
+)
+async def get_books_stats(
+    service: CatalogueStatsServiceDep,
+    user: Annotated[Principal, Depends(PermissionRequired(Permissions.BOOK_LIST))],
+    authors_limit: int = Query(20, ge=1, le=100, description="Сколько авторов вернуть"),
+):
+    """
+    Итоги по книгам, наличию и картинкам и авторы с наибольшим количеством книг.
+    Читается из материализованного представления, данные отстают от каталога
+    не больше чем на период обновления (STATS_REFRESH_INTERVAL)
+    """
+    return await service.get_stats(authors_limit)
+
+
+@router.post(
+    "/books/batch",
+    tags=["Books"],
+    response_model=BookBatchResponse,
+    summary="Создать пачку книг",
+)
+async def create_books_batch(
+    data: BookBatchCreate,
+    service: BookServiceDep,
+    user: Annotated[Principal, Depends(PermissionRequired(Permissions.BOOK_CREATE))]
+):
+    """
+    Создать до 500 книг за запрос. Ошибочные элементы (нет автора, название занято)
+    пропускаются, результат возвращается по каждому элементу в порядке запроса
+    """
+    return await service.create_many(data.items)
+
+
+@router.patch(
+    "/books/batch",
+    tags=["Books"],
+    response_model=BookBatchResponse,
+    summary="Обновить пачку книг",
+)
+async def update_books_batch(
+    data: BookBatchUpdate,
+    service: BookServiceDep,
+    user: Annotated[Principal, Depends(PermissionRequired(Permissions.BOOK_UPDATE))]
+):
+    """
+    Обновить до 500 книг за запрос (передаются только изменяемые поля и id).
+    Ошибочные элементы пропускаются, результат возвращается по каждому элементу в порядке запроса
+    """
+    return await service.update_many(data.items)
+
+
+@router.post(
+    "/books/bulk-delete",
+    tags=["Books"],
+    summary="Удалить книги (soft delete) по списку id или фильтру",
+    response_model=BulkOperationResponse,
+)
+async def bulk_delete_books(
+    data: BookBulkRequest,
+    service: BookServiceDep,
+    user: Annotated[Principal, Depends(PermissionRequired(Permissions.BOOK_DELETE))]
+):
+    """
+    Удалить книги одним запросом к БД: до 10000 id или фильтр (название, автор, наличие).
+    Возвращает id удалённых книг (уже удалённые не учитываются)
+    """
+    return await service.bulk_delete(data)
+
 
-    return PaginationHelper.build_paginated_response(data=recs, total=total, skip=skip, limit=limit)
+@router.post(
+    "/books/bulk-restore",
+    tags=["Books"],
+    summary="Восстановить книги по списку id или фильтру",
+    response_model=BulkOperationResponse,
+)
+async def bulk_restore_books(
+    data: BookBulkRequest,
+    service: BookServiceDep,
+    user: Annotated[Principal, Depends(PermissionRequired(Permissions.BOOK_RESTORE))]
+):
+    """Восстановить удалённые книги одним запросом к БД, возвращает id восстановленных"""
+    return await service.bulk_restore(data)
 
 
 @router.get(
@@ -203,10 +412,10 @@ async def get_books(
 async def get_book(
     book_id: int,
     service: BookServiceDep,
-    user: Annotated[User, Depends(PermissionRequired(Permissions.BOOK_SHOW))]
-)->Book:
+    user: Annotated[Principal, Depends(PermissionRequired(Permissions.BOOK_SHOW))]
+)->dict[str, Any]:
     """Получить книгу по ID"""
-    return await service.get_by_id(book_id)
+    return await service.get_book_detail(book_id)
 
 
 @router.post(
@@ -219,7 +428,7 @@ async def get_book(
 async def create_book(
     data: BookCreate,
     service: BookServiceDep,
-    user: Annotated[User, Depends(PermissionRequired(Permissions.BOOK_CREATE))]
+    user: Annotated[Principal, Depends(PermissionRequired(Permissions.BOOK_CREATE))]
 )->Book:
     """Создать новую книгу"""
     return await service.create(data)
@@ -235,7 +444,7 @@ async def update_book(
     book_id: int,
     data: BookUpdate,
     service: BookServiceDep,
-    user: Annotated[User, Depends(PermissionRequired(Permissions.BOOK_UPDATE))]
+    user: Annotated[Principal, Depends(PermissionRequired(Permissions.BOOK_UPDATE))]
 )->Book:
     """Обновить книгу"""
     return await service.update(book_id, data)
@@ -245,7 +454,7 @@ async def update_book(
 async def delete_book(
     book_id: int,
     service: BookServiceDep,
-    user: Annotated[User, Depends(PermissionRequired(Permissions.BOOK_DELETE))]
+    user: Annotated[Principal, Depends(PermissionRequired(Permissions.BOOK_DELETE))]
 )->None:
     """Удалить книгу"""
     await service.delete(book_id)
@@ -261,7 +470,7 @@ async def upload_img_for_book(
     book_id: int,
     file: Annotated[UploadFile, File(description="Файл для загрузки")],
     service: BookServiceDep,
-    user: Annotated[User, Depends(PermissionRequired(Permissions.BOOK_UPLOAD_IMG))]
+    user: Annotated[Principal, Depends(PermissionRequired(Permissions.BOOK_UPLOAD_IMG))]
 )->Book:
     """Загрузить картинки для книги"""
 
@@ -282,6 +491,61 @@ async def upload_img_for_book(
     return await service.upload_img(book_id, file)
 
 
+@router.post(
+    "/books/exports",
+    tags=["Books"],
+    summary="Запустить фоновую выгрузку книг",
+    status_code=status.HTTP_202_ACCEPTED,
+    response_model=ExportJobResponse,
+)
+async def create_export_job(
+    data: ExportJobCreate,
+    service: ExportJobServiceDep,
+    user: Annotated[Principal, Depends(PermissionRequired(Permissions.BOOK_EXPORT))]
+):
+    """
+    Создать задачу выгрузки, файл формирует обработчик очереди.
+    Статус - GET /books/exports/{job_id}, файл - GET /books/exports/{job_id}/download
+    """
+    return await service.create(data.format, user.id)
+
+
+@router.get(
+    "/books/exports/{job_id}",
+    tags=["Books"],
+    summary="Статус фоновой выгрузки книг",
+    response_model=ExportJobResponse,
+)
+async def get_export_job(
+    job_id: str,
+    service: ExportJobServiceDep,
+    user: Annotated[Principal, Depends(PermissionRequired(Permissions.BOOK_EXPORT))]
+):
+    return await service.get(job_id, user.id)
+
+
+@router.get(
+    "/books/exports/{job_id}/download",
+    tags=["Books"],
+    summary="Скачать файл фоновой выгрузки книг",
+    responses={
+        200: {
+            "content": {media_type: {} for media_type in MEDIA_TYPES.values()},
+            "description": "Файл выгрузки",
+        },
+        409: {"description": "Выгрузка ещё не готова"},
+    }
+)
+async def download_export_job(
+    job_id: str,
+    service: ExportJobServiceDep,
+    user: Annotated[Principal, Depends(PermissionRequired(Permissions.BOOK_EXPORT))]
+):
+    job, path = await service.get_file(job_id, user.id)
+
+    return FileResponse(path, media_type=MEDIA_TYPES[job.format], filename=f"books_export.{job.format.value}")
+
+
 @router.post(
     "/books/export-to-excel",
     tags=["Books"],
@@ -296,18 +560,16 @@ async def upload_img_for_book(
 )
 async def export_to_excel(
     service: BookServiceDep,
-    user: Annotated[User, Depends(PermissionRequired(Permissions.BOOK_EXPORT))]
+    user: Annotated[Principal, Depends(PermissionRequired(Permissions.BOOK_EXPORT))]
 ):
-    buffer = await service.export_to_excel()
+    path = await service.export_to_excel()
 
-    # Отправляем файл пользователю
-    headers = {
-        'Content-Disposition': 'attachment; filename="books_export.xlsx"'
-    }
-    return StreamingResponse(
-        buffer,
+    # Отправляем файл пользователю (по частям), после отправки временный файл удаляется
+    return FileResponse(
+        path,
         media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers=headers
+        filename="books_export.xlsx",
+        background=BackgroundTask(path.unlink, missing_ok=True),
     )
 
 @router.post(
@@ -324,15 +586,41 @@ async def export_to_excel(
 )
 async def export_to_csv(
     service: BookServiceDep,
-    user: Annotated[User, Depends(PermissionRequired(Permissions.BOOK_EXPORT))]
+    user: Annotated[Principal, Depends(PermissionRequired(Permissions.BOOK_EXPORT))]
 ):
-    buffer = await service.export_to_csv()
-
+    # Строки читаются из БД и кодируются по мере отправки ответа
     headers = {
         'Content-Disposition': 'attachment; filename="books_export.csv"'
     }
     return StreamingResponse(
-        buffer,
+        service.export_to_csv(),
         media_type="text/csv",
         headers=headers
-    )
\ No newline at end of file
+    )
+
+
+@router.post(
+    "/books/export-to-parquet",
+    tags=["Books"],
+    summary="Выгрузить книги в Parquet",
+    status_code=status.HTTP_200_OK,
+    responses={
+        200: {
+            "content": {"application/vnd.apache.parquet": {}},
+            "description": "Возвращает Parquet файл с данными о книгах (типизированные колонки, сжатие zstd)",
+        }
+    }
+)
+async def export_to_parquet(
+    service: BookServiceDep,
+    user: Annotated[Principal, Depends(PermissionRequired(Permissions.BOOK_EXPORT))]
+):
+    path = await service.export_to_parquet()
+
+    # Отправляем файл пользователю (по частям), после отправки временный файл удаляется
+    return FileResponse(
+        path,
+        media_type="application/vnd.apache.parquet",
+        filename="books_export.parquet",
+        background=BackgroundTask(path.unlink, missing_ok=True),
+    )
@@ -1,7 +1,9 @@
 from datetime import datetime
 from enum import Enum
-from pydantic import BaseModel, ConfigDict, Field
+from typing import Literal
+from pydantic import BaseModel, ConfigDict, Field, model_validator
 from src.media.schemas import MediaResponse
+from src.utils.pagination import CountStrategy
 
 # ==================== Author ====================
 class AuthorBase(BaseModel):
@@ -29,6 +31,15 @@ class AuthorShortResponse(AuthorBase):
 
     id: int
     description: str | None = None  # Исключаем из ответа
+    books_count: int = Field(0, description="Количество книг (без удалённых)")
+    available_books_count: int = Field(0, description="Количество книг в наличии")
+
+
+class AuthorSummaryResponse(BaseModel):
+    """Краткая информация об авторе (для списков)"""
+
+    id: int
+    name: str
 
 
 class AuthorDetailResponse(AuthorBase):
@@ -57,8 +68,24 @@ class AuthorFilterSchema(BaseModel):
     limit: int = Field(10, ge=1, le=100)
     search: str | None = Field(None, description="Поиск по имени")
     deleted: str = Field("active", description="Статус удаления")
-    sort_by: str = Field("name", description="Поле для сортировки (name)")
+    sort_by: str = Field("name", description="Поле для сортировки (name, books_count, available_books_count)")
     sort_order: str = Field("asc", description="Порядок сортировки (asc, desc)")
+    cursor: str | None = Field(None, description="Курсор следующей страницы (keyset-пагинация)")
+    count_strategy: CountStrategy = Field(CountStrategy.EXACT, description="Способ подсчёта total")
+
+    @model_validator(mode="after")
+    def exact_count_for_search(self) -> "AuthorFilterSchema":
+        # оценка планировщика по ILIKE может ошибаться на порядки
+        if self.search and self.count_strategy == CountStrategy.ESTIMATED:
+            self.count_strategy = CountStrategy.EXACT
+        return self
+
+
+class BookListView(str, Enum):
+    """Представление списка книг"""
+
+    FULL = "full"  # книги с автором, его книгами и картинками
+    SLIM = "slim"  # только поля для списка и краткая информация об авторе
 
 
 # ==================== Book ====================
@@ -72,8 +99,18 @@ class BookFilterSchema(BaseModel):
     author_id: int | None = Field(0, description="Поиск по id автора")
     is_available: int | None = Field(None, description="Поиск по наличию")
     deleted: str = Field("active", description="Статус удаления")
-    sort_by: str = Field("title", description="Поле для сортировки (name, page, is_available, created_at)")
+    sort_by: str = Field("title", description="Поле для сортировки (title, page, relevance)")
     sort_order: str = Field("asc", description="Порядок сортировки (asc, desc)")
+    cursor: str | None = Field(None, description="Курсор следующей страницы (keyset-пагинация)")
+    count_strategy: CountStrategy = Field(CountStrategy.EXACT, description="Способ подсчёта total")
+
+    @model_validator(mode="after")
+    def exact_count_for_filters(self) -> "BookFilterSchema":
+        # оценка планировщика по фильтрам (ILIKE, автор, наличие) может ошибаться на порядки
+        filtered = self.search or self.author_id or self.is_available is not None
+        if filtered and self.count_strategy == CountStrategy.ESTIMATED:
+            self.count_strategy = CountStrategy.EXACT
+        return self
 
 class BookCreate(BookBase):
     pass
@@ -99,4 +136,217 @@ class BookDetailResponse(BookResponse):
     """Книга с вложенными объектами автора"""
 
     author: AuthorDetailResponse
-    images: list[MediaResponse] = []
\ No newline at end of file
+    images: list[MediaResponse] = []
+
+
+class BookListItemResponse(BaseModel):
+    """Книга в облегчённом списке (view=slim)"""
+
+    id: int
+    title: str
+    page: int
+    is_available: bool
+    created_at: datetime
+    updated_at: datetime
+    author: AuthorSummaryResponse
+
+
+# ==================== Facets ====================
+
+class AvailabilityFacet(BaseModel):
+    available: int
+    unavailable: int
+
+
+class DeletedFacet(BaseModel):
+    active: int
+    deleted: int
+
+
+class AuthorFacet(BaseModel):
+    id: int
+    name: str
+    count: int
+
+
+class BookFacetsResponse(BaseModel):
+    """Счётчики для фильтров списка книг (каждый фасет - без учёта собственного фильтра)"""
+
+    total: int = Field(description="Книг по всем фильтрам")
+    availability: AvailabilityFacet
+    deleted: DeletedFacet
+    authors: list[AuthorFacet] = Field(description="Авторы с наибольшим количеством книг")
+
+
+# ==================== Stats ====================
+
+class AuthorStats(BaseModel):
+    id: int
+    name: str
+    books_count: int
+    available_books_count: int
+    deleted_books_count: int
+    images_count: int
+
+
+class CatalogueStatsResponse(BaseModel):
+    """Статистика каталога (материализованное представление, обновляется фоном)"""
+
+    authors_count: int = Field(description="Авторов (без удалённых)")
+    books_count: int = Field(description="Книг (без удалённых)")
+    availability: AvailabilityFacet
+    deleted_books_count: int
+    images_count: int = Field(description="Картинок у не удалённых книг")
+    authors: list[AuthorStats] = Field(description="Авторы с наибольшим количеством книг")
+
+
+# ==================== Batch ====================
+
+BOOK_BATCH_MAX_ITEMS = 500
+
+
+class BookBatchCreate(BaseModel):
+    items: list[BookCreate] = Field(min_length=1, max_length=BOOK_BATCH_MAX_ITEMS)
+
+
+class BookBatchUpdateItem(BookUpdate):
+    id: int
+
+
+class BookBatchUpdate(BaseModel):
+    items: list[BookBatchUpdateItem] = Field(min_length=1, max_length=BOOK_BATCH_MAX_ITEMS)
+
+
+class BatchItemStatus(str, Enum):
+    """Результат обработки элемента пачки"""
+
+    CREATED = "created"
+    UPDATED = "updated"
+    ERROR = "error"
+
+
+class BookBatchItemResult(BaseModel):
+    index: int = Field(description="Позиция элемента в запросе")
+    status: BatchItemStatus
+    id: int | None = None
+    error: str | None = None
+
+
+class BookBatchResponse(BaseModel):
+    succeeded: int
+    failed: int
+    items: list[BookBatchItemResult]
+
+
+# ==================== Bulk ====================
+
+BULK_MAX_IDS = 10_000
+
+
+class BookBulkFilter(BaseModel):
+    """Фильтр книг для массовых операций (статус удаления задаёт сама операция)"""
+
+    search: str | None = Field(None, min_length=1, description="Поиск по названию")
+    author_id: int | None = Field(None, ge=1, description="Книги автора")
+    is_available: Literal[0, 1] | None = Field(None, description="Наличие (1, 0)")
+
+    @model_validator(mode="after")
+    def check_not_empty(self) -> "BookBulkFilter":
+        # пустой фильтр затронул бы весь каталог
+        if self.search is None and self.author_id is None and self.is_available is None:
+            raise ValueError("At least one filter field is required")
+        return self
+
+    def to_filters(self) -> BookFilterSchema:
+        return BookFilterSchema(
+            search=self.search,
+            author_id=self.author_id,
+            is_available=self.is_available,
+            deleted="all",
+        )
+
+
+class AuthorBulkFilter(BaseModel):
+    """Фильтр авторов для массовых операций"""
+
+    search: str = Field(min_length=1, description="Поиск по имени")
+
+    def to_filters(self) -> AuthorFilterSchema:
+        return AuthorFilterSchema(search=self.search, deleted="all")
+
+
+class BookBulkRequest(BaseModel):
+    """Книги для массовой операции: список id или фильтр (что-то одно)"""
+
+    ids: list[int] | None = Field(None, min_length=1, max_length=BULK_MAX_IDS)
+    filter: BookBulkFilter | None = None
+
+    @model_validator(mode="after")
+    def check_selection(self) -> "BookBulkRequest":
+        if (self.ids is None) == (self.filter is None):
+            raise ValueError("Either ids or filter is required")
+        return self
+
+
+class AuthorBulkRequest(BaseModel):
+    """Авторы для массовой операции: список id или фильтр (что-то одно)"""
+
+    ids: list[int] | None = Field(None, min_length=1, max_length=BULK_MAX_IDS)
+    filter: AuthorBulkFilter | None = None
+
+    @model_validator(mode="after")
+    def check_selection(self) -> "AuthorBulkRequest":
+        if (self.ids is None) == (self.filter is None):
+            raise ValueError("Either ids or filter is required")
+        return self
+
+
+class BulkOperationResponse(BaseModel):
+    affected: int = Field(description="Сколько записей изменено")
+    ids: list[int] = Field(description="id изменённых записей")
+
+
+# ==================== Export ====================
+
+class ExportFormat(str, Enum):
+    """Формат выгрузки книг"""
+
+    CSV = "csv"
+    XLSX = "xlsx"
+    PARQUET = "parquet"
+
+
+class ExportJobStatus(str, Enum):
+    """Статус задачи выгрузки"""
+
+    PENDING = "pending"  # ждёт обработчика
+    RUNNING = "running"  # выгружается
+    DONE = "done"  # файл готов к скачиванию
+    FAILED = "failed"  # ошибка
+
+
+class ExportJobCreate(BaseModel):
+    format: ExportFormat = ExportFormat.CSV
+
+
+class ExportJobResponse(BaseModel):
+    """Задача выгрузки книг"""
+
+    id: str
+    format: ExportFormat
+    status: ExportJobStatus
+    progress: int = Field(0, description="Процент выполнения")
+    rows: int = Field(0, description="Выгружено строк")
+    total: int = Field(0, description="Всего строк")
+    reused: bool = Field(False, description="Использован недавний результат (данные не менялись)")
+    error: str | None = None
+    created_at: datetime
+    finished_at: datetime | None = None
+
+
+class ExportJob(ExportJobResponse):
+    """Задача выгрузки (хранится в Redis)"""
+
+    user_id: int
+    fingerprint: str
+    file: str | None = Field(None, description="Имя файла в каталоге выгрузок")
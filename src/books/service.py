@@ -1,19 +1,50 @@
-import io
 from datetime import datetime
-from typing import Any
-import json
+from pathlib import Path
+from typing import Any, AsyncIterator
 
-import pandas as pd
 from fastapi import UploadFile
-from sqlalchemy import select
+from sqlalchemy import ColumnElement, Select, and_, func, select, true, tuple_, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload, joinedload
-
-from src.books.exceptions import AuthorNotFoundError, BookNotFoundError
+from sqlalchemy.orm import selectinload, joinedload, with_expression
+
+from src.books.export import BookExporter
+from src.books.importer import BookImporter, ImportStats, iter_catalogue
+from src.books.exceptions import (
+    AuthorNotFoundError,
+    BookBatchConflictError,
+    BookNotFoundError,
+    BulkConditionRequiredError,
+)
 from src.books.models import Author, Book, BOOK_MORPH_NAME
-from src.books.schemas import AuthorCreate, AuthorFilterSchema, AuthorUpdate, BookCreate, BookUpdate, BookFilterSchema
+from src.books.schemas import (
+    AuthorBulkRequest,
+    AuthorCreate,
+    AuthorDetailResponse,
+    AuthorFilterSchema,
+    AuthorUpdate,
+    BatchItemStatus,
+    BookBatchItemResult,
+    BookBatchResponse,
+    BookBatchUpdateItem,
+    BookBulkRequest,
+    BookCreate,
+    BookDetailResponse,
+    BookFilterSchema,
+    BookUpdate,
+    BulkOperationResponse,
+)
+from src.config import config
+from src.core.cache import RedisCache, hash_key, is_cache_enabled
 from src.media.service import MediaService
-from src.utils.pagination import PaginationHelper
+from src.utils.pagination import Keyset, Page, PaginationHelper
+
+
+def contains(column: Any, text: str) -> ColumnElement[bool]:
+    """ILIKE %text%, где %, _ и \\ из text ищутся как обычные символы (а не шаблон "любые символы")"""
+    escaped = text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return column.ilike(f"%{escaped}%", escape="\\")
 
 
 class BookService:
@@ -21,7 +52,7 @@ class BookService:
         self.session = session
         self.media_service = MediaService(session)
 
-    async def get_all_books(self, filters: BookFilterSchema) -> tuple[list[Book], int]:
+    async def get_all_books(self, filters: BookFilterSchema) -> Page[Book]:
         """
         Получить список книг с фильтрацией и сортировкой
 
@@ -29,7 +60,7 @@ class BookService:
             filters: Объект с параметрами фильтрации
 
         Returns:
-            Кортеж (список авторов, всего записей в БД)
+            Страница (список книг, всего записей в БД, курсор следующей страницы)
         """
 
         stmt = select(Book).options(
@@ -38,26 +69,162 @@ class BookService:
             selectinload(Book.images)
         )
 
+        return await self._paginate_books(self._filter_books(stmt, filters), filters)
+
+    async def get_books_list(self, filters: BookFilterSchema) -> Page[dict[str, Any]]:
+        """
+        Облегчённый список книг (view=slim): только нужные списку колонки и краткая информация об авторе.
+        ORM-объекты не создаются, строки сразу превращаются в словари для сериализации.
+
+        Args:
+            filters: Объект с параметрами фильтрации
+
+        Returns:
+            Страница (список словарей, всего записей в БД, курсор следующей страницы)
+        """
+        stmt = (
+            select(
+                Book.id,
+                Book.title,
+                Book.page,
+                Book.is_available,
+                Book.created_at,
+                Book.updated_at,
+                Book.author_id,
+                Author.name.label("author_name"),
+            )
+            .join(Book.author)
+        )
+
+        page = await self._paginate_books(self._filter_books(stmt, filters), filters, rows=True)
+        page.items = [
+            {
+                "id": row.id,
+                "title": row.title,
+                "page": row.page,
+                "is_available": row.is_available,
+                "created_at": row.created_at,
+                "updated_at": row.updated_at,
+                "author": {"id": row.author_id, "name": row.author_name},
+            }
+            for row in page.items
+        ]
+
+        return page
+
+    async def get_book_facets(self, filters: BookFilterSchema, authors_limit: int = 20) -> dict[str, Any]:
+        """
+        Счётчики для фильтров списка книг (наличие, статус удаления, авторы) одним запросом.
+        Кешируются по хешу фильтров, сбрасываются при изменении книг.
+        """
+
+        async def load() -> dict[str, Any]:
+            return await self._book_facets(filters, authors_limit)
+
+        if not is_cache_enabled():
+            return await load()
+
+        key = hash_key(filters.model_dump(include={"search", "author_id", "is_available", "deleted"}), authors_limit)
+        return await RedisCache().remember(
+            config.cache.namespace.books, "facets", key, config.cache.facets_ttl, load
+        )
+
+    async def _book_facets(self, filters: BookFilterSchema, authors_limit: int) -> dict[str, Any]:
+        """
+        Каждый фасет считается с учётом всех фильтров, кроме своего (чтобы показать счётчики других вариантов).
+        Общий для всех фасетов поиск идёт в WHERE, остальные фильтры - в FILTER (...) агрегатов,
+        авторы и итоги - в одном GROUP BY GROUPING SETS ((author_id, name), ()).
+        """
+        conditions = self._book_conditions(filters)
+        search = conditions.pop("search", None)
+
+        def count_where(*exclude: str, extra: ColumnElement[bool] | None = None):
+            parts = [condition for name, condition in conditions.items() if name not in exclude]
+            if extra is not None:
+                parts.append(extra)
+            return func.count().filter(and_(true(), *parts))
+
+        stmt = (
+            select(
+                func.grouping(Book.author_id).label("is_total"),
+                Book.author_id,
+                Author.name.label("author_name"),
+                count_where().label("total"),
+                count_where("availability", extra=Book.is_available.is_(True)).label("available"),
+                count_where("availability", extra=Book.is_available.is_(False)).label("unavailable"),
+                count_where("deleted", extra=Book.deleted_at.is_(None)).label("active"),
+                count_where("deleted", extra=Book.deleted_at.isnot(None)).label("deleted"),
+                count_where("author").label("author_count"),
+            )
+            .select_from(Book)
+            .outerjoin(Book.author)
+            .group_by(func.grouping_sets(tuple_(Book.author_id, Author.name), tuple_()))
+        )
+        if search is not None:
+            stmt = stmt.where(search)
+
+        totals = None
+        authors = []
+        for row in await self.session.execute(stmt):
+            if row.is_total:
+                totals = row
+            elif row.author_count:
+                authors.append({"id": row.author_id, "name": row.author_name, "count": row.author_count})
+
+        authors.sort(key=lambda author: (-author["count"], author["name"]))
+
+        return {
+            "total": totals.total if totals else 0,
+            "availability": {
+                "available": totals.available if totals else 0,
+                "unavailable": totals.unavailable if totals else 0,
+            },
+            "deleted": {
+                "active": totals.active if totals else 0,
+                "deleted": totals.deleted if totals else 0,
+            },
+            "authors": authors[:authors_limit],
+        }
+
+    @staticmethod
+    def _filter_books(stmt: Select, filters: BookFilterSchema) -> Select:
+        """Применить фильтры списка книг к запросу"""
+        return stmt.where(*BookService._book_conditions(filters).values())
+
+    @staticmethod
+    def _book_conditions(filters: BookFilterSchema) -> dict[str, ColumnElement[bool]]:
+        """Условия фильтров списка книг, по одному на измерение (нужно фасетам)"""
+        conditions: dict[str, ColumnElement[bool]] = {}
+
         # ✨ Фильтр по статусу удаления
         if filters.deleted == "active":
-            stmt = stmt.where(Book.deleted_at.is_(None))
+            conditions["deleted"] = Book.deleted_at.is_(None)
         elif filters.deleted == "deleted":
-            stmt = stmt.where(Book.deleted_at.isnot(None))
+            conditions["deleted"] = Book.deleted_at.isnot(None)
             # elif filters.deleted == "all" — не добавляем условие, получаем всех
 
         # ✨ Поиск по имени
         if filters.search:
-            stmt = stmt.where(Book.title.ilike(f"%{filters.search}%"))
+            conditions["search"] = contains(Book.title, filters.search)
 
         # ✨ Поиск по автору
         if filters.author_id:
-            stmt = stmt.where(Book.author_id == filters.author_id)
+            conditions["author"] = Book.author_id == filters.author_id
 
         # ✨ Поиск по наличию
         if filters.is_available == 1:
-            stmt = stmt.where(Book.is_available == True)
+            conditions["availability"] = Book.is_available == True
         elif filters.is_available == 0:
-            stmt = stmt.where(Book.is_available == False)
+            conditions["availability"] = Book.is_available == False
+
+        return conditions
+
+    async def _paginate_books(self, stmt: Select, filters: BookFilterSchema, rows: bool = False) -> Page:
+        """Сортировка и пагинация списка книг"""
+
+        # ✨ Сортировка по релевантности (только вместе с поиском)
+        if filters.sort_by == "relevance" and filters.search:
+            return await self._search_books_by_relevance(stmt, filters, rows)
 
         # ✨ Сортировка
         if filters.sort_by == "page":
@@ -65,14 +232,39 @@ class BookService:
         else:
             order_column = Book.title  # По умолчанию по имени
 
-        if filters.sort_order.lower() == "desc":
-            stmt = stmt.order_by(order_column.desc())
-        else:
-            stmt = stmt.order_by(order_column.asc())
-
-        recs, total = await PaginationHelper.paginate(self.session, stmt, filters.skip, filters.limit)
+        # id добавляется вторым ключом, чтобы порядок был строгим и по нему можно было строить курсор
+        keyset = Keyset(order_column, Book.id, descending=filters.sort_order.lower() == "desc")
+
+        return await PaginationHelper.paginate(
+            self.session,
+            stmt,
+            filters.skip,
+            filters.limit,
+            keyset=keyset,
+            cursor=filters.cursor,
+            count_strategy=filters.count_strategy,
+            cache_namespace=config.cache.namespace.books,
+            rows=rows,
+        )
 
-        return recs, total
+    async def _search_books_by_relevance(self, stmt: Select, filters: BookFilterSchema, rows: bool = False) -> Page:
+        """
+        Ранжированный поиск: книги, найденные по ILIKE (через триграммный GIN-индекс),
+        упорядочиваются по word_similarity(search, title) - сначала наиболее похожие.
+        Релевантность не является колонкой, поэтому здесь работает только пагинация через skip.
+        """
+        relevance = func.word_similarity(filters.search, Book.title)
+        stmt = stmt.order_by(relevance.desc(), Book.title.asc(), Book.id.asc())
+
+        return await PaginationHelper.paginate(
+            self.session,
+            stmt,
+            filters.skip,
+            filters.limit,
+            count_strategy=filters.count_strategy,
+            cache_namespace=config.cache.namespace.books,
+            rows=rows,
+        )
 
     async def get_by_id(self, book_id: int) -> Book:
         """Получить книгу по ID"""
@@ -90,6 +282,20 @@ class BookService:
 
         return model
 
+    async def get_book_detail(self, book_id: int) -> dict[str, Any]:
+        """Карточка книги для ответа API (read-through кеш в Redis)"""
+
+        async def load() -> dict[str, Any]:
+            model = await self.get_by_id(book_id)
+            return BookDetailResponse.model_validate(model, from_attributes=True).model_dump(mode="json")
+
+        if not is_cache_enabled():
+            return await load()
+
+        return await RedisCache().remember(
+            config.cache.namespace.books, "book", book_id, config.cache.detail_ttl, load
+        )
+
     async def find_by_title(self, title: str) -> Book|None:
         stmt = select(Book).where(Book.title == title)
         return await self.session.scalar(stmt)
@@ -104,6 +310,7 @@ class BookService:
 
         self.session.add(model)
         await self.session.commit()
+        await self._invalidate_cache()
         await self.session.refresh(model)
 
         return model
@@ -122,14 +329,187 @@ class BookService:
             setattr(model, field, value)
 
         await self.session.commit()
+        await self._invalidate_cache()
 
         return await self.get_by_id(model.id)
 
+    async def create_many(self, items: list[BookCreate]) -> BookBatchResponse:
+        """
+        Создать пачку книг: авторы и названия проверяются одним запросом,
+        книги добавляются одним multi-row INSERT в одной транзакции
+        """
+        now = datetime.now()
+        results: list[BookBatchItemResult] = []
+
+        author_ids = await self._existing_author_ids({item.author_id for item in items})
+        taken_titles = set(await self.session.scalars(
+            select(Book.title).where(Book.title.in_({item.title for item in items}))
+        ))
+
+        rows: list[dict[str, Any]] = []
+        for index, item in enumerate(items):
+            if item.author_id not in author_ids:
+                results.append(self._batch_error(index, f"Author with id {item.author_id} not found"))
+            elif item.title in taken_titles:
+                results.append(self._batch_error(index, f"Book with title '{item.title}' already exists"))
+            else:
+                taken_titles.add(item.title)
+                rows.append({**item.model_dump(), "updated_at": now})
+                results.append(BookBatchItemResult(index=index, status=BatchItemStatus.CREATED))
+
+        if rows:
+            # ✨ ON CONFLICT - на случай, если название заняли параллельно
+            stmt = (
+                insert(Book)
+                .on_conflict_do_nothing(index_elements=[Book.title])
+                .returning(Book.id, Book.title)
+            )
+            created = {title: book_id for book_id, title in await self.session.execute(stmt, rows)}
+            await self.session.commit()
+            await self._invalidate_cache()
+
+            for result in results:
+                if result.status == BatchItemStatus.CREATED:
+                    title = items[result.index].title
+                    if title in created:
+                        result.id = created[title]
+                    else:
+                        result.status = BatchItemStatus.ERROR
+                        result.error = f"Book with title '{title}' already exists"
+
+        return self._batch_response(results)
+
+    async def update_many(self, items: list[BookBatchUpdateItem]) -> BookBatchResponse:
+        """
+        Обновить пачку книг: книги, авторы и названия проверяются одним запросом каждые,
+        изменения пишутся пакетным UPDATE по первичному ключу в одной транзакции
+        """
+        now = datetime.now()
+        results: list[BookBatchItemResult] = []
+
+        book_ids = set(await self.session.scalars(
+            select(Book.id)
+            .where(Book.id.in_({item.id for item in items}))
+            .where(Book.deleted_at.is_(None))
+        ))
+        author_ids = await self._existing_author_ids(
+            {item.author_id for item in items if item.author_id is not None}
+        )
+        title_owners: dict[str, int] = {
+            title: book_id
+            for book_id, title in await self.session.execute(
+                select(Book.id, Book.title).where(Book.title.in_({item.title for item in items if item.title}))
+            )
+        }
+
+        rows: list[dict[str, Any]] = []
+        seen_ids: set[int] = set()
+        for index, item in enumerate(items):
+            data = item.model_dump(exclude_unset=True, exclude={"id"})
+            not_null = [
+                field for field in ("title", "page", "is_available", "author_id")
+                if field in data and data[field] is None
+            ]
+
+            if item.id not in book_ids:
+                results.append(self._batch_error(index, f"Book with id {item.id} not found"))
+            elif item.id in seen_ids:
+                results.append(self._batch_error(index, f"Book with id {item.id} is duplicated in the batch"))
+            elif not_null:
+                results.append(self._batch_error(index, f"Fields cannot be null: {', '.join(not_null)}"))
+            elif "author_id" in data and data["author_id"] not in author_ids:
+                results.append(self._batch_error(index, f"Author with id {data['author_id']} not found"))
+            elif "title" in data and title_owners.setdefault(data["title"], item.id) != item.id:
+                results.append(self._batch_error(index, f"Book with title '{data['title']}' already exists"))
+            else:
+                seen_ids.add(item.id)
+                rows.append({"id": item.id, **data, "updated_at": now})
+                results.append(BookBatchItemResult(index=index, id=item.id, status=BatchItemStatus.UPDATED))
+
+        if rows:
+            try:
+                await self.session.execute(update(Book), rows)
+                await self.session.commit()
+            except IntegrityError:
+                # например, две книги в пачке меняются названиями
+                await self.session.rollback()
+                raise BookBatchConflictError()
+            await self._invalidate_cache()
+
+        return self._batch_response(results)
+
+    async def _existing_author_ids(self, author_ids: set[int]) -> set[int]:
+        """Какие из авторов существуют (и не удалены) - одним запросом"""
+        if not author_ids:
+            return set()
+
+        stmt = select(Author.id).where(Author.id.in_(author_ids)).where(Author.deleted_at.is_(None))
+        return set(await self.session.scalars(stmt))
+
+    @staticmethod
+    def _batch_error(index: int, error: str) -> BookBatchItemResult:
+        return BookBatchItemResult(index=index, status=BatchItemStatus.ERROR, error=error)
+
+    @staticmethod
+    def _batch_response(results: list[BookBatchItemResult]) -> BookBatchResponse:
+        failed = sum(1 for result in results if result.status == BatchItemStatus.ERROR)
+        return BookBatchResponse(succeeded=len(results) - failed, failed=failed, items=results)
+
     async def delete(self, book_id: int) -> None:
         """Удалить книгу (soft delete)"""
         model = await self.get_by_id(book_id)
         model.deleted_at = datetime.now()
         await self.session.commit()
+        await self._invalidate_cache()
+
+    async def bulk_delete(self, data: BookBulkRequest) -> BulkOperationResponse:
+        """Удалить (soft delete) книги по списку id или по фильтру одним UPDATE"""
+        return await self._bulk_set_deleted(Book, self._book_bulk_conditions(data), deleted=True)
+
+    async def bulk_restore(self, data: BookBulkRequest) -> BulkOperationResponse:
+        """Восстановить удалённые книги по списку id или по фильтру одним UPDATE"""
+        return await self._bulk_set_deleted(Book, self._book_bulk_conditions(data), deleted=False)
+
+    @staticmethod
+    def _book_bulk_conditions(data: BookBulkRequest) -> list[ColumnElement[bool]]:
+        if data.ids is not None:
+            return [Book.id.in_(data.ids)]
+        return list(BookService._book_conditions(data.filter.to_filters()).values())
+
+    async def _bulk_set_deleted(
+            self,
+            model: type[Book] | type[Author],
+            conditions: list[ColumnElement[bool]],
+            deleted: bool,
+    ) -> BulkOperationResponse:
+        """
+        Проставить/снять deleted_at одним UPDATE ... RETURNING id.
+        Записи, уже находящиеся в нужном статусе, не затрагиваются и не входят в результат
+        """
+        # ✨ Без условий UPDATE затронул бы весь каталог
+        if not conditions:
+            raise BulkConditionRequiredError()
+
+        if deleted:
+            conditions = [*conditions, model.deleted_at.is_(None)]
+        else:
+            conditions = [*conditions, model.deleted_at.isnot(None)]
+
+        stmt = (
+            update(model)
+            .where(*conditions)
+            .values(deleted_at=datetime.now() if deleted else None)
+            .returning(model.id)
+            # объекты, уже загруженные в сессию, получают новое значение deleted_at
+            .execution_options(synchronize_session="fetch")
+        )
+        ids = list(await self.session.scalars(stmt))
+        await self.session.commit()
+
+        if ids:
+            await self._invalidate_cache()
+
+        return BulkOperationResponse(affected=len(ids), ids=sorted(ids))
 
     async def upload_img(self, book_id: int, file: UploadFile) -> Book:
         """Загрузить картинку"""
@@ -139,9 +519,15 @@ class BookService:
             entity_type=BOOK_MORPH_NAME,
             entity_id=book_id,
         )
+        await self._invalidate_cache()
 
         return await self.get_by_id(book_id)
 
+    async def _invalidate_cache(self) -> None:
+        """Сбросить закешированные данные книг и авторов (вызывается после каждого изменения)"""
+        if is_cache_enabled():
+            await RedisCache().bump(config.cache.namespace.books)
+
     async def _validate_author_exists(self, author_id: int) -> None:
         """Проверить существование автора"""
         # todo оптимизировать (deleted_at - проверять на уровни бд)
@@ -150,7 +536,7 @@ class BookService:
             raise AuthorNotFoundError(author_id)
 
     # ==================== AUTHORS ====================
-    async def get_all_authors(self, filters: AuthorFilterSchema) -> tuple[list[Author], int]:
+    async def get_all_authors(self, filters: AuthorFilterSchema) -> Page[Author]:
         """
         Получить список авторов с фильтрацией и сортировкой
 
@@ -158,9 +544,30 @@ class BookService:
             filters: Объект с параметрами фильтрации
 
         Returns:
-            Кортеж (список авторов, всего записей в БД)
+            Страница (список авторов, всего записей в БД, курсор следующей страницы)
         """
-        stmt = select(Author)
+        # ✨ Количество книг считается в БД коррелированными подзапросами (удалённые книги не учитываются):
+        # при сортировке по имени они выполняются только для авторов страницы,
+        # каждый - по частичному индексу ix_books_active_author_id_title_id, без агрегации всех книг
+        active_books = (
+            select(func.count())
+            .where(Book.author_id == Author.id, Book.deleted_at.is_(None))
+            .correlate(Author)
+        )
+        books_count = active_books.scalar_subquery().label("books_count")
+        available_books_count = (
+            active_books.where(Book.is_available.is_(True)).scalar_subquery().label("available_books_count")
+        )
+
+        stmt = (
+            select(Author)
+            .options(
+                with_expression(Author.books_count, books_count),
+                with_expression(Author.available_books_count, available_books_count),
+            )
+            # выражения заполняются и для авторов, уже загруженных в сессию
+            .execution_options(populate_existing=True)
+        )
 
         # ✨ Фильтр по статусу удаления
         if filters.deleted == "active":
@@ -171,22 +578,28 @@ class BookService:
 
         # ✨ Поиск по имени
         if filters.search:
-            stmt = stmt.where(Author.name.ilike(f"%{filters.search}%"))
+            stmt = stmt.where(contains(Author.name, filters.search))
 
         # ✨ Сортировка
-        if filters.sort_by == "name":
-            order_column = Author.name
+        if filters.sort_by == "books_count":
+            order_column = books_count
+        elif filters.sort_by == "available_books_count":
+            order_column = available_books_count
         else:
             order_column = Author.name  # По умолчанию по имени
 
-        if filters.sort_order.lower() == "desc":
-            stmt = stmt.order_by(order_column.desc())
-        else:
-            stmt = stmt.order_by(order_column.asc())
-
-        authors, total = await PaginationHelper.paginate(self.session, stmt, filters.skip, filters.limit)
-
-        return authors, total
+        keyset = Keyset(order_column, Author.id, descending=filters.sort_order.lower() == "desc")
+
+        return await PaginationHelper.paginate(
+            self.session,
+            stmt,
+            filters.skip,
+            filters.limit,
+            keyset=keyset,
+            cursor=filters.cursor,
+            count_strategy=filters.count_strategy,
+            cache_namespace=config.cache.namespace.books,
+        )
 
     async def get_author_by_id(self, author_id: int) -> Author:
         """Получить автора по ID"""
@@ -198,6 +611,20 @@ class BookService:
             raise AuthorNotFoundError(author_id)
         return model
 
+    async def get_author_detail(self, author_id: int) -> dict[str, Any]:
+        """Карточка автора для ответа API (read-through кеш в Redis)"""
+
+        async def load() -> dict[str, Any]:
+            model = await self.get_author_by_id(author_id)
+            return AuthorDetailResponse.model_validate(model, from_attributes=True).model_dump(mode="json")
+
+        if not is_cache_enabled():
+            return await load()
+
+        return await RedisCache().remember(
+            config.cache.namespace.books, "author", author_id, config.cache.detail_ttl, load
+        )
+
     async def find_author_by_name(self, name: str) -> Author|None:
         """Получить автора по имени"""
         stmt = (select(Author)
@@ -209,6 +636,7 @@ class BookService:
         model = Author(**data.model_dump())
         self.session.add(model)
         await self.session.commit()
+        await self._invalidate_cache()
 
         model = await self.get_author_by_id(model.id)
 
@@ -224,6 +652,7 @@ class BookService:
             setattr(model, field, value)
 
         await self.session.commit()
+        await self._invalidate_cache()
 
         return await self.get_author_by_id(model.id)
 
@@ -232,6 +661,7 @@ class BookService:
         model = await self.get_author_by_id(author_id)
         model.deleted_at = datetime.now()
         await self.session.commit()
+        await self._invalidate_cache()
 
     async def restore_author(self, author_id: int) -> Author:
         """Восстановить удалённого автора"""
@@ -243,9 +673,24 @@ class BookService:
 
         model.deleted_at = None
         await self.session.commit()
+        await self._invalidate_cache()
 
         return await self.get_author_by_id(model.id)
 
+    async def bulk_delete_authors(self, data: AuthorBulkRequest) -> BulkOperationResponse:
+        """Удалить (soft delete) авторов по списку id или по фильтру одним UPDATE (книги авторов не меняются)"""
+        return await self._bulk_set_deleted(Author, self._author_bulk_conditions(data), deleted=True)
+
+    async def bulk_restore_authors(self, data: AuthorBulkRequest) -> BulkOperationResponse:
+        """Восстановить удалённых авторов по списку id или по фильтру одним UPDATE"""
+        return await self._bulk_set_deleted(Author, self._author_bulk_conditions(data), deleted=False)
+
+    @staticmethod
+    def _author_bulk_conditions(data: AuthorBulkRequest) -> list[ColumnElement[bool]]:
+        if data.ids is not None:
+            return [Author.id.in_(data.ids)]
+        return [contains(Author.name, data.filter.search)]
+
     async def force_delete_author(self, author_id: int) -> None:
         """Полностью удалить автора из БД (если уже был удалён)"""
         # Получаем даже удалённого автора
@@ -262,83 +707,26 @@ class BookService:
         # Полностью удаляем из БД
         await self.session.delete(author)
         await self.session.commit()
+        await self._invalidate_cache()
 
-    async def import_json_to_db(self, file_path: str) -> None:
-        # print(file_path)
-        with open(file_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-
-        for entry in data:
-            author_name = entry.get("author")
-            author = await self.find_author_by_name(author_name)
-            if author is None:
-                author = await self.create_author(AuthorCreate(
-                    name=author_name,
-                    description=entry.get("description"),
-                ))
-
-            for item in entry.get("titles", []):
-                book_title = item.get("name")
-                book = await self.find_by_title(book_title)
-                # print(book_title)
-                if book is None:
-                    await self.create(
-                        BookCreate(
-                            title=book_title,
-                            description=item.get("description"),
-                            page=item.get("page"),
-                            author_id=author.id
-                        )
-                    )
-
-    async def export_to_excel(self):
-
-        stmt = select(Book).options(selectinload(Book.author))
-        result = await self.session.execute(stmt)
-        books = result.scalars().all()
-
-        # Формируем список словарей вручную для DataFrame
-        data = [
-            {
-                "ID": b.id,
-                "Название": b.title,
-                "Описание": b.description,
-                "Автор": b.author.name if b.author else "Не указан"
-            }
-            for b in books
-        ]
-
-        df = pd.DataFrame(data)
-
-        # Сохраняем Excel в буфер (в память)
-        buffer = io.BytesIO()
-        with pd.ExcelWriter(buffer, engine='openpyxl') as writer:
-            df.to_excel(writer, index=False, sheet_name='Books')
-
-        buffer.seek(0)  # Возвращаем указатель в начало файла
-
-        return buffer
-
-    async def export_to_csv(self):
-        stmt = select(Book).options(selectinload(Book.author))
-        result = await self.session.execute(stmt)
-        books = result.scalars().all()
+    async def import_json_to_db(self, file_path: str | Path, batch_size: int | None = None) -> ImportStats:
+        """
+        Загрузить каталог книг из json/NDJSON-файла.
+        Файл читается потоково, в БД записи пишутся пачками по batch_size книг.
+        """
+        stats = await BookImporter(self.session, batch_size).run(iter_catalogue(file_path))
+        await self._invalidate_cache()
 
-        data = [
-            {
-                "ID": b.id,
-                "Title": b.title,
-                "Author": b.author.name if b.author else "N/A"
-            }
-            for b in books
-        ]
+        return stats
 
-        df = pd.DataFrame(data)
+    async def export_to_excel(self) -> Path:
+        """XLSX-выгрузка книг во временный файл (удаляется после отправки)"""
+        return await BookExporter(self.session).xlsx()
 
-        # Сохраняем в текстовый буфер
-        buffer = io.StringIO()
-        df.to_csv(buffer, index=False, sep=';', encoding='utf-8-sig')
+    async def export_to_parquet(self) -> Path:
+        """Parquet-выгрузка книг во временный файл (удаляется после отправки)"""
+        return await BookExporter(self.session).parquet()
 
-        # Конвертируем текстовый буфер в байтовый для StreamingResponse
-        content = buffer.getvalue().encode('utf-8-sig')
-        return io.BytesIO(content)
\ No newline at end of file
+    def export_to_csv(self) -> AsyncIterator[bytes]:
+        """CSV-выгрузка книг по частям (без загрузки всего каталога в память)"""
+        return BookExporter(self.session).csv()
@@ -0,0 +1,133 @@
+"""
+Статистика каталога для дашбордов.
+
+Счётчики по авторам хранятся в материализованном представлении catalogue_stats
+(src/books/models.py), поэтому чтение не зависит от размера каталога: запросы идут
+к одной строке на автора, а не к books и media.
+
+Представление обновляется CONCURRENTLY (чтение не блокируется) фоновой задачей воркера
+(StatsRefresher) раз в config.stats.refresh_interval секунд и только если каталог менялся:
+изменение книг, авторов и картинок сбрасывает версию кеша книг (BookService._invalidate_cache).
+Когда версия недоступна (кеш выключен, Redis недоступен), представление обновляется на каждом шаге.
+Вручную - python -m cli.main stats refresh.
+"""
+
+import asyncio
+import time
+
+from loguru import logger
+from sqlalchemy import BigInteger, ColumnElement, cast, func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.books.models import catalogue_stats
+from src.config import config
+from src.core.cache import RedisCache, is_cache_enabled
+
+
+class CatalogueStatsService:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get_stats(self, authors_limit: int) -> dict:
+        """
+        Итоги каталога и авторы с наибольшим количеством книг (удалённые авторы не учитываются)
+
+        Args:
+            authors_limit: Сколько авторов вернуть
+        """
+        active = catalogue_stats.c.author_deleted.is_(False)
+
+        def total(column) -> ColumnElement[int]:
+            # sum(bigint) в postgres - numeric
+            return cast(func.coalesce(func.sum(column), 0), BigInteger)
+
+        totals = (await self.session.execute(
+            select(
+                func.count().filter(active).label("authors"),
+                total(catalogue_stats.c.books_count).label("books"),
+                total(catalogue_stats.c.available_books_count).label("available"),
+                total(catalogue_stats.c.deleted_books_count).label("deleted"),
+                total(catalogue_stats.c.images_count).label("images"),
+            )
+        )).one()
+
+        authors = await self.session.execute(
+            select(
+                catalogue_stats.c.author_id.label("id"),
+                catalogue_stats.c.author_name.label("name"),
+                catalogue_stats.c.books_count,
+                catalogue_stats.c.available_books_count,
+                catalogue_stats.c.deleted_books_count,
+                catalogue_stats.c.images_count,
+            )
+            .where(active)
+            .order_by(catalogue_stats.c.books_count.desc(), catalogue_stats.c.author_id)
+            .limit(authors_limit)
+        )
+
+        return {
+            "authors_count": totals.authors,
+            "books_count": totals.books,
+            "availability": {
+                "available": totals.available,
+                "unavailable": totals.books - totals.available,
+            },
+            "deleted_books_count": totals.deleted,
+            "images_count": totals.images,
+            "authors": [row._asdict() for row in authors],
+        }
+
+    async def refresh(self) -> float:
+        """Пересчитать статистику, возвращает время пересчёта в секундах"""
+        started_at = time.perf_counter()
+
+        await self.session.execute(text("REFRESH MATERIALIZED VIEW CONCURRENTLY catalogue_stats"))
+        await self.session.commit()
+
+        return time.perf_counter() - started_at
+
+
+class StatsRefresher:
+    """Фоновое обновление статистики (запускается воркером FastStream)"""
+
+    def __init__(
+            self,
+            session_factory: async_sessionmaker[AsyncSession],
+            interval: int | None = None,
+            cache: RedisCache | None = None,
+    ):
+        """
+        Args:
+            session_factory: Фабрика сессий БД (своя сессия на каждое обновление)
+            interval: Период проверки изменений в секундах
+            cache: Кеш, из которого берётся версия книг (по умолчанию - Redis приложения, если кеш включён)
+        """
+        self.session_factory = session_factory
+        self.interval = interval or config.stats.refresh_interval
+        self.cache = cache or (RedisCache() if is_cache_enabled() else None)
+        # версия кеша книг на момент последнего обновления
+        self._version: int | None = None
+
+    async def refresh_if_changed(self) -> bool:
+        """Обновить статистику, если каталог изменился с прошлого обновления"""
+        version = await self.cache.version(config.cache.namespace.books) if self.cache else None
+        if version is not None and version == self._version:
+            return False
+
+        async with self.session_factory() as session:
+            elapsed = await CatalogueStatsService(session).refresh()
+
+        self._version = version
+        logger.info(f"Catalogue stats refreshed in {elapsed:.3f} s")
+        return True
+
+    async def run(self) -> None:
+        """Обновлять статистику раз в interval секунд до отмены задачи"""
+        while True:
+            try:
+                await self.refresh_if_changed()
+            except Exception:
+                # ошибка одного обновления не должна останавливать задачу
+                logger.exception("Catalogue stats refresh failed")
+
+            await asyncio.sleep(self.interval)
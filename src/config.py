@@ -42,10 +42,42 @@ class AuthJWTConfig(BaseSettings):
     # значение по умолчанию
     private_key_path: Path = BASE_DIR / "jwt-private.pem" # путь к приватному ключу
     public_key_path: Path = BASE_DIR / "jwt-public.pem"   # путь к публичному ключу
-    algorithm: str = "RS256"                 # алгоритм шифрования
+    previous_public_key_paths: list[Path] = [] # старые публичные ключи (ротация): токены ими только проверяются
+    key_id: str | None = None                # kid текущего ключа (по умолчанию - отпечаток ключа, RFC 7638)
+    algorithm: str = "RS256"                 # алгоритм шифрования (RS256, ES256, EdDSA - по типу ключа)
     access_token_expired: int = 10           # время жизни токена
     refresh_token_expired: int = 60*24*7     # время жизни токена
     reset_password_token_expired: int = 60   # время жизни токена
+    verified_tokens_cache_size: int = 10_000 # сколько проверенных access-токенов хранится в памяти (0 - не кешировать)
+    permission_claims: bool = False          # права роли в access-токене: проверка прав без БД (нужен Redis)
+
+class RevocationConfig(BaseSettings):
+    model_config = SettingsConfigDict(
+        env_file=".env", env_prefix="REVOCATION_", extra="ignore", frozen = True
+    )
+    # значение по умолчанию
+    enabled: bool = True           # отзыв refresh-токенов в Redis (в тестах всегда выключен)
+    bloom_capacity: int = 100_000  # на сколько отозванных записей рассчитан фильтр Блума
+    bloom_error_rate: float = 0.001  # доля ложных срабатываний фильтра (они проверяются в Redis)
+    rebuild_interval: int = 3600   # как часто (в секундах) фильтр пересобирается из Redis (истёкшие записи выпадают)
+
+class PrincipalConfig(BaseSettings):
+    model_config = SettingsConfigDict(
+        env_file=".env", env_prefix="PRINCIPAL_", extra="ignore", frozen = True
+    )
+    # значение по умолчанию
+    ttl: int = 10          # сколько секунд права пользователя хранятся в памяти процесса (0 - не кешировать)
+    max_size: int = 10_000 # сколько пользователей хранится в памяти процесса
+    redis_ttl: int = 300   # сколько секунд права пользователя хранятся в Redis
+
+class PasswordConfig(BaseSettings):
+    model_config = SettingsConfigDict(
+        env_file=".env", env_prefix="PASSWORD_", extra="ignore", frozen = True
+    )
+    # значение по умолчанию
+    rounds: int = 12       # стоимость bcrypt (при изменении пароль перехешируется при входе)
+    workers: int = 4       # сколько хешей bcrypt считается одновременно (потоки)
+    max_pending: int = 64  # сколько операций может ждать свободный поток (больше - 503)
 
 class EmailConfig(BaseSettings):
     model_config = SettingsConfigDict(
@@ -116,11 +148,28 @@ class RedisConfig(BaseSettings):
 
 class CacheNamespace(BaseSettings):
     permissions: str = "permissions"
+    books: str = "books"  # книги и авторы (сбрасывается при любом их изменении)
+    principals: str = "principals"  # данные авторизации пользователей (сбрасывается при изменении ролей и прав)
 
 class CacheConfig(BaseSettings):
+    model_config = SettingsConfigDict(
+        env_file=".env", env_prefix="CACHE_", extra="ignore", frozen = True
+    )
+    # значение по умолчанию
     prefix: str = "app-cache"
+    enabled: bool = True   # кеширование данных в Redis (в тестах всегда выключено)
+    detail_ttl: int = 300  # сколько секунд хранится карточка книги/автора
+    facets_ttl: int = 60   # сколько секунд хранятся счётчики фильтров книг
     namespace: CacheNamespace = CacheNamespace()
 
+class PaginationConfig(BaseSettings):
+    model_config = SettingsConfigDict(
+        env_file=".env", env_prefix="PAGINATION_", extra="ignore", frozen = True
+    )
+    # значение по умолчанию
+    count_cache_ttl: int = 30                # сколько секунд хранится закешированный total (count_strategy=cached)
+    count_estimate_threshold: int = 10_000   # ниже этой оценки планировщика total считается точно
+
 
 class MediaConfig(BaseSettings):
     model_config = SettingsConfigDict(
@@ -140,6 +189,39 @@ class MediaConfig(BaseSettings):
         "medium": (600, 600)
     }
 
+class ExportConfig(BaseSettings):
+    model_config = SettingsConfigDict(
+        env_file=".env", env_prefix="EXPORT_", extra="ignore", frozen = True
+    )
+    # значение по умолчанию
+    batch_size: int = 1000  # сколько строк читается из БД за раз (серверный курсор)
+    root_path: Path = BASE_DIR / "storage" / "exports"  # файлы фоновых выгрузок
+    job_ttl: int = 3600     # сколько секунд хранятся задача и её файл (и переиспользуется результат)
+
+class StatsConfig(BaseSettings):
+    model_config = SettingsConfigDict(
+        env_file=".env", env_prefix="STATS_", extra="ignore", frozen = True
+    )
+    # значение по умолчанию
+    refresh_interval: int = 60  # как часто (в секундах) воркер проверяет изменения каталога и обновляет статистику
+
+class PurgeConfig(BaseSettings):
+    model_config = SettingsConfigDict(
+        env_file=".env", env_prefix="PURGE_", extra="ignore", frozen = True
+    )
+    # значение по умолчанию
+    retention_days: int = 30    # через сколько дней удалённые (soft delete) книги и авторы удаляются из БД
+    batch_size: int = 500       # сколько записей удаляется за одну транзакцию
+    batch_pause: float = 0.2    # пауза между пачками (секунды), чтобы не нагружать БД
+    interval: int = 3600        # как часто (в секундах) воркер запускает очистку
+
+class ImportConfig(BaseSettings):
+    model_config = SettingsConfigDict(
+        env_file=".env", env_prefix="IMPORT_", extra="ignore", frozen = True
+    )
+    # значение по умолчанию
+    batch_size: int = 1000  # сколько книг записывается в БД за одну транзакцию
+
 class RabbitMQConfig(BaseSettings):
     model_config = SettingsConfigDict(
         env_file=".env", env_prefix="RABBITMQ_", extra="ignore", frozen=True
@@ -161,12 +243,20 @@ class Config(BaseSettings):
     db: DatabaseConfig = DatabaseConfig()
     logger: LoggerLoguruConfig = LoggerLoguruConfig()
     auth: AuthJWTConfig = AuthJWTConfig()
+    principal: PrincipalConfig = PrincipalConfig()
+    password: PasswordConfig = PasswordConfig()
+    revocation: RevocationConfig = RevocationConfig()
     email: EmailConfig = EmailConfig()
     mail: MailConfig = MailConfig()
     cors: CORSConfig = CORSConfig()
     redis: RedisConfig = RedisConfig()
     cache: CacheConfig = CacheConfig()
+    pagination: PaginationConfig = PaginationConfig()
     media: MediaConfig = MediaConfig()
+    export: ExportConfig = ExportConfig()
+    importer: ImportConfig = ImportConfig()
+    stats: StatsConfig = StatsConfig()
+    purge: PurgeConfig = PurgeConfig()
     rabbitmq: RabbitMQConfig = RabbitMQConfig()
 
 @lru_cache
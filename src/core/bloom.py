@@ -0,0 +1,37 @@
+"""Фильтр Блума: быстрая проверка "точно нет во множестве" без хранения самих элементов"""
+
+import hashlib
+import math
+
+
+class BloomFilter:
+    def __init__(self, capacity: int, error_rate: float):
+        """
+        Args:
+            capacity: На сколько элементов рассчитан фильтр (сверх этого растёт доля ложных срабатываний)
+            error_rate: Доля ложных срабатываний при capacity элементах
+        """
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+        self._count = 0
+
+    def __len__(self) -> int:
+        """Сколько элементов добавлено"""
+        return self._count
+
+    def _positions(self, item: str):
+        # k хешей из одного blake2b (двойное хеширование)
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first, second = int.from_bytes(digest[:8]), int.from_bytes(digest[8:]) | 1
+        for i in range(self.hashes):
+            yield (first + i * second) % self.size
+
+    def add(self, item: str) -> None:
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self._count += 1
+
+    def __contains__(self, item: str) -> bool:
+        """False - элемента точно нет, True - возможно есть"""
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
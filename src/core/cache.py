@@ -0,0 +1,128 @@
+"""Кеширование данных приложения в Redis"""
+
+import hashlib
+from typing import Any, Awaitable, Callable
+
+import orjson
+from loguru import logger
+from prometheus_client import Counter
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from src.config import config
+from src.core.dependencies.redis import get_redis
+
+# Отдаётся вместе с остальными метриками на /__internal_metrics__
+CACHE_REQUESTS = Counter(
+    "app_cache_requests_total",
+    "Обращения к кешу данных (read-through)",
+    ["cache", "result"],
+)
+
+
+def is_cache_enabled() -> bool:
+    """
+    Кеш выключен в тестах: данные каждого теста откатываются,
+    и закешированные ответы одного теста попадали бы в другой
+    """
+    return config.cache.enabled and not config.app.is_testing_env
+
+
+def cache_key(*parts: Any) -> str:
+    """Построить ключ вида <prefix>:<part>:<part>..."""
+    return ":".join([config.cache.prefix, *(str(part) for part in parts)])
+
+
+def hash_key(*parts: Any) -> str:
+    """Короткий хеш от произвольных (json-сериализуемых) данных, например от фильтров"""
+    raw = orjson.dumps(parts, default=str, option=orjson.OPT_SORT_KEYS)
+    return hashlib.md5(raw).hexdigest()  # noqa: S324
+
+
+class RedisCache:
+    """
+    Обёртка над Redis для кеширования json-данных.
+
+    Недоступность Redis не должна ломать запросы: ошибки логируются,
+    а чтение возвращает None (промах), как будто записи в кеше нет.
+
+    Инвалидация группами через версию пространства имён: версия входит в ключи записей,
+    bump() увеличивает её, и все старые записи перестают читаться (и истекают по TTL).
+    """
+
+    def __init__(self, redis: Redis | None = None):
+        self._redis = redis or get_redis()
+
+    async def get(self, key: str) -> Any | None:
+        try:
+            value = await self._redis.get(key)
+        except RedisError as e:
+            logger.warning(f"Cache get failed [{key}]: {e}")
+            return None
+
+        return None if value is None else orjson.loads(value)
+
+    async def set(self, key: str, value: Any, ttl: int) -> None:
+        try:
+            await self._redis.set(key, orjson.dumps(value, default=str), ex=ttl)
+        except RedisError as e:
+            logger.warning(f"Cache set failed [{key}]: {e}")
+
+    async def delete(self, *keys: str) -> None:
+        try:
+            await self._redis.delete(*keys)
+        except RedisError as e:
+            logger.warning(f"Cache delete failed [{keys}]: {e}")
+
+    async def version(self, namespace: str) -> int | None:
+        """Текущая версия пространства имён (None - Redis недоступен)"""
+        try:
+            value = await self._redis.get(cache_key("version", namespace))
+        except RedisError as e:
+            logger.warning(f"Cache version failed [{namespace}]: {e}")
+            return None
+
+        return int(value or 0)
+
+    async def bump(self, namespace: str) -> None:
+        """Инвалидировать все записи пространства имён"""
+        try:
+            await self._redis.incr(cache_key("version", namespace))
+        except RedisError as e:
+            logger.warning(f"Cache bump failed [{namespace}]: {e}")
+
+    async def remember(
+            self,
+            namespace: str,
+            name: str,
+            key: Any,
+            ttl: int,
+            loader: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        """
+        Read-through: вернуть значение из кеша, а при промахе - загрузить через loader() и закешировать
+
+        Args:
+            namespace: Пространство имён (его версия входит в ключ, bump() сбрасывает все записи)
+            name: Вид записи, например "book" (часть ключа и метка метрики)
+            key: Идентификатор записи
+            ttl: Время жизни записи в секундах
+            loader: Загрузка значения (json-сериализуемого) при промахе
+        """
+        version = await self.version(namespace)
+        if version is None:
+            # Redis недоступен - работаем напрямую с БД
+            return await loader()
+
+        full_key = cache_key(namespace, version, name, key)
+
+        value = await self.get(full_key)
+        if value is not None:
+            CACHE_REQUESTS.labels(cache=name, result="hit").inc()
+            return value
+
+        CACHE_REQUESTS.labels(cache=name, result="miss").inc()
+        value = await loader()
+        await self.set(full_key, value, ttl=ttl)
+
+        return value
@@ -1,6 +1,12 @@
+import asyncio
+import contextlib
+
 from faststream import FastStream
 from src.faststream.broker import broker
 from src.faststream.subscribers.users import router as users_router
+from src.faststream.subscribers.exports import router as exports_router
+from src.books.purge import PurgeScheduler
+from src.books.stats import StatsRefresher
 from src.database import init_db, dispose
 
 app = FastStream(
@@ -8,11 +14,25 @@ app = FastStream(
 )
 
 broker.include_router(users_router)
+broker.include_router(exports_router)
+
+# Периодические задачи: обновление статистики каталога (src/books/stats.py)
+# и очистка удалённых записей (src/books/purge.py)
+background_tasks: list[asyncio.Task] = []
 
 @app.after_startup
 async def startup():
-    init_db() # Инициализируем engine и sessionmaker
+    _, session_factory = init_db() # Инициализируем engine и sessionmaker
+
+    background_tasks.append(asyncio.create_task(StatsRefresher(session_factory).run()))
+    background_tasks.append(asyncio.create_task(PurgeScheduler(session_factory).run()))
 
 @app.after_shutdown
 async def shutdown():
-    await dispose() # Закрываем соединения
\ No newline at end of file
+    for task in background_tasks:
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+    background_tasks.clear()
+
+    await dispose() # Закрываем соединения
@@ -0,0 +1,28 @@
+from faststream.rabbit import RabbitRouter
+from loguru import logger
+from typing import Annotated
+from sqlalchemy.ext.asyncio import AsyncSession
+from faststream import Depends as BrokerDepends
+
+from src.books.export_jobs import EXPORT_QUEUE, ExportJobService
+from src.database import get_db
+
+router = RabbitRouter()
+
+@router.subscriber(EXPORT_QUEUE)
+async def books_export(
+    job_id: str,
+    session: Annotated[AsyncSession, BrokerDepends(get_db)]
+)->None:
+    """
+    Обработчик выгрузки книг:
+     - запись файла в каталог выгрузок
+     - прогресс и результат сохраняются в задаче (Redis)
+
+    :param job_id: Export job id
+    :return: None
+    """
+
+    logger.info(f"Books export - [{job_id}]")
+
+    await ExportJobService(session).run(job_id)
@@ -3,6 +3,8 @@ import os
 import signal
 import httpx
 
+import asyncio
+import contextlib
 from contextlib import asynccontextmanager
 from typing import AsyncGenerator
 
@@ -16,6 +18,8 @@ from src.core.dependencies.redis import get_redis
 from src.core.schemas.responses import ErrorBaseResponse
 from src.config import config
 from src.database import init_db, dispose
+from src.auth.hasher import password_hasher
+from src.auth.revocation import is_revocation_enabled, revocation_store
 from src.logger import init_logger
 from src.core.errors.errors_handlers import register_errors_handlers
 from src.core.middlewares.middlewares import register_middlewares
@@ -47,12 +51,21 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     # FastStream (RabbitMQ)
     await broker.start()
 
+    # Отзывы refresh-токенов от других воркеров (src/auth/revocation.py)
+    revocation_task = asyncio.create_task(revocation_store.run()) if is_revocation_enabled() else None
+
     yield
     # --- SHUTDOWN ---
 
+    if revocation_task:
+        revocation_task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await revocation_task
+
     await dispose()
     await broker.stop() # FastStream (RabbitMQ)
     await redis.aclose()
+    password_hasher.shutdown()
 
 
 # Общие ответы
@@ -4,7 +4,7 @@ from fastapi import APIRouter, status, Depends
 from src.media.dependencies import MediaServiceDep
 from src.rbac.dependencies import PermissionRequired
 from src.rbac.permissions import Permissions
-from src.users.models import User
+from src.auth.principal import Principal
 
 router = APIRouter(prefix="/upload", tags=["Upload"])
 
@@ -13,7 +13,7 @@ router = APIRouter(prefix="/upload", tags=["Upload"])
 async def delete_book(
     media_id: int,
     service: MediaServiceDep,
-    user: Annotated[User, Depends(PermissionRequired(Permissions.MEDIA_DELETE))]
+    user: Annotated[Principal, Depends(PermissionRequired(Permissions.MEDIA_DELETE))]
 )->None:
     print("DELETE")
 
@@ -9,6 +9,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from src.media.models import Media
 from src.media.storage import LocalStorageBackend
 from src.config import config
+from src.core.cache import RedisCache, is_cache_enabled
 
 
 class MediaService:
@@ -73,4 +74,8 @@ class MediaService:
                 for path in media.thumbnails.values():
                     await self.storage.delete(path)
             await self.session.delete(media)
-            await self.session.commit()
\ No newline at end of file
+            await self.session.commit()
+
+            # картинки входят в закешированные карточки книг
+            if is_cache_enabled():
+                await RedisCache().bump(config.cache.namespace.books)
\ No newline at end of file
@@ -0,0 +1,82 @@
+"""
+Скомпилированные роли: набор прав роли в виде frozenset и битовой маски.
+
+Проверка права - одна операция (побитовое И или проверка вхождения), без обхода
+ORM-коллекции role.permissions. Роль компилируется один раз и хранится в реестре
+процесса (role_registry) по id.
+
+RbacService обновляет роль в реестре после create_role/update_role, остальные изменения
+ролей и прав очищают реестр (invalidate_principals). Изменения из других процессов
+подхватываются не позже чем через config.principal.ttl секунд.
+"""
+
+import time
+from dataclasses import dataclass
+
+from src.config import config
+from src.rbac.permissions import DEFAULT_ROLE_ALIASES, DefaultRole, permissions_to_mask
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledRole:
+    """Неизменяемый снимок роли для проверки прав"""
+
+    id: int
+    alias: str
+    permissions: frozenset[str]
+    mask: int  # биты прав (PERMISSION_BITS)
+
+    @classmethod
+    def from_role(cls, role) -> "CompiledRole":
+        """Собрать из роли с загруженными правами"""
+        permissions = frozenset(p.alias for p in role.permissions)
+        return cls(id=role.id, alias=role.alias, permissions=permissions, mask=permissions_to_mask(permissions))
+
+    @property
+    def is_superadmin(self) -> bool:
+        return self.alias == DefaultRole.SUPERADMIN.value
+
+    @property
+    def is_default(self) -> bool:
+        return self.alias in DEFAULT_ROLE_ALIASES
+
+    def allows(self, permission_alias: str) -> bool:
+        """Проверка прав: если superadmin или есть нужный алиас в правах роли"""
+        return self.is_superadmin or permission_alias in self.permissions
+
+
+class RoleRegistry:
+    def __init__(self, ttl: int | None = None):
+        """
+        Args:
+            ttl: Сколько секунд скомпилированная роль хранится в процессе (0 - компилировать при каждом запросе)
+        """
+        self.ttl = config.principal.ttl if ttl is None else ttl
+        # role_id -> (истекает в, роль)
+        self._items: dict[int, tuple[float, CompiledRole]] = {}
+
+    @property
+    def enabled(self) -> bool:
+        # в тестах выключен: права ролей меняются напрямую через БД, в обход RbacService
+        return self.ttl > 0 and not config.app.is_testing_env
+
+    def get(self, role) -> CompiledRole:
+        """Скомпилированная роль из реестра, при промахе - из ORM-роли (role.permissions должны быть загружены)"""
+        item = self._items.get(role.id)
+        if item and item[0] > time.monotonic():
+            return item[1]
+
+        return self.refresh(role)
+
+    def refresh(self, role) -> CompiledRole:
+        """Перекомпилировать роль (права роли изменились)"""
+        compiled = CompiledRole.from_role(role)
+        if self.enabled:
+            self._items[role.id] = (time.monotonic() + self.ttl, compiled)
+        return compiled
+
+    def clear(self) -> None:
+        self._items.clear()
+
+
+role_registry = RoleRegistry()
@@ -18,7 +18,7 @@ from src.rbac.schemas import (
 )
 from src.rbac.models import Role
 from src.rbac.service import RbacService
-from src.users.models import User
+from src.auth.principal import Principal
 from src.config import config
 
 router = APIRouter(
@@ -32,7 +32,7 @@ router = APIRouter(
 )
 async def get_roles(
     service: RbacServiceDep,
-    user: Annotated[User, Depends(PermissionRequired(Permissions.ROLE_LIST))]
+    user: Annotated[Principal, Depends(PermissionRequired(Permissions.ROLE_LIST))]
 )->ResponseList[RoleDetailResponse]:
     data = await service.get_all_roles(
         exclude_aliases=[DefaultRole.SUPERADMIN.value]
@@ -48,7 +48,7 @@ async def get_roles(
 async def get_role(
     role_id: int,
     service: RbacServiceDep,
-    user: Annotated[User, Depends(PermissionRequired(Permissions.ROLE_SHOW))]
+    user: Annotated[Principal, Depends(PermissionRequired(Permissions.ROLE_SHOW))]
 )->Role:
 
     model = await service.get_by_id(role_id)
@@ -66,7 +66,7 @@ async def get_role(
 async def create_role(
     data: RoleCreate,
     service: RbacServiceDep,
-    user: Annotated[User, Depends(PermissionRequired(Permissions.ROLE_CREATE))]
+    user: Annotated[Principal, Depends(PermissionRequired(Permissions.ROLE_CREATE))]
 )->Role:
     return await service.create_role(data)
 
@@ -79,7 +79,7 @@ async def update_role(
     role_id: int,
     data: RoleUpdate,
     service: RbacServiceDep,
-    user: Annotated[User, Depends(PermissionRequired(Permissions.ROLE_UPDATE))]
+    user: Annotated[Principal, Depends(PermissionRequired(Permissions.ROLE_UPDATE))]
 ):
     return await service.update_role(role_id, data)
 
@@ -91,7 +91,7 @@ async def update_role(
 async def delete_role(
     role_id: int,
     service: RbacServiceDep,
-    user: Annotated[User, Depends(PermissionRequired(Permissions.ROLE_DELETE))]
+    user: Annotated[Principal, Depends(PermissionRequired(Permissions.ROLE_DELETE))]
 )->None:
     return await service.delete_role(role_id)
 
@@ -106,7 +106,7 @@ def perm_list_key_builder(
 ) -> str:
 
     # убираем обьекты из kwards так как они постоянно имеют другой адрес из-за чего ключ для кеша всегда разные
-    exclude_types = (RbacService,User)
+    exclude_types = (RbacService, Principal)
     # exclude_types = ()
     cache_kw = {}
     for name, value in kwargs.items():
@@ -132,7 +132,7 @@ def perm_list_key_builder(
 # )
 async def get_permissions(
     service: RbacServiceDep,
-    user: Annotated[User, Depends(PermissionRequired(Permissions.PERMISSION_LIST))]
+    user: Annotated[Principal, Depends(PermissionRequired(Permissions.PERMISSION_LIST))]
 )->ResponseList[PermissionsDetailResponse]:
     data = await service.get_all_permissions()
     return ResponseList(data=data)
@@ -1,10 +1,10 @@
 from typing import Annotated
 from fastapi import Depends
 
-from src.auth.dependencies import CurrentUserDep
+from src.auth.dependencies import CurrentPrincipalDep
 from src.database import DbSessionDep
 from src.rbac.exceptions import ForbiddenError
-from src.rbac.permissions import Permissions
+from src.rbac.permissions import PERMISSION_BITS, Permissions
 from src.rbac.service import RbacService
 
 def get_service(session: DbSessionDep) -> RbacService:
@@ -15,8 +15,10 @@ RbacServiceDep = Annotated[RbacService, Depends(get_service)]
 class PermissionRequired:
     def __init__(self, permission: Permissions):
         self.permission = permission.value
+        # бит права вычисляется один раз при объявлении маршрута
+        self.bit = PERMISSION_BITS[self.permission]
 
-    async def __call__(self, user: CurrentUserDep):
-        if not user.has_permission(self.permission):
+    async def __call__(self, user: CurrentPrincipalDep):
+        if not user.allows(self.bit):
             raise ForbiddenError(detail=f"Недостаточно прав: требуется {self.permission}")
         return user
\ No newline at end of file
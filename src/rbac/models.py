@@ -2,7 +2,8 @@ from sqlalchemy import String, Text, ForeignKey, Boolean
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.database import Base
-from src.rbac.permissions import DefaultRole
+from src.rbac.compiled import CompiledRole, role_registry
+from src.rbac.permissions import DEFAULT_ROLE_ALIASES, DefaultRole
 
 
 class Role(Base):
@@ -22,7 +23,12 @@ class Role(Base):
 
     @property
     def is_default(self) -> bool:
-        return self.alias in [role.value for role in DefaultRole]
+        return self.alias in DEFAULT_ROLE_ALIASES
+
+    @property
+    def compiled(self) -> CompiledRole:
+        """Набор прав роли для проверок (из реестра ролей процесса)"""
+        return role_registry.get(self)
 
 class Permission(Base):
     __tablename__ = "rbac_permissions"
@@ -1,9 +1,14 @@
+import hashlib
 from enum import Enum
+from functools import lru_cache
 
 class DefaultRole(Enum):
     USER       = "user"
     SUPERADMIN = "superadmin"
 
+# алиасы ролей по умолчанию (их нельзя удалить)
+DEFAULT_ROLE_ALIASES = frozenset(role.value for role in DefaultRole)
+
 class PermissionGroup(Enum):
     USER       = "user"
     ROLE       = "role"
@@ -43,12 +48,39 @@ class  Permissions(Enum):
     BOOK_CREATE     = f"{PermissionGroup.BOOK.value}.create"
     BOOK_UPDATE     = f"{PermissionGroup.BOOK.value}.update"
     BOOK_DELETE     = f"{PermissionGroup.BOOK.value}.delete"
+    BOOK_RESTORE    = f"{PermissionGroup.BOOK.value}.restore"
     BOOK_UPLOAD_IMG = f"{PermissionGroup.BOOK.value}.upload_img"
     BOOK_EXPORT     = f"{PermissionGroup.BOOK.value}.export"
 
     MEDIA_DELETE = f"{PermissionGroup.MEDIA.value}.delete"
 
 
+# ==================== Bitmask ====================
+# Права в виде битовой маски (для claims access-токена): бит права - позиция в Permissions.
+# При изменении состава или порядка Permissions меняется PERMISSIONS_LAYOUT,
+# и маски из ранее выданных токенов перестают приниматься
+
+PERMISSION_BITS: dict[str, int] = {permission.value: 1 << index for index, permission in enumerate(Permissions)}
+
+PERMISSIONS_LAYOUT = hashlib.md5(  # noqa: S324
+    ",".join(PERMISSION_BITS).encode()
+).hexdigest()[:8]
+
+
+def permissions_to_mask(aliases) -> int:
+    """Маска по алиасам прав (алиасы, которых нет в Permissions, пропускаются)"""
+    mask = 0
+    for alias in aliases:
+        mask |= PERMISSION_BITS.get(alias, 0)
+    return mask
+
+
+@lru_cache(maxsize=256)
+def mask_to_permissions(mask: int) -> frozenset[str]:
+    """Алиасы прав по маске (масок немного - по одной на роль, поэтому результат кешируется)"""
+    return frozenset(alias for alias, bit in PERMISSION_BITS.items() if mask & bit)
+
+
 def get_permissions_for_seed():
     return {
         PermissionGroup.USER.value: [
@@ -83,6 +115,7 @@ def get_permissions_for_seed():
             {"alias": Permissions.BOOK_CREATE.value, "description": "Создать книгу"},
             {"alias": Permissions.BOOK_UPDATE.value, "description": "Редактировать книгу"},
             {"alias": Permissions.BOOK_DELETE.value, "description": "Удалить книгу"},
+            {"alias": Permissions.BOOK_RESTORE.value, "description": "Восстановить книгу"},
             {"alias": Permissions.BOOK_UPLOAD_IMG.value, "description": "Загрузить картинок для книг"},
             {"alias": Permissions.BOOK_EXPORT.value, "description": "Выгрузка книг"},
         ],
@@ -6,6 +6,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session, selectinload
 from loguru import logger
 from src.users.models import User
+from src.auth.principal import invalidate_principals
+from src.rbac.compiled import role_registry
 
 from src.rbac.permissions import (
     DefaultRole,
@@ -116,7 +118,10 @@ class RbacService:
 
         logger.success(f"Created role: {model.alias}")
 
-        return await self.get_by_id(model.id)
+        model = await self.get_by_id(model.id)
+        role_registry.refresh(model)
+
+        return model
 
     async def update_role(self, role_id: int, data: RoleUpdate) -> Role:
         """Обновить роль"""
@@ -135,8 +140,12 @@ class RbacService:
                 model.permissions.append(perm)
 
         await self.session.commit()
+        await invalidate_principals()
 
-        return await self.get_by_id(model.id)
+        model = await self.get_by_id(model.id)
+        role_registry.refresh(model)
+
+        return model
 
     async def delete_role(self, role_id: int) -> None:
         """Удаляем роль"""
@@ -156,6 +165,7 @@ class RbacService:
 
         await self.session.delete(model)
         await self.session.commit()
+        await invalidate_principals()
 
     async def get_all_permissions(self) -> Sequence[PermissionsDetailResponse]:
 
@@ -184,6 +194,8 @@ class RbacService:
 
         await self.session.commit()
         await self.session.refresh(model)
+        # алиас права входит в закешированные наборы прав ролей
+        await invalidate_principals()
 
         return model
 
@@ -203,6 +215,7 @@ class RbacService:
                         role.permissions.append(perm)
 
                 await self.session.commit()
+                await invalidate_principals()
 
     async def insert_or_update_permission(self) -> None:
         # FastAPICache.clear(namespace=config.cache.namespace.permissions)
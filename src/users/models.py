@@ -25,9 +25,7 @@ class User(Base):
 
     def has_permission(self, permission_alias: str) -> bool:
         """Проверка прав: если superadmin или есть нужный алиас в правах роли"""
-        if self.role.is_superadmin:
-            return True
-        return any(p.alias == permission_alias for p in self.role.permissions)
+        return self.role.compiled.allows(permission_alias)
 
     @property
     def is_deleted(self) -> bool:
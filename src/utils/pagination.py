@@ -1,11 +1,22 @@
 """Утилиты для работы с пагинацией"""
 
-from typing import Generic, Tuple, TypeVar
+import base64
+import binascii
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Generic, TypeVar
 
+import orjson
+from fastapi import HTTPException, status
 from pydantic import BaseModel, ConfigDict, Field
-from sqlalchemy import func
+from sqlalchemy import func, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
 from sqlalchemy.sql import Select
+from sqlalchemy.sql.elements import Label
+
+from src.config import config
+from src.core.cache import RedisCache, cache_key, hash_key, is_cache_enabled
 
 T = TypeVar("T")  # Generic тип для моделей
 
@@ -14,11 +25,13 @@ class PaginationMeta(BaseModel):
     """Метаданные пагинации"""
 
     total: int = Field(description="Всего записей в БД")
+    total_is_exact: bool = Field(True, description="False - total является оценкой планировщика БД")
     count: int = Field(description="Количество записей в текущем ответе")
     per_page: int = Field(description="Записей на странице")
     current_page: int = Field(description="Текущая страница")
     total_pages: int = Field(description="Всего страниц")
     skip: int = Field(description="Количество пропущенных записей")
+    next_cursor: str | None = Field(None, description="Курсор следующей страницы (None - страниц больше нет)")
 
 
 class PaginatedResponse(BaseModel, Generic[T]):
@@ -30,6 +43,91 @@ class PaginatedResponse(BaseModel, Generic[T]):
     model_config = ConfigDict(from_attributes=True)
 
 
+class CountStrategy(str, Enum):
+    """Способ подсчёта общего количества записей (total)"""
+
+    EXACT = "exact"  # SELECT count(*) на каждый запрос
+    CACHED = "cached"  # count(*) кешируется в Redis по хешу запроса, сбрасывается при изменениях
+    # оценка планировщика (EXPLAIN), точный count только для небольших выборок. Оценка берётся
+    # из статистики таблицы и точна для списков без фильтров (отличается на долю строк,
+    # изменённых после последнего ANALYZE); списки с фильтрами считаются точно (схемы фильтров)
+    ESTIMATED = "estimated"
+
+
+@dataclass
+class Page(Generic[T]):
+    """Результат пагинированного запроса"""
+
+    items: list[T]
+    total: int
+    next_cursor: str | None = None
+    total_is_exact: bool = True
+
+
+class InvalidCursorError(HTTPException):
+    def __init__(self, detail: str = "Invalid pagination cursor"):
+        super().__init__(status_code=status.HTTP_400_BAD_REQUEST, detail=detail)
+
+
+class Keyset:
+    """
+    Ключ keyset-пагинации (seek method).
+
+    Вместо OFFSET следующая страница выбирается условием
+    (col_1, ..., id) > (значения последней записи), поэтому стоимость
+    запроса не зависит от глубины страницы. Последней колонкой
+    должен идти уникальный столбец (id), чтобы порядок был строгим.
+    """
+
+    def __init__(self, *columns: InstrumentedAttribute | Label, descending: bool = False):
+        """
+        Args:
+            columns: Колонки сортировки, последней - уникальная колонка модели (id).
+                Вычисляемое значение передаётся как label с именем атрибута объекта (query_expression)
+            descending: Сортировка по убыванию
+        """
+        self.columns = columns
+        self.descending = descending
+        # Имя ключа зашивается в курсор, чтобы курсор от одной сортировки нельзя было применить к другой
+        direction = "desc" if descending else "asc"
+        self.name = f"{columns[-1].class_.__tablename__}:{','.join(c.key for c in columns)}:{direction}"
+
+    def order_by(self) -> list:
+        return [c.desc() if self.descending else c.asc() for c in self.columns]
+
+    def apply(self, stmt: Select, cursor: str | None = None) -> Select:
+        """Добавить сортировку и (если передан курсор) условие продолжения"""
+        stmt = stmt.order_by(*self.order_by())
+
+        if cursor is not None:
+            values = self.decode(cursor)
+            row, last = tuple_(*self.columns), tuple_(*values)
+            stmt = stmt.where(row < last if self.descending else row > last)
+
+        return stmt
+
+    def encode(self, item: Any) -> str:
+        """Построить курсор по последней записи страницы"""
+        payload = {"k": self.name, "v": [getattr(item, c.key) for c in self.columns]}
+        return base64.urlsafe_b64encode(orjson.dumps(payload)).decode().rstrip("=")
+
+    def decode(self, cursor: str) -> list:
+        try:
+            payload = orjson.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        except (binascii.Error, ValueError):
+            raise InvalidCursorError()
+
+        if (
+            not isinstance(payload, dict)
+            or payload.get("k") != self.name
+            or not isinstance(payload.get("v"), list)
+            or len(payload["v"]) != len(self.columns)
+        ):
+            raise InvalidCursorError(detail="Cursor does not match the requested sorting")
+
+        return payload["v"]
+
+
 class PaginationParams:
     """Параметры пагинации"""
 
@@ -54,35 +152,131 @@ class PaginationHelper:
             session: AsyncSession,
             stmt: Select,
             skip: int = 0,
-            limit: int = 10
-    ) -> Tuple[list, int]:
+            limit: int = 10,
+            keyset: Keyset | None = None,
+            cursor: str | None = None,
+            count_strategy: CountStrategy = CountStrategy.EXACT,
+            cache_namespace: str | None = None,
+            rows: bool = False,
+    ) -> Page:
         """
         Выполнить пагинированный запрос
 
         Args:
             session: SQLAlchemy сессия
             stmt: SQL выражение select
-            skip: Количество пропускаемых записей
+            skip: Количество пропускаемых записей (игнорируется, если передан cursor)
             limit: Максимальное количество записей
+            keyset: Ключ сортировки, если передан - в ответе будет курсор следующей страницы
+            cursor: Курсор из предыдущего ответа (keyset-пагинация вместо OFFSET)
+            count_strategy: Способ подсчёта total
+            cache_namespace: Пространство имён кеша для CountStrategy.CACHED (сбрасывается при изменениях)
+            rows: Вернуть строки (Row) вместо ORM-объектов - для запросов отдельных колонок
+
+        Returns:
+            Объект Page (список записей, всего записей в БД, курсор следующей страницы)
+        """
+        total, total_is_exact = await PaginationHelper.count(session, stmt, count_strategy, cache_namespace)
+
+        if keyset is None:
+            # ✨ Применяем пагинацию к исходному запросу (с сортировкой)
+            paginated_stmt = stmt.offset(skip).limit(limit)
+
+            results = await PaginationHelper._fetch(session, paginated_stmt, rows)
+
+            return Page(items=results, total=total, total_is_exact=total_is_exact)
+
+        # ✨ Keyset: берём на одну запись больше, чтобы понять, есть ли следующая страница
+        paginated_stmt = keyset.apply(stmt, cursor)
+        if cursor is None:
+            paginated_stmt = paginated_stmt.offset(skip)
+        paginated_stmt = paginated_stmt.limit(limit + 1)
+
+        results = await PaginationHelper._fetch(session, paginated_stmt, rows)
+
+        next_cursor = None
+        if len(results) > limit:
+            results = results[:limit]
+            next_cursor = keyset.encode(results[-1])
+
+        return Page(items=results, total=total, next_cursor=next_cursor, total_is_exact=total_is_exact)
+
+    @staticmethod
+    async def _fetch(session: AsyncSession, stmt: Select, rows: bool) -> list:
+        result = await session.execute(stmt)
+        return list(result.all() if rows else result.scalars().all())
+
+    @staticmethod
+    async def count(
+            session: AsyncSession,
+            stmt: Select,
+            strategy: CountStrategy = CountStrategy.EXACT,
+            cache_namespace: str | None = None,
+    ) -> tuple[int, bool]:
+        """
+        Посчитать общее количество записей выборки
 
         Returns:
-            Кортеж (список записей, всего записей в БД)
+            Кортеж (количество, является ли количество точным)
         """
         # ✨ Создаём отдельный запрос для подсчёта БЕЗ ORDER BY
-        # Используем order_by(None) чтобы очистить сортировку
+        # Используем order_by(None) чтобы очистить сортировку,
+        # maintain_column_froms - чтобы FROM не потерялся, если в запросе нет WHERE
+        stmt = stmt.order_by(None)
+        count_stmt = stmt.with_only_columns(func.count(), maintain_column_froms=True)
+
+        if strategy == CountStrategy.ESTIMATED:
+            estimated = await PaginationHelper._estimate_rows(session, stmt)
+            if estimated >= config.pagination.count_estimate_threshold:
+                return estimated, False
+
+        if strategy == CountStrategy.CACHED and cache_namespace and is_cache_enabled():
+            return await PaginationHelper._cached_count(session, count_stmt, cache_namespace), True
 
-        count_stmt = stmt.order_by(None).with_only_columns(func.count())
         total: int = await session.scalar(count_stmt) or 0
+        return total, True
 
-        # ✨ Применяем пагинацию к исходному запросу (с сортировкой)
-        paginated_stmt = stmt.offset(skip).limit(limit)
+    @staticmethod
+    async def _cached_count(session: AsyncSession, count_stmt: Select, namespace: str) -> int:
+        """count(*) через кеш: ключ - хеш SQL и параметров, версия пространства имён сбрасывает кеш при записи"""
+        cache = RedisCache()
+
+        version = await cache.version(namespace)
+        if version is None:
+            # Redis недоступен - считаем напрямую
+            return await session.scalar(count_stmt) or 0
 
-        results = list((await session.scalars(paginated_stmt)).all())
+        compiled = count_stmt.compile()
+        key = cache_key("count", namespace, version, hash_key(compiled.string, compiled.params))
 
-        return results, total
+        total = await cache.get(key)
+        if total is None:
+            total = await session.scalar(count_stmt) or 0
+            await cache.set(key, total, ttl=config.pagination.count_cache_ttl)
+
+        return total
 
     @staticmethod
-    def build_pagination_meta(total: int, skip: int, limit: int) -> PaginationMeta:
+    async def _estimate_rows(session: AsyncSession, stmt: Select) -> int:
+        """Оценка количества строк выборки по плану запроса (без выполнения самого запроса)"""
+        connection = await session.connection()
+        sql = stmt.compile(dialect=connection.dialect, compile_kwargs={"literal_binds": True})
+
+        plan = (await connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {sql}")).scalar()
+        if isinstance(plan, (str, bytes)):
+            plan = orjson.loads(plan)
+
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+    @staticmethod
+    def build_pagination_meta(
+            total: int,
+            skip: int,
+            limit: int,
+            count: int | None = None,
+            next_cursor: str | None = None,
+            total_is_exact: bool = True,
+    ) -> PaginationMeta:
         """
         Построить метаданные пагинации
 
@@ -90,6 +284,9 @@ class PaginationHelper:
             total: Всего записей
             skip: Количество пропущенных записей
             limit: Записей на странице
+            count: Количество записей в ответе (если известно)
+            next_cursor: Курсор следующей страницы
+            total_is_exact: Является ли total точным значением
 
         Returns:
             Объект PaginationMeta
@@ -99,15 +296,23 @@ class PaginationHelper:
 
         return PaginationMeta(
             total=total,
-            count=min(limit, total - skip),  # Реальное количество в ответе
+            total_is_exact=total_is_exact,
+            count=min(limit, total - skip) if count is None else count,  # Реальное количество в ответе
             per_page=limit,
             current_page=current_page,
             total_pages=total_pages,
             skip=skip,
+            next_cursor=next_cursor,
         )
 
     @staticmethod
-    def build_paginated_response(data: list[T], total: int, skip: int, limit: int) -> PaginatedResponse[T]:
+    def build_paginated_response(
+            data: list[T],
+            total: int,
+            skip: int,
+            limit: int,
+            next_cursor: str | None = None,
+    ) -> PaginatedResponse[T]:
         """
         Построить пагинированный ответ
 
@@ -116,9 +321,33 @@ class PaginationHelper:
             total: Всего записей
             skip: Количество пропущенных записей
             limit: Записей на странице
+            next_cursor: Курсор следующей страницы
 
         Returns:
             Объект PaginatedResponse
         """
-        meta = PaginationHelper.build_pagination_meta(total, skip, limit)
+        meta = PaginationHelper.build_pagination_meta(total, skip, limit, count=len(data), next_cursor=next_cursor)
         return PaginatedResponse(data=data, meta=meta)
+
+    @staticmethod
+    def build_page_response(page: Page[T], skip: int, limit: int) -> PaginatedResponse[T]:
+        """
+        Построить пагинированный ответ по результату paginate()
+
+        Args:
+            page: Страница
+            skip: Количество пропущенных записей
+            limit: Записей на странице
+
+        Returns:
+            Объект PaginatedResponse
+        """
+        meta = PaginationHelper.build_pagination_meta(
+            page.total,
+            skip,
+            limit,
+            count=len(page.items),
+            next_cursor=page.next_cursor,
+            total_is_exact=page.total_is_exact,
+        )
+        return PaginatedResponse(data=page.items, meta=meta)
@@ -120,4 +120,5 @@ pytest_plugins = [
     "tests.fixtures.user",
     "tests.fixtures.role",
     "tests.fixtures.permission",
+    "tests.fixtures.redis",
 ]
\ No newline at end of file
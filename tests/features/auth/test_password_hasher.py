@@ -0,0 +1,56 @@
+import asyncio
+
+import pytest
+from fastapi import status
+from sqlalchemy import select
+
+from src.auth.exceptions import PasswordHasherBusyError
+from src.auth.hasher import PasswordHasher, password_hasher
+from src.users.models import User
+
+
+class TestPasswordHasher:
+    """Тесты хеширования паролей в пуле потоков"""
+
+    @pytest.mark.asyncio
+    async def test_hash_and_verify(self)->None:
+        hasher = PasswordHasher(rounds=4, workers=2)
+
+        hashed = await hasher.hash("secret")
+
+        assert await hasher.verify("secret", hashed) is True
+        assert await hasher.verify("wrong", hashed) is False
+        assert hasher.pending == 0
+
+    @pytest.mark.asyncio
+    async def test_needs_rehash(self)->None:
+        hasher = PasswordHasher(rounds=4)
+
+        assert hasher.needs_rehash(await hasher.hash("secret")) is False
+        assert hasher.needs_rehash(await PasswordHasher(rounds=5).hash("secret")) is True
+        assert hasher.needs_rehash(b"not a bcrypt hash") is True
+
+    @pytest.mark.asyncio
+    async def test_busy(self)->None:
+        """Сверх лимита потоков и очереди - 503, а не ожидание"""
+        hasher = PasswordHasher(rounds=4, workers=1, max_pending=1)
+
+        results = await asyncio.gather(*(hasher.hash("secret") for _ in range(3)), return_exceptions=True)
+
+        assert sum(isinstance(result, bytes) for result in results) == 2
+        assert isinstance(results[2], PasswordHasherBusyError)
+        assert results[2].status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+
+    @pytest.mark.asyncio
+    async def test_rehash_on_login(self, client, db_session, create_user, monkeypatch)->None:
+        """После изменения стоимости bcrypt пароль перехешируется при входе"""
+        user = await create_user(email="test@gmail.com", password="password")
+        monkeypatch.setattr(password_hasher, "rounds", 4)
+        assert password_hasher.needs_rehash(user.password)
+
+        response = await client.post("/auth/login", json={"email": "test@gmail.com", "password": "password"})
+        assert response.status_code == status.HTTP_200_OK
+
+        hashed = await db_session.scalar(select(User.password).where(User.id == user.id))
+        assert not password_hasher.needs_rehash(hashed)
+        assert await password_hasher.verify("password", hashed)
@@ -0,0 +1,120 @@
+import pytest
+from datetime import datetime
+from fastapi import status
+
+import src.auth.service as auth_service_module
+from src.auth import utils as auth_utils
+from src.auth.principal import PERMISSIONS_CLAIM, Principal, invalidate_principals, principal_cache
+from src.auth.service import AuthService
+from src.core.cache import RedisCache
+from src.rbac.permissions import Permissions, mask_to_permissions, permissions_to_mask
+from tests.fixtures.user import _load_user_with_role
+
+
+def use_version(monkeypatch, version: int | None) -> None:
+    """Текущая версия principals (вместо Redis)"""
+    async def current_version() -> int | None:
+        return version
+
+    monkeypatch.setattr(auth_service_module, "current_version", current_version)
+
+
+class TestPermissionClaims:
+    """Тесты прав роли в access-токене"""
+
+    def test_mask(self)->None:
+        """Маска прав обратима, неизвестные алиасы пропускаются"""
+        aliases = {Permissions.BOOK_LIST.value, Permissions.MEDIA_DELETE.value}
+
+        mask = permissions_to_mask([*aliases, "unknown.alias"])
+
+        assert mask_to_permissions(mask) == aliases
+        assert permissions_to_mask([]) == 0
+
+    @pytest.mark.asyncio
+    async def test_principal_from_claims(self, db_session, create_user, monkeypatch)->None:
+        """Права берутся из токена без обращения к БД"""
+        user = await create_user(permissions=[Permissions.BOOK_LIST.value])
+        user = await _load_user_with_role(db_session, user.id)
+
+        service = AuthService(db_session)
+        token = service._create_access_token(user, version=3)
+        assert PERMISSIONS_CLAIM in auth_utils.decode_jwt(token)
+
+        async def find_by_id(*args, **kwargs):
+            raise AssertionError("DB should not be used")
+
+        use_version(monkeypatch, 3)
+        monkeypatch.setattr(service.user_service, "find_by_id", find_by_id)
+
+        principal = await service.current_principal(token)
+
+        assert principal == Principal.from_user(user)
+
+    @pytest.mark.asyncio
+    async def test_stale_claims(self, client, db_session, create_user, monkeypatch)->None:
+        """После изменения ролей (новая версия) права проверяются по БД"""
+        user = await create_user(permissions=[Permissions.BOOK_LIST.value])
+        user = await _load_user_with_role(db_session, user.id)
+        header = {"Authorization": f"Bearer {AuthService(db_session)._create_access_token(user, version=3)}"}
+
+        use_version(monkeypatch, 3)
+        response = await client.get("/books", headers=header)
+        assert response.status_code == status.HTTP_200_OK
+
+        # право отозвано у роли, версия увеличена
+        user.role.permissions.clear()
+        await db_session.commit()
+
+        response = await client.get("/books", headers=header)
+        assert response.status_code == status.HTTP_200_OK
+
+        use_version(monkeypatch, 4)
+        response = await client.get("/books", headers=header)
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    @pytest.mark.asyncio
+    async def test_claims_without_version(self, client, db_session, create_user, monkeypatch)->None:
+        """Без версии (Redis недоступен) токен проверяется обычным путём"""
+        user = await create_user(permissions=[])
+        user = await _load_user_with_role(db_session, user.id)
+        token = AuthService(db_session)._create_access_token(user, version=3)
+
+        # маска подменена бы в токене - но без версии claims не используются
+        use_version(monkeypatch, None)
+        response = await client.get("/books", headers={"Authorization": f"Bearer {token}"})
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("flags", [{"is_active": False}, {"deleted_at": datetime.now()}])
+    async def test_claims_after_user_disabled(
+            self,
+            client,
+            db_session,
+            create_user,
+            cache_enabled,
+            monkeypatch,
+            flags,
+    ) -> None:
+        """Флаги пользователя по claims не перепроверяются, пока не вызван invalidate_principals()"""
+        async def current_version() -> int | None:
+            return await principal_cache.version(RedisCache())
+
+        monkeypatch.setattr(auth_service_module, "current_version", current_version)
+
+        user = await create_user(permissions=[Permissions.BOOK_LIST.value])
+        user = await _load_user_with_role(db_session, user.id)
+        token = AuthService(db_session)._create_access_token(user, version=await current_version())
+        header = {"Authorization": f"Bearer {token}"}
+
+        for field, value in flags.items():
+            setattr(user, field, value)
+        await db_session.commit()
+
+        response = await client.get("/books", headers=header)
+        assert response.status_code == status.HTTP_200_OK
+
+        await invalidate_principals()
+
+        response = await client.get("/books", headers=header)
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
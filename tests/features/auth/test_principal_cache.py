@@ -0,0 +1,110 @@
+import pytest
+
+from src.auth.principal import Principal, PrincipalCache
+from src.core.cache import RedisCache
+from src.rbac.permissions import DefaultRole, Permissions
+from tests.fixtures.user import _load_user_with_role
+
+
+def make_principal(user_id: int = 1, permissions: set[str] = frozenset()) -> Principal:
+    return Principal(
+        id=user_id,
+        role_id=1,
+        role_alias=DefaultRole.USER.value,
+        is_superadmin=False,
+        is_active=True,
+        is_deleted=False,
+        permissions=frozenset(permissions),
+    )
+
+
+class Loader:
+    """Загрузка Principal с подсчётом обращений (вместо БД)"""
+
+    def __init__(self, principal: Principal | None):
+        self.principal = principal
+        self.calls = 0
+
+    async def __call__(self) -> Principal | None:
+        self.calls += 1
+        return self.principal
+
+
+class TestPrincipalCache:
+    """Тесты кеша данных авторизации"""
+
+    @pytest.mark.asyncio
+    async def test_from_user(self, create_user, db_session)->None:
+        """Principal содержит права роли пользователя"""
+        user = await create_user(permissions=[Permissions.BOOK_LIST.value])
+        user = await _load_user_with_role(db_session, user.id)
+
+        principal = Principal.from_user(user)
+
+        assert principal.id == user.id
+        assert principal.has_permission(Permissions.BOOK_LIST.value)
+        assert not principal.has_permission(Permissions.BOOK_DELETE.value)
+        assert Principal.from_dict(principal.to_dict()) == principal
+
+    @pytest.mark.asyncio
+    async def test_memory_hit(self)->None:
+        """Повторный запрос в пределах ttl не обращается к БД"""
+        cache = PrincipalCache(ttl=60, max_size=10)
+        loader = Loader(make_principal())
+
+        assert await cache.get(1, loader) == loader.principal
+        assert await cache.get(1, loader) == loader.principal
+        assert loader.calls == 1
+
+    @pytest.mark.asyncio
+    async def test_expired(self)->None:
+        """После ttl данные загружаются заново"""
+        cache = PrincipalCache(ttl=0, max_size=10)
+        loader = Loader(make_principal())
+
+        await cache.get(1, loader)
+        await cache.get(1, loader)
+        assert loader.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_max_size(self)->None:
+        """Давно не запрашиваемые пользователи вытесняются"""
+        cache = PrincipalCache(ttl=60, max_size=2)
+        loaders = {user_id: Loader(make_principal(user_id)) for user_id in (1, 2, 3)}
+
+        for user_id in (1, 2, 1, 3):
+            await cache.get(user_id, loaders[user_id])
+        # 1 запрашивался недавно и остался, 2 - вытеснен
+        await cache.get(1, loaders[1])
+        await cache.get(2, loaders[2])
+
+        assert loaders[1].calls == 1
+        assert loaders[2].calls == 2
+
+    @pytest.mark.asyncio
+    async def test_redis_and_invalidate(self, fake_redis)->None:
+        """Второй процесс берёт данные из Redis, сброс действует на оба уровня"""
+        redis = RedisCache(fake_redis)
+        loader = Loader(make_principal(permissions={Permissions.BOOK_LIST.value}))
+
+        first, second = PrincipalCache(ttl=60, max_size=10), PrincipalCache(ttl=60, max_size=10)
+
+        await first.get(1, loader, redis)
+        assert await second.get(1, loader, redis) == loader.principal
+        assert loader.calls == 1
+
+        loader.principal = make_principal()
+        await first.invalidate_all(redis)
+
+        assert await first.get(1, loader, redis) == loader.principal
+        assert loader.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_missing_user(self)->None:
+        """Отсутствующий пользователь тоже кешируется (None)"""
+        cache = PrincipalCache(ttl=60, max_size=10)
+        loader = Loader(None)
+
+        assert await cache.get(1, loader) is None
+        assert await cache.get(1, loader) is None
+        assert loader.calls == 1
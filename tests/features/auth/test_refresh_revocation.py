@@ -0,0 +1,216 @@
+import time
+from types import SimpleNamespace
+
+import pytest
+from fastapi import status
+
+import src.auth.revocation as revocation_module
+import src.auth.service as auth_service_module
+from src.auth import utils as auth_utils
+from src.auth.revocation import FAMILY_FIELD, JTI_FIELD, RevocationStore
+from src.auth.utils import REFRESH_TOKEN_TYPE, TOKEN_TYPE_FIELD
+from src.core.bloom import BloomFilter
+from tests.fixtures.redis import InMemoryRedis
+
+
+def refresh_payload(user_id: int = 1) -> tuple[str, dict]:
+    token = auth_utils.create_refresh_token({"sub": str(user_id)})
+    return token, auth_utils.decode_jwt(token)
+
+
+@pytest.fixture
+def revocation(monkeypatch, fake_redis) -> RevocationStore:
+    """Отзыв токенов включён, Redis - в памяти"""
+    store = RevocationStore(fake_redis)
+    monkeypatch.setattr(auth_service_module, "is_revocation_enabled", lambda: True)
+    monkeypatch.setattr(auth_service_module, "revocation_store", store)
+    return store
+
+
+async def login(client, create_user) -> dict:
+    await create_user(email="test@gmail.com", password="password")
+    response = await client.post("/auth/login", json={"email": "test@gmail.com", "password": "password"})
+    assert response.status_code == status.HTTP_200_OK
+    return response.json()
+
+
+async def refresh(client, refresh_token: str):
+    return await client.post("/auth/refresh-tokens", headers={"Authorization": f"Bearer {refresh_token}"})
+
+
+class TestRefreshRevocation:
+    """Тесты отзыва refresh-токенов"""
+
+    def test_bloom_filter(self)->None:
+        bloom = BloomFilter(capacity=1000, error_rate=0.01)
+        for i in range(1000):
+            bloom.add(f"key:{i}")
+
+        assert all(f"key:{i}" in bloom for i in range(1000))
+        assert sum(f"other:{i}" in bloom for i in range(1000)) < 50
+
+    def test_refresh_token_ids(self)->None:
+        """Каждый refresh-токен - свой jti, семейство передаётся"""
+        _, first = refresh_payload()
+        second = auth_utils.decode_jwt(auth_utils.create_refresh_token({"sub": "1"}, family=first[FAMILY_FIELD]))
+
+        assert first[JTI_FIELD] != second[JTI_FIELD]
+        assert first[FAMILY_FIELD] == second[FAMILY_FIELD]
+
+    @pytest.mark.asyncio
+    async def test_not_revoked_without_redis(self, fake_redis, monkeypatch)->None:
+        """Токена нет в фильтре - Redis не запрашивается"""
+        store = RevocationStore(fake_redis)
+
+        async def mget(*keys):
+            raise AssertionError("Redis should not be used")
+
+        monkeypatch.setattr(fake_redis, "mget", mget)
+        token, payload = refresh_payload()
+
+        assert await store.is_revoked(token, payload) is False
+
+    @pytest.mark.asyncio
+    async def test_consume(self, fake_redis)->None:
+        """Токен можно обменять один раз"""
+        store = RevocationStore(fake_redis)
+        token, payload = refresh_payload()
+
+        assert await store.consume(token, payload) is True
+        assert await store.consume(token, payload) is False
+
+    @pytest.mark.asyncio
+    async def test_revoke_across_workers(self, fake_redis)->None:
+        """Отзыв виден другим воркерам (сообщение pub/sub, пересборка фильтра)"""
+        store, other_worker = RevocationStore(fake_redis), RevocationStore(fake_redis)
+        token, payload = refresh_payload()
+
+        await store.revoke_family(payload[FAMILY_FIELD])
+
+        assert await store.is_revoked(token, payload) is True
+        assert fake_redis.published == [(store.channel, store.family_key(payload[FAMILY_FIELD]))]
+
+        assert await other_worker.is_revoked(token, payload) is False
+        await other_worker.rebuild()
+        assert await other_worker.is_revoked(token, payload) is True
+
+    @pytest.mark.asyncio
+    async def test_revoke_user(self, fake_redis)->None:
+        """Отзываются токены пользователя, выданные до отзыва"""
+        store = RevocationStore(fake_redis)
+        token, payload = refresh_payload(user_id=7)
+
+        await store.revoke_user(7)
+
+        assert await store.is_revoked(token, {**payload, "iat": int(time.time()) - 1}) is True
+        # iat - целые секунды: токен той же секунды мог быть выдан уже после отзыва
+        assert await store.is_revoked(token, {**payload, "iat": int(time.time())}) is False
+        assert await store.is_revoked(token, {**payload, "iat": int(time.time()) + 1}) is False
+        assert await store.is_revoked(*refresh_payload(user_id=8)) is False
+
+    @pytest.mark.asyncio
+    async def test_refresh_rotation(self, client, create_user, revocation)->None:
+        """Повторное использование refresh-токена отзывает всё семейство"""
+        tokens = await login(client, create_user)
+
+        response = await refresh(client, tokens["refresh_token"])
+        assert response.status_code == status.HTTP_200_OK
+        rotated = response.json()["refresh_token"]
+
+        response = await refresh(client, tokens["refresh_token"])
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+        response = await refresh(client, rotated)
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    @pytest.mark.asyncio
+    async def test_reuse_revokes_newer_tokens(self, client, create_user, fake_redis, revocation)->None:
+        """Семейство остаётся отозванным и после истечения повторно предъявленного токена"""
+        user = await create_user()
+        # старый токен семейства, истекает через минуту
+        old_token = auth_utils.encode_jwt(
+            {"sub": str(user.id), TOKEN_TYPE_FIELD: REFRESH_TOKEN_TYPE, JTI_FIELD: "old", FAMILY_FIELD: "family"},
+            expired=1,
+        )
+
+        response = await refresh(client, old_token)
+        assert response.status_code == status.HTTP_200_OK
+        newest = response.json()["refresh_token"]
+
+        response = await refresh(client, old_token)
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+        # старый токен истёк (по часам Redis), новый ещё действует
+        now = time.time()
+        fake_redis.clock = lambda: now + 120
+
+        response = await refresh(client, newest)
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    @pytest.mark.asyncio
+    async def test_logout(self, client, create_user, revocation)->None:
+        tokens = await login(client, create_user)
+        header = {"Authorization": f"Bearer {tokens['refresh_token']}"}
+
+        response = await client.post("/auth/logout", headers=header)
+        assert response.status_code == status.HTTP_200_OK
+
+        response = await refresh(client, tokens["refresh_token"])
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    @pytest.mark.asyncio
+    async def test_logout_all_devices(self, client, create_user, revocation, monkeypatch)->None:
+        tokens = await login(client, create_user)
+        response = await client.post("/auth/login", json={"email": "test@gmail.com", "password": "password"})
+        other_device = response.json()["refresh_token"]
+
+        # выход через секунду после входа (токены той же секунды не отзываются)
+        later = time.time() + 1
+        monkeypatch.setattr(revocation_module, "time", SimpleNamespace(time=lambda: later))
+
+        response = await client.post(
+            "/auth/logout",
+            headers={"Authorization": f"Bearer {tokens['refresh_token']}"},
+            params={"all_devices": True},
+        )
+        assert response.status_code == status.HTTP_200_OK
+
+        response = await refresh(client, other_device)
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    @pytest.mark.asyncio
+    async def test_login_right_after_revoke_user(self, client, create_user, revocation, monkeypatch)->None:
+        """Токен, выданный в ту же секунду, что и отзыв всех токенов (вход сразу после сброса пароля), действует"""
+        tokens = await login(client, create_user)
+        payload = auth_utils.decode_jwt(tokens["refresh_token"])
+        # отзыв - в ту же секунду, что и выдача токена, но позже по дробной части
+        monkeypatch.setattr(revocation_module, "time", SimpleNamespace(time=lambda: payload["iat"] + 0.5))
+        await revocation.revoke_user(int(payload["sub"]))
+
+        response = await refresh(client, tokens["refresh_token"])
+        assert response.status_code == status.HTTP_200_OK
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("all_devices", [False, True])
+    async def test_logout_without_redis(self, client, create_user, monkeypatch, all_devices)->None:
+        """Недоступный Redis не ломает выход"""
+        store = RevocationStore(InMemoryRedis(fail=True))
+        monkeypatch.setattr(auth_service_module, "is_revocation_enabled", lambda: True)
+        monkeypatch.setattr(auth_service_module, "revocation_store", store)
+
+        tokens = await login(client, create_user)
+        response = await client.post(
+            "/auth/logout",
+            headers={"Authorization": f"Bearer {tokens['refresh_token']}"},
+            params={"all_devices": all_devices},
+        )
+        assert response.status_code == status.HTTP_200_OK
+
+    @pytest.mark.asyncio
+    async def test_refresh_without_revocation(self, client, create_user)->None:
+        """Без Redis (отзыв выключен) токены обновляются как раньше"""
+        tokens = await login(client, create_user)
+
+        response = await refresh(client, tokens["refresh_token"])
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["token_type"] == "Bearer"
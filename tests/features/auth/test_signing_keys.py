@@ -0,0 +1,57 @@
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519
+from fastapi import status
+
+from src.auth import utils as auth_utils
+from src.auth.keys import KeyManager, SigningKey, get_key_manager
+
+
+def make_key(private_key, public_only: bool = False) -> SigningKey:
+    return SigningKey.create(private_key.public_key(), None if public_only else private_key)
+
+
+class TestSigningKeys:
+    """Тесты ключей подписи JWT"""
+
+    def test_token_has_kid(self)->None:
+        """Токен подписан текущим ключом, kid - в заголовке"""
+        token = auth_utils.create_access_token({"sub": "1"})
+
+        assert jwt.get_unverified_header(token)["kid"] == get_key_manager().current.kid
+        assert auth_utils.decode_jwt(token)["sub"] == "1"
+
+    def test_token_without_kid(self)->None:
+        """Токены, выданные до ротации (без kid), проверяются текущим ключом"""
+        manager = KeyManager([make_key(ec.generate_private_key(ec.SECP256R1()))])
+        token = jwt.encode({"sub": "1"}, manager.current.private_key, algorithm="ES256")
+
+        assert manager.verify(token) == {"sub": "1"}
+
+    def test_rotation(self)->None:
+        """После ротации токены старого ключа принимаются, неизвестного - нет"""
+        old_key = ed25519.Ed25519PrivateKey.generate()
+        old_token = KeyManager([make_key(old_key)]).sign({"sub": "1"})
+
+        manager = KeyManager([make_key(ec.generate_private_key(ec.SECP256R1())), make_key(old_key, public_only=True)])
+        assert manager.verify(old_token) == {"sub": "1"}
+        assert jwt.get_unverified_header(manager.sign({"sub": "2"}))["kid"] == manager.current.kid
+
+        stranger = KeyManager([make_key(ed25519.Ed25519PrivateKey.generate())]).sign({"sub": "1"})
+        with pytest.raises(jwt.InvalidTokenError):
+            manager.verify(stranger)
+
+    def test_current_key_must_sign(self)->None:
+        with pytest.raises(ValueError):
+            KeyManager([make_key(ed25519.Ed25519PrivateKey.generate(), public_only=True)])
+
+    @pytest.mark.asyncio
+    async def test_jwks(self, client)->None:
+        """JWKS содержит текущий ключ"""
+        response = await client.get("/auth/.well-known/jwks.json")
+        assert response.status_code == status.HTTP_200_OK
+
+        key = get_key_manager().current
+        assert response.json() == {"keys": [key.to_jwk()]}
+        assert response.json()["keys"][0]["kid"] == key.kid
+        assert jwt.PyJWK(response.json()["keys"][0]).key_id == key.kid
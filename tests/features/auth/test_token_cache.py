@@ -0,0 +1,100 @@
+import time
+
+import jwt
+import pytest
+from fastapi import status
+
+import src.auth.token_cache as token_cache_module
+from src.auth import utils as auth_utils
+from src.auth.keys import get_key_manager
+from src.auth.token_cache import VerifiedTokenCache
+
+
+@pytest.fixture
+def decode_calls(monkeypatch) -> list[str]:
+    """Проверки подписи (вызовы decode_jwt)"""
+    calls = []
+
+    def decode_jwt(token):
+        calls.append(token)
+        return auth_utils.decode_jwt(token)
+
+    monkeypatch.setattr(token_cache_module, "decode_jwt", decode_jwt)
+    return calls
+
+
+class TestVerifiedTokenCache:
+    """Тесты кеша проверенных токенов"""
+
+    def test_hit(self, decode_calls)->None:
+        """Подпись проверяется один раз на токен"""
+        cache = VerifiedTokenCache(max_size=10)
+        token = auth_utils.create_access_token({"sub": "1"})
+
+        assert cache.decode(token)["sub"] == "1"
+        assert cache.decode(token)["sub"] == "1"
+        assert len(decode_calls) == 1
+
+    def test_expired(self, decode_calls, monkeypatch)->None:
+        """После exp токен проверяется заново"""
+        cache = VerifiedTokenCache(max_size=10)
+        token = auth_utils.create_access_token({"sub": "1"})
+        cache.decode(token)
+
+        now = time.time()
+        monkeypatch.setattr(token_cache_module.time, "time", lambda: now + 3600)
+        cache.decode(token)
+
+        assert len(decode_calls) == 2
+
+    def test_max_size(self, decode_calls)->None:
+        """Давно не использованные токены вытесняются"""
+        cache = VerifiedTokenCache(max_size=2)
+        first, second, third = (auth_utils.create_access_token({"sub": str(i)}) for i in range(3))
+
+        for token in (first, second, first, third):
+            cache.decode(token)
+        assert len(cache) == 2
+
+        cache.decode(first)
+        cache.decode(second)
+        assert decode_calls == [first, second, third, second]
+
+    def test_invalid_token(self)->None:
+        """Токен с неверной подписью не кешируется"""
+        cache = VerifiedTokenCache(max_size=10)
+
+        with pytest.raises(jwt.InvalidTokenError):
+            cache.decode(auth_utils.create_access_token({"sub": "1"}) + "x")
+        assert len(cache) == 0
+
+    def test_token_without_exp(self, decode_calls)->None:
+        """Токен без exp не кешируется (и не ломает повторные запросы)"""
+        cache = VerifiedTokenCache(max_size=10)
+        token = get_key_manager().sign({"sub": "1", "type": "access"})
+
+        assert cache.decode(token)["sub"] == "1"
+        assert cache.decode(token)["sub"] == "1"
+        assert len(decode_calls) == 2
+        assert len(cache) == 0
+
+    def test_disabled(self, decode_calls)->None:
+        cache = VerifiedTokenCache(max_size=0)
+        token = auth_utils.create_access_token({"sub": "1"})
+
+        cache.decode(token)
+        cache.decode(token)
+
+        assert len(decode_calls) == 2
+        assert len(cache) == 0
+
+    @pytest.mark.asyncio
+    async def test_current_user(self, client, create_user, auth_header)->None:
+        """Повторные запросы с тем же токеном"""
+        user = await create_user()
+        header = await auth_header(user)
+
+        for _ in range(2):
+            response = await client.get("/auth/current-user", headers=header)
+            assert response.status_code == status.HTTP_200_OK
+            assert response.json()["id"] == user.id
@@ -0,0 +1,76 @@
+import pytest
+from datetime import datetime
+from fastapi import status
+
+from src.rbac.permissions import Permissions
+
+
+class TestBulkDeleteAuthors:
+    """Тесты массового удаления и восстановления авторов"""
+
+    @pytest.mark.asyncio
+    async def test_bulk_delete_by_ids(self, client, create_author, create_user, auth_header)->None:
+        """Удаление по списку id, удалённые авторы пропадают из списка"""
+        user = await create_user(permissions=[Permissions.AUTHOR_DELETE.value, Permissions.AUTHOR_LIST.value])
+        header = await auth_header(user)
+
+        tom = await create_author(name="Tom")
+        alen = await create_author(name="Alen")
+        await create_author(name="John")
+
+        response = await client.post("/authors/bulk-delete", headers=header, json={"ids": [tom.id, alen.id]})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {"affected": 2, "ids": sorted([tom.id, alen.id])}
+
+        response = await client.get("/authors", headers=header)
+        assert [author["name"] for author in response.json()["data"]] == ["John"]
+
+    @pytest.mark.asyncio
+    async def test_bulk_delete_by_filter(self, client, create_author, create_user, auth_header)->None:
+        """Удаление по поиску в имени"""
+        user = await create_user(permissions=[Permissions.AUTHOR_DELETE.value])
+        header = await auth_header(user)
+
+        tom = await create_author(name="Tom Smith")
+        await create_author(name="Alen")
+
+        response = await client.post("/authors/bulk-delete", headers=header, json={"filter": {"search": "smith"}})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {"affected": 1, "ids": [tom.id]}
+
+    @pytest.mark.asyncio
+    async def test_bulk_delete_by_wildcard_search(self, client, create_author, create_user, auth_header)->None:
+        """% в поиске - обычный символ, а не шаблон для всех авторов"""
+        user = await create_user(permissions=[Permissions.AUTHOR_DELETE.value])
+        header = await auth_header(user)
+
+        await create_author(name="Tom Smith")
+        matched = await create_author(name="Alen 100%")
+
+        response = await client.post("/authors/bulk-delete", headers=header, json={"filter": {"search": "%"}})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {"affected": 1, "ids": [matched.id]}
+
+    @pytest.mark.asyncio
+    async def test_bulk_restore(self, client, create_author, create_user, auth_header)->None:
+        """Восстановление затрагивает только удалённых авторов"""
+        user = await create_user(permissions=[Permissions.AUTHOR_RESTORE.value])
+        header = await auth_header(user)
+
+        deleted = await create_author(deleted_at=datetime.now())
+        active = await create_author()
+
+        response = await client.post(
+            "/authors/bulk-restore", headers=header, json={"ids": [deleted.id, active.id]}
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {"affected": 1, "ids": [deleted.id]}
+
+    @pytest.mark.asyncio
+    async def test_bulk_delete_forbidden(self, client, create_user, auth_header)->None:
+        """Без права на удаление - 403"""
+        user = await create_user(permissions=[Permissions.AUTHOR_LIST.value])
+        header = await auth_header(user)
+
+        response = await client.post("/authors/bulk-delete", headers=header, json={"ids": [1]})
+        assert response.status_code == status.HTTP_403_FORBIDDEN
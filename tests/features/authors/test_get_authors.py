@@ -138,6 +138,92 @@ class TestGetAuthors:
         data = response.json()
         assert len(data["data"]) == 2
 
+    @pytest.mark.asyncio
+    async def test_get_authors_with_cursor(self, client, create_author, superadmin_user, auth_header)->None:
+        """Получить всех авторов, переходя по курсору (keyset-пагинация)"""
+        header = await auth_header(superadmin_user)
+
+        author_1 = await create_author(name="Tom")
+        author_2 = await create_author(name="Alen")
+        author_3 = await create_author(name="John")
+
+        response = await client.get("/authors?limit=2&sort_order=desc", headers=header)
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert [i["id"] for i in data["data"]] == [author_1.id, author_3.id]
+
+        response = await client.get(
+            "/authors", params={"limit": 2, "sort_order": "desc", "cursor": data["meta"]["next_cursor"]}, headers=header
+        )
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert [i["id"] for i in data["data"]] == [author_2.id]
+        assert data["meta"]["next_cursor"] is None
+
+    @pytest.mark.asyncio
+    async def test_get_authors_with_books_count(
+        self,
+        client,
+        create_author,
+        create_book,
+        superadmin_user,
+        auth_header
+    ) -> None:
+        """Количество книг автора (удалённые книги не учитываются)"""
+        header = await auth_header(superadmin_user)
+
+        author_1 = await create_author(name="Tom")
+        author_2 = await create_author(name="Alen")
+        await create_book(author=author_1, is_available=True)
+        await create_book(author=author_1, is_available=False)
+        await create_book(author=author_1, deleted_at=datetime.now())
+
+        response = await client.get("/authors", headers=header)
+        assert response.status_code == status.HTTP_200_OK
+        data = {i["id"]: i for i in response.json()["data"]}
+
+        assert data[author_1.id]["books_count"] == 2
+        assert data[author_1.id]["available_books_count"] == 1
+        assert data[author_2.id]["books_count"] == 0
+        assert data[author_2.id]["available_books_count"] == 0
+
+    @pytest.mark.asyncio
+    async def test_get_authors_with_sort_by_books_count(
+        self,
+        client,
+        create_author,
+        create_book,
+        superadmin_user,
+        auth_header
+    ) -> None:
+        """Сортировка по количеству книг, с курсором"""
+        header = await auth_header(superadmin_user)
+
+        author_1 = await create_author(name="Tom")
+        author_2 = await create_author(name="Alen")
+        author_3 = await create_author(name="John")
+        for _ in range(3):
+            await create_book(author=author_2, is_available=False)
+        await create_book(author=author_3, is_available=True)
+
+        response = await client.get("/authors?sort_by=books_count&sort_order=desc&limit=2", headers=header)
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert [i["id"] for i in data["data"]] == [author_2.id, author_3.id]
+        assert data["meta"]["total"] == 3
+
+        response = await client.get(
+            "/authors",
+            params={"sort_by": "books_count", "sort_order": "desc", "limit": 2, "cursor": data["meta"]["next_cursor"]},
+            headers=header,
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert [i["id"] for i in response.json()["data"]] == [author_1.id]
+
+        response = await client.get("/authors?sort_by=available_books_count&sort_order=desc", headers=header)
+        # при равенстве - по id в том же направлении
+        assert [i["id"] for i in response.json()["data"]] == [author_3.id, author_2.id, author_1.id]
+
     @pytest.mark.asyncio
     async def test_not_perm(self, client, create_user, auth_header)->None:
         user = await create_user(permissions=[Permissions.AUTHOR_SHOW.value])
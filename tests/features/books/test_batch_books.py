@@ -0,0 +1,139 @@
+import pytest
+from datetime import datetime
+from fastapi import status
+
+from src.books.models import Book
+from src.rbac.permissions import Permissions
+
+
+class TestBatchCreateBooks:
+    """Тесты для создания пачки книг"""
+
+    @pytest.mark.asyncio
+    async def test_create_batch(self, client, db_session, create_author, create_book, create_user, auth_header)->None:
+        """Корректные элементы создаются, ошибочные возвращаются с ошибкой"""
+        user = await create_user(permissions=[Permissions.BOOK_CREATE.value])
+        header = await auth_header(user)
+
+        author = await create_author()
+        deleted_author = await create_author(deleted_at=datetime.now())
+        await create_book(title="Existing", author=author)
+
+        items = [
+            {"title": "First", "author_id": author.id, "page": 10},
+            {"title": "Existing", "author_id": author.id},
+            {"title": "Second", "author_id": deleted_author.id},
+            {"title": "Third", "author_id": 999999},
+            {"title": "Fourth", "author_id": author.id, "is_available": False},
+            {"title": "First", "author_id": author.id},
+        ]
+
+        response = await client.post("/books/batch", json={"items": items}, headers=header)
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+
+        assert data["succeeded"] == 2
+        assert data["failed"] == 4
+        assert [i["index"] for i in data["items"]] == [0, 1, 2, 3, 4, 5]
+        assert [i["status"] for i in data["items"]] == ["created", "error", "error", "error", "created", "error"]
+        assert "already exists" in data["items"][1]["error"]
+        assert "not found" in data["items"][2]["error"]
+        assert "already exists" in data["items"][5]["error"]
+
+        first = await db_session.get(Book, data["items"][0]["id"])
+        assert first.title == "First"
+        assert first.page == 10
+        assert first.author_id == author.id
+
+        fourth = await db_session.get(Book, data["items"][4]["id"])
+        assert fourth.is_available is False
+
+    @pytest.mark.asyncio
+    async def test_create_batch_too_big(self, client, create_author, superadmin_headers)->None:
+        author = await create_author()
+        items = [{"title": f"Book {i}", "author_id": author.id} for i in range(501)]
+
+        response = await client.post("/books/batch", json={"items": items}, headers=superadmin_headers)
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_CONTENT
+
+    @pytest.mark.asyncio
+    async def test_not_perm(self, client, create_user, auth_header)->None:
+        user = await create_user(permissions=[Permissions.BOOK_UPDATE.value])
+        header = await auth_header(user)
+
+        response = await client.post("/books/batch", json={"items": []}, headers=header)
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+class TestBatchUpdateBooks:
+    """Тесты для обновления пачки книг"""
+
+    @pytest.mark.asyncio
+    async def test_update_batch(self, client, db_session, create_author, create_book, create_user, auth_header)->None:
+        """Обновляются только переданные поля, ошибочные элементы пропускаются"""
+        user = await create_user(permissions=[Permissions.BOOK_UPDATE.value])
+        header = await auth_header(user)
+
+        author = await create_author()
+        other_author = await create_author()
+        book_1 = await create_book(title="One", page=1, author=author)
+        book_2 = await create_book(title="Two", page=2, author=author)
+        book_3 = await create_book(title="Three", page=3, author=author)
+        deleted = await create_book(title="Deleted", author=author, deleted_at=datetime.now())
+
+        items = [
+            {"id": book_1.id, "title": "One updated"},
+            {"id": book_2.id, "page": 20, "author_id": other_author.id, "description": None},
+            {"id": book_3.id, "title": "Two"},
+            {"id": deleted.id, "page": 5},
+            {"id": book_3.id, "author_id": 999999},
+            {"id": book_3.id, "title": None},
+            {"id": book_1.id, "page": 100},
+        ]
+
+        response = await client.patch("/books/batch", json={"items": items}, headers=header)
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+
+        assert [i["status"] for i in data["items"]] == [
+            "updated", "updated", "error", "error", "error", "error", "error"
+        ]
+        assert data["succeeded"] == 2
+        assert "already exists" in data["items"][2]["error"]
+        assert "not found" in data["items"][3]["error"]
+        assert "Author" in data["items"][4]["error"]
+        assert "title" in data["items"][5]["error"]
+        assert "duplicated" in data["items"][6]["error"]
+
+        await db_session.refresh(book_1)
+        await db_session.refresh(book_2)
+        await db_session.refresh(book_3)
+
+        assert book_1.title == "One updated"
+        assert book_1.page == 1
+        assert book_2.page == 20
+        assert book_2.author_id == other_author.id
+        assert book_2.description is None
+        assert book_2.title == "Two"
+        assert book_3.title == "Three"
+
+    @pytest.mark.asyncio
+    async def test_update_batch_swap_titles(self, client, create_book, superadmin_headers)->None:
+        """Конфликт названий внутри пачки - ничего не меняется"""
+        book_1 = await create_book(title="One")
+        book_2 = await create_book(title="Two")
+
+        items = [{"id": book_1.id, "title": "Two"}, {"id": book_2.id, "title": "One"}]
+
+        response = await client.patch("/books/batch", json={"items": items}, headers=superadmin_headers)
+        data = response.json()
+        assert response.status_code == status.HTTP_200_OK
+        assert [i["status"] for i in data["items"]] == ["error", "error"]
+
+    @pytest.mark.asyncio
+    async def test_not_perm(self, client, create_user, auth_header)->None:
+        user = await create_user(permissions=[Permissions.BOOK_CREATE.value])
+        header = await auth_header(user)
+
+        response = await client.patch("/books/batch", json={"items": []}, headers=header)
+        assert response.status_code == status.HTTP_403_FORBIDDEN
@@ -0,0 +1,144 @@
+import pytest
+from datetime import datetime
+from fastapi import status
+from sqlalchemy import select
+
+from src.books.exceptions import BulkConditionRequiredError
+from src.books.models import Book
+from src.books.service import BookService
+from src.rbac.permissions import Permissions
+
+
+class TestBulkDeleteBooks:
+    """Тесты массового удаления и восстановления книг"""
+
+    @pytest.mark.asyncio
+    async def test_bulk_delete_by_ids(self, client, db_session, create_books, create_user, auth_header)->None:
+        """Удаление по списку id: уже удалённые и чужие id не учитываются"""
+        user = await create_user(permissions=[Permissions.BOOK_DELETE.value])
+        header = await auth_header(user)
+
+        first, second, deleted = await create_books(3)
+        deleted.deleted_at = datetime.now()
+        await db_session.commit()
+
+        response = await client.post(
+            "/books/bulk-delete",
+            headers=header,
+            json={"ids": [first.id, second.id, deleted.id, 99999]},
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {"affected": 2, "ids": sorted([first.id, second.id])}
+
+        books = await db_session.scalars(select(Book).where(Book.id.in_([first.id, second.id])))
+        assert all(book.deleted_at is not None for book in books)
+
+    @pytest.mark.asyncio
+    async def test_bulk_delete_by_filter(
+        self,
+        client,
+        db_session,
+        create_author,
+        create_book,
+        create_user,
+        auth_header
+    ) -> None:
+        """Удаление по фильтру затрагивает только подходящие книги"""
+        user = await create_user(permissions=[Permissions.BOOK_DELETE.value, Permissions.BOOK_LIST.value])
+        header = await auth_header(user)
+
+        tom = await create_author(name="Tom")
+        alen = await create_author(name="Alen")
+        sold = await create_book(title="Sold out", author=tom, is_available=False)
+        await create_book(title="In stock", author=tom, is_available=True)
+        await create_book(title="Other", author=alen, is_available=False)
+
+        response = await client.post(
+            "/books/bulk-delete",
+            headers=header,
+            json={"filter": {"author_id": tom.id, "is_available": 0}},
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {"affected": 1, "ids": [sold.id]}
+
+        response = await client.get("/books", headers=header, params={"author_id": tom.id})
+        assert [book["title"] for book in response.json()["data"]] == ["In stock"]
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("search", ["%", "_", "\\"])
+    async def test_bulk_delete_by_wildcard_search(
+        self,
+        client,
+        create_book,
+        create_user,
+        auth_header,
+        search
+    ) -> None:
+        """%, _ и \\ в поиске - обычные символы, а не шаблон для всего каталога"""
+        user = await create_user(permissions=[Permissions.BOOK_DELETE.value])
+        header = await auth_header(user)
+
+        await create_book(title="Python")
+        matched = await create_book(title=f"100{search} Python")
+
+        response = await client.post("/books/bulk-delete", headers=header, json={"filter": {"search": search}})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {"affected": 1, "ids": [matched.id]}
+
+    @pytest.mark.asyncio
+    async def test_bulk_restore(self, client, create_book, create_user, auth_header)->None:
+        """Восстановление возвращает только удалённые книги"""
+        user = await create_user(permissions=[Permissions.BOOK_RESTORE.value])
+        header = await auth_header(user)
+
+        deleted = await create_book(title="Python", deleted_at=datetime.now())
+        await create_book(title="Python active")
+
+        response = await client.post("/books/bulk-restore", headers=header, json={"filter": {"search": "python"}})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {"affected": 1, "ids": [deleted.id]}
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("payload", [
+        {},
+        {"ids": [1], "filter": {"search": "a"}},
+        {"ids": []},
+        {"filter": {}},
+        # значения, которые фильтр списка книг не превращает в условие
+        {"filter": {"author_id": 0}},
+        {"filter": {"is_available": 5}},
+    ])
+    async def test_bulk_delete_invalid_selection(
+        self,
+        client,
+        db_session,
+        create_book,
+        create_user,
+        auth_header,
+        payload
+    ) -> None:
+        """Нужен либо непустой список id, либо непустой фильтр; каталог не затрагивается"""
+        user = await create_user(permissions=[Permissions.BOOK_DELETE.value])
+        header = await auth_header(user)
+        book = await create_book()
+
+        response = await client.post("/books/bulk-delete", headers=header, json=payload)
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_CONTENT
+
+        await db_session.refresh(book)
+        assert book.deleted_at is None
+
+    @pytest.mark.asyncio
+    async def test_bulk_without_conditions(self, db_session)->None:
+        """UPDATE без условий не выполняется"""
+        with pytest.raises(BulkConditionRequiredError):
+            await BookService(db_session)._bulk_set_deleted(Book, [], deleted=True)
+
+    @pytest.mark.asyncio
+    async def test_bulk_restore_forbidden(self, client, create_user, auth_header)->None:
+        """Без права на восстановление - 403"""
+        user = await create_user(permissions=[Permissions.BOOK_DELETE.value])
+        header = await auth_header(user)
+
+        response = await client.post("/books/bulk-restore", headers=header, json={"ids": [1]})
+        assert response.status_code == status.HTTP_403_FORBIDDEN
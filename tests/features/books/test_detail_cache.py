@@ -0,0 +1,120 @@
+import pytest
+from fastapi import status
+
+from src.core.cache import CACHE_REQUESTS, RedisCache
+from tests.fixtures.redis import InMemoryRedis
+
+
+def requests_count(result: str, cache: str = "test") -> float:
+    return CACHE_REQUESTS.labels(cache=cache, result=result)._value.get()
+
+
+class TestDetailCache:
+    """Тесты read-through кеша карточек"""
+
+    @pytest.mark.asyncio
+    async def test_remember_hit_and_miss(self, fake_redis)->None:
+        """Повторное чтение берётся из кеша"""
+        cache = RedisCache(fake_redis)
+        calls = []
+
+        async def load():
+            calls.append(1)
+            return {"id": 1, "title": "Book"}
+
+        hits, misses = requests_count("hit"), requests_count("miss")
+
+        assert await cache.remember("books", "test", 1, 60, load) == {"id": 1, "title": "Book"}
+        assert await cache.remember("books", "test", 1, 60, load) == {"id": 1, "title": "Book"}
+
+        assert len(calls) == 1
+        assert requests_count("miss") == misses + 1
+        assert requests_count("hit") == hits + 1
+
+    @pytest.mark.asyncio
+    async def test_remember_after_bump(self, fake_redis)->None:
+        """После сброса версии пространства имён значение загружается заново"""
+        cache = RedisCache(fake_redis)
+        titles = iter(["Old", "New"])
+
+        async def load():
+            return {"title": next(titles)}
+
+        assert await cache.remember("books", "test", 1, 60, load) == {"title": "Old"}
+        await cache.bump("books")
+        assert await cache.remember("books", "test", 1, 60, load) == {"title": "New"}
+
+    @pytest.mark.asyncio
+    async def test_remember_without_redis(self)->None:
+        """Недоступный Redis не ломает чтение"""
+        cache = RedisCache(InMemoryRedis(fail=True))
+
+        async def load():
+            return {"title": "Book"}
+
+        assert await cache.remember("books", "test", 1, 60, load) == {"title": "Book"}
+
+    @pytest.mark.asyncio
+    async def test_book_detail(self, client, db_session, create_book, superadmin_headers, cache_enabled)->None:
+        """Карточка книги из кеша до изменения книги через API"""
+        model = await create_book(title="Old")
+        hits, misses = requests_count("hit", "book"), requests_count("miss", "book")
+
+        response = await client.get(f"/books/{model.id}", headers=superadmin_headers)
+        assert response.json()["title"] == "Old"
+        assert requests_count("miss", "book") == misses + 1
+
+        # изменение в обход API кеш не сбрасывает
+        model.title = "Changed in db"
+        await db_session.commit()
+
+        response = await client.get(f"/books/{model.id}", headers=superadmin_headers)
+        assert response.json()["title"] == "Old"
+        assert requests_count("hit", "book") == hits + 1
+
+        response = await client.patch(f"/books/{model.id}", json={"title": "New"}, headers=superadmin_headers)
+        assert response.status_code == status.HTTP_200_OK
+
+        response = await client.get(f"/books/{model.id}", headers=superadmin_headers)
+        assert response.json()["title"] == "New"
+        assert requests_count("miss", "book") == misses + 2
+
+        response = await client.delete(f"/books/{model.id}", headers=superadmin_headers)
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+
+        response = await client.get(f"/books/{model.id}", headers=superadmin_headers)
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    @pytest.mark.asyncio
+    async def test_author_detail(self, client, db_session, create_author, superadmin_headers, cache_enabled)->None:
+        """Карточка автора из кеша до изменения автора через API"""
+        model = await create_author(name="Old")
+        hits, misses = requests_count("hit", "author"), requests_count("miss", "author")
+
+        response = await client.get(f"/authors/{model.id}", headers=superadmin_headers)
+        assert response.json()["name"] == "Old"
+
+        model.name = "Changed in db"
+        await db_session.commit()
+
+        response = await client.get(f"/authors/{model.id}", headers=superadmin_headers)
+        assert response.json()["name"] == "Old"
+        assert (requests_count("hit", "author"), requests_count("miss", "author")) == (hits + 1, misses + 1)
+
+        response = await client.patch(f"/authors/{model.id}", json={"name": "New"}, headers=superadmin_headers)
+        assert response.status_code == status.HTTP_200_OK
+
+        response = await client.get(f"/authors/{model.id}", headers=superadmin_headers)
+        assert response.json()["name"] == "New"
+
+        response = await client.delete(f"/authors/{model.id}", headers=superadmin_headers)
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+
+        response = await client.get(f"/authors/{model.id}", headers=superadmin_headers)
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+        response = await client.patch(f"/authors/{model.id}/restore", headers=superadmin_headers)
+        assert response.status_code == status.HTTP_200_OK
+
+        response = await client.get(f"/authors/{model.id}", headers=superadmin_headers)
+        assert response.status_code == status.HTTP_200_OK
@@ -0,0 +1,136 @@
+import io
+import tempfile
+from datetime import datetime
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+from fastapi import status
+from openpyxl import load_workbook
+
+from src.books.export import BookExporter
+
+from src.rbac.permissions import Permissions
+
+
+class TestExportBooksCsv:
+    """Тесты выгрузки книг в CSV"""
+
+    @pytest.mark.asyncio
+    async def test_export_csv(self, client, create_author, create_book, superadmin_headers)->None:
+        """Выгрузка всех книг, строки приходят в порядке id"""
+
+        author = await create_author(name="Tom")
+        model_1 = await create_book(title="Alen", author=author)
+        model_2 = await create_book(title="John; Smith", author=author)
+
+        response = await client.post("/books/export-to-csv", headers=superadmin_headers)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"].startswith("text/csv")
+        assert "books_export.csv" in response.headers["content-disposition"]
+
+        assert response.content.startswith("\ufeff".encode())
+        lines = response.content.decode("utf-8-sig").splitlines()
+
+        assert lines == [
+            "ID;Title;Author",
+            f"{model_1.id};Alen;Tom",
+            f'{model_2.id};"John; Smith";Tom',
+        ]
+
+    @pytest.mark.asyncio
+    async def test_export_csv_empty(self, client, superadmin_headers)->None:
+        """Выгрузка пустого каталога - только заголовок"""
+
+        response = await client.post("/books/export-to-csv", headers=superadmin_headers)
+        assert response.status_code == status.HTTP_200_OK
+        # строки разделяются \n, как в выгрузке до потоковой отдачи
+        assert response.content.decode("utf-8-sig") == "ID;Title;Author\n"
+
+    @pytest.mark.asyncio
+    async def test_not_perm(self, client, create_user, auth_header)->None:
+        user = await create_user(permissions=[Permissions.BOOK_LIST.value])
+        header = await auth_header(user)
+
+        response = await client.post("/books/export-to-csv", headers=header)
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+class TestExportBooksExcel:
+    """Тесты выгрузки книг в Excel"""
+
+    @pytest.mark.asyncio
+    async def test_export_excel(self, client, create_author, create_book, superadmin_headers)->None:
+        """Выгрузка всех книг в xlsx"""
+
+        author = await create_author(name="Tom")
+        model_1 = await create_book(title="Alen", description="About", author=author)
+        model_2 = await create_book(title="John", description="Text", author=author)
+
+        response = await client.post("/books/export-to-excel", headers=superadmin_headers)
+        assert response.status_code == status.HTTP_200_OK
+        assert "books_export.xlsx" in response.headers["content-disposition"]
+
+        sheet = load_workbook(io.BytesIO(response.content), read_only=True)["Books"]
+        rows = list(sheet.iter_rows(values_only=True))
+
+        assert rows == [
+            ("ID", "Название", "Описание", "Автор"),
+            (model_1.id, "Alen", "About", "Tom"),
+            (model_2.id, "John", "Text", "Tom"),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_export_excel_removes_temp_file(self, client, superadmin_headers, monkeypatch, tmp_path)->None:
+        """Временный файл удаляется после отправки"""
+
+        monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+
+        response = await client.post("/books/export-to-excel", headers=superadmin_headers)
+        assert response.status_code == status.HTTP_200_OK
+        assert list(tmp_path.iterdir()) == []
+
+
+class TestExportBooksParquet:
+    """Тесты выгрузки книг в Parquet"""
+
+    @pytest.mark.asyncio
+    async def test_export_parquet(self, client, create_author, create_book, superadmin_headers)->None:
+        """Типизированные колонки всех книг (в том числе удалённых)"""
+
+        author = await create_author(name="Tom")
+        model_1 = await create_book(title="Alen", page=100, is_available=False, author=author)
+        await create_book(title="John", author=author)
+        await create_book(title="Deleted", author=author, deleted_at=datetime.now())
+
+        response = await client.post("/books/export-to-parquet", headers=superadmin_headers)
+        assert response.status_code == status.HTTP_200_OK
+        assert "books_export.parquet" in response.headers["content-disposition"]
+
+        table = pq.read_table(io.BytesIO(response.content))
+
+        assert table.schema.field("id").type == pa.int64()
+        assert table.schema.field("created_at").type == pa.timestamp("us")
+        assert table.column("title").to_pylist() == ["Alen", "John", "Deleted"]
+        assert table.column("deleted_at").null_count == 2
+
+        first = table.slice(0, 1).to_pylist()[0]
+        assert first["id"] == model_1.id
+        assert first["page"] == 100
+        assert first["is_available"] is False
+        assert first["author_id"] == author.id
+        assert first["author_name"] == "Tom"
+
+    @pytest.mark.asyncio
+    async def test_export_parquet_row_groups(self, db_session, create_books)->None:
+        """Каждая пачка из курсора записывается отдельной row group"""
+
+        await create_books(5)
+
+        path = await BookExporter(db_session, batch_size=2).parquet()
+        try:
+            parquet_file = pq.ParquetFile(path)
+            assert parquet_file.metadata.num_rows == 5
+            assert parquet_file.num_row_groups == 3
+        finally:
+            path.unlink()
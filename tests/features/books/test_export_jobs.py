@@ -0,0 +1,190 @@
+import os
+import time
+
+import pytest
+from fastapi import status
+
+import src.books.export_jobs as export_jobs
+from src.books.export import BookExporter
+from src.books.export_jobs import ExportJobService, ExportJobStore
+from src.books.schemas import ExportFormat, ExportJob, ExportJobStatus
+from src.config import config
+from src.rbac.permissions import Permissions
+
+
+@pytest.fixture
+def published(monkeypatch, fake_redis):
+    """Задачи хранятся в Redis в памяти, публикация в очередь только запоминается"""
+    messages = []
+
+    async def publish(message, queue):
+        messages.append((queue, message))
+
+    monkeypatch.setattr(export_jobs, "get_redis", lambda: fake_redis)
+    monkeypatch.setattr(export_jobs.broker, "publish", publish)
+
+    yield messages
+
+    for path in config.export.root_path.glob("books_*"):
+        if any(message in path.name for _, message in messages):
+            path.unlink()
+
+
+class TestExportJobs:
+    """Тесты фоновой выгрузки книг"""
+
+    @pytest.mark.asyncio
+    async def test_export_job(
+        self,
+        client,
+        db_session,
+        create_author,
+        create_book,
+        superadmin_headers,
+        published
+    ) -> None:
+        """Создание задачи, выполнение обработчиком, статус и скачивание файла"""
+
+        author = await create_author(name="Tom")
+        model = await create_book(title="Alen", author=author)
+
+        response = await client.post("/books/exports", json={"format": "csv"}, headers=superadmin_headers)
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        job = response.json()
+        assert job["status"] == "pending"
+        assert job["reused"] is False
+        assert published == [("books-export", job["id"])]
+
+        response = await client.get(f"/books/exports/{job['id']}/download", headers=superadmin_headers)
+        assert response.status_code == status.HTTP_409_CONFLICT
+
+        await ExportJobService(db_session).run(job["id"])
+
+        response = await client.get(f"/books/exports/{job['id']}", headers=superadmin_headers)
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["status"] == "done"
+        assert data["progress"] == 100
+        assert data["rows"] == data["total"] == 1
+        assert data["finished_at"] is not None
+
+        response = await client.get(f"/books/exports/{job['id']}/download", headers=superadmin_headers)
+        assert response.status_code == status.HTTP_200_OK
+        assert "books_export.csv" in response.headers["content-disposition"]
+        assert response.content.decode("utf-8-sig").splitlines() == ["ID;Title;Author", f"{model.id};Alen;Tom"]
+
+    @pytest.mark.asyncio
+    async def test_export_job_reuse(self, client, db_session, create_book, superadmin_headers, published)->None:
+        """Пока данные не менялись, новая задача получает готовый файл без повторной выгрузки"""
+
+        await create_book()
+
+        response = await client.post("/books/exports", json={"format": "xlsx"}, headers=superadmin_headers)
+        job = response.json()
+        await ExportJobService(db_session).run(job["id"])
+
+        response = await client.post("/books/exports", json={"format": "xlsx"}, headers=superadmin_headers)
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        data = response.json()
+        assert data["id"] != job["id"]
+        assert data["status"] == "done"
+        assert data["reused"] is True
+        assert len(published) == 1
+
+        response = await client.get(f"/books/exports/{data['id']}/download", headers=superadmin_headers)
+        assert response.status_code == status.HTTP_200_OK
+
+        # другой формат - отдельная выгрузка
+        response = await client.post("/books/exports", json={"format": "csv"}, headers=superadmin_headers)
+        assert response.json()["status"] == "pending"
+
+        # данные изменились - выгружаем заново
+        await create_book()
+        response = await client.post("/books/exports", json={"format": "xlsx"}, headers=superadmin_headers)
+        assert response.json()["status"] == "pending"
+        assert len(published) == 3
+
+    @pytest.mark.asyncio
+    async def test_reused_file_is_kept(self, client, db_session, create_book, superadmin_headers, published)->None:
+        """Переиспользованный файл живёт job_ttl от последней выдачи, а не от выгрузки"""
+
+        await create_book()
+
+        response = await client.post("/books/exports", json={"format": "csv"}, headers=superadmin_headers)
+        job = response.json()
+        await ExportJobService(db_session).run(job["id"])
+        path = config.export.root_path / f"books_{job['id']}.csv"
+
+        # файл выгружен почти job_ttl назад
+        expires_soon = time.time() - config.export.job_ttl + 60
+        os.utime(path, (expires_soon, expires_soon))
+
+        response = await client.post("/books/exports", json={"format": "csv"}, headers=superadmin_headers)
+        assert response.json()["reused"] is True
+        assert path.stat().st_mtime > expires_soon + 60
+
+    @pytest.mark.asyncio
+    async def test_export_job_count_failed(self, db_session, published, fake_redis, monkeypatch)->None:
+        """Ошибка до начала записи файла тоже завершает задачу статусом failed"""
+
+        async def count(self):
+            raise RuntimeError("db is down")
+
+        monkeypatch.setattr(BookExporter, "count", count)
+
+        service = ExportJobService(db_session)
+        job = await service.create(ExportFormat.CSV, user_id=1)
+        await service.run(job.id)
+
+        job = await ExportJobStore(fake_redis).get(job.id)
+        assert job.status == ExportJobStatus.FAILED
+        assert job.error == "db is down"
+        assert job.file is None
+
+    @pytest.mark.asyncio
+    async def test_export_job_publish_failed(self, db_session, published, fake_redis, monkeypatch)->None:
+        """Задача, не попавшая в очередь, не остаётся в статусе pending"""
+
+        async def publish(message, queue):
+            raise ConnectionError("rabbitmq is down")
+
+        monkeypatch.setattr(export_jobs.broker, "publish", publish)
+
+        with pytest.raises(ConnectionError):
+            await ExportJobService(db_session).create(ExportFormat.CSV, user_id=1)
+
+        jobs = [ExportJob.model_validate_json(value) for value in fake_redis.data.values()]
+        assert [(job.status, job.error) for job in jobs] == [(ExportJobStatus.FAILED, "rabbitmq is down")]
+
+    @pytest.mark.asyncio
+    async def test_export_job_of_other_user(
+        self,
+        client,
+        create_user,
+        auth_header,
+        superadmin_headers,
+        published
+    ) -> None:
+        """Задача видна только создавшему её пользователю"""
+
+        response = await client.post("/books/exports", json={"format": "csv"}, headers=superadmin_headers)
+        job = response.json()
+
+        user = await create_user(permissions=[Permissions.BOOK_EXPORT.value])
+        header = await auth_header(user)
+
+        response = await client.get(f"/books/exports/{job['id']}", headers=header)
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    @pytest.mark.asyncio
+    async def test_export_job_not_found(self, client, superadmin_headers, published)->None:
+        response = await client.get("/books/exports/unknown", headers=superadmin_headers)
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    @pytest.mark.asyncio
+    async def test_not_perm(self, client, create_user, auth_header)->None:
+        user = await create_user(permissions=[Permissions.BOOK_LIST.value])
+        header = await auth_header(user)
+
+        response = await client.post("/books/exports", json={"format": "csv"}, headers=header)
+        assert response.status_code == status.HTTP_403_FORBIDDEN
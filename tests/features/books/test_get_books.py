@@ -3,6 +3,7 @@ from datetime import datetime
 from fastapi import status
 
 from src.rbac.permissions import Permissions
+from src.utils.pagination import PaginationHelper
 
 
 class TestGetBooks:
@@ -78,6 +79,17 @@ class TestGetBooks:
         assert data["data"][0]["title"] == model.title
         assert data["meta"]["total"] == 1
 
+    @pytest.mark.asyncio
+    async def test_get_book_with_wildcard_search(self, client, create_book, superadmin_headers)->None:
+        """_ в поиске ищется как символ"""
+
+        model = await create_book(title="snake_case")
+        await create_book(title="snake case")
+
+        response = await client.get("/books", params={"search": "e_c"}, headers=superadmin_headers)
+        assert response.status_code == status.HTTP_200_OK
+        assert [book["id"] for book in response.json()["data"]] == [model.id]
+
     @pytest.mark.asyncio
     async def test_get_book_with_author_id(self, client, create_book, create_author, superadmin_headers)->None:
         """Получить книги по автору"""
@@ -171,6 +183,7 @@ class TestGetBooks:
         assert response.status_code == status.HTTP_200_OK
         data = response.json()
         assert len(data["data"]) == 2
+        assert data["meta"]["total"] == 2
 
     @pytest.mark.asyncio
     async def test_get_books_with_sort_asc_as_title(self, client, create_book, superadmin_headers)->None:
@@ -236,6 +249,232 @@ class TestGetBooks:
         assert data["data"][1]["title"] == model_3.title
         assert data["data"][2]["title"] == model_1.title
 
+    @pytest.mark.asyncio
+    async def test_get_books_with_sort_as_relevance(self, client, create_book, superadmin_headers)->None:
+        """Получить книги по поиску, отсортированные по релевантности"""
+
+        model_1 = await create_book(title="My notebook")
+        model_2 = await create_book(title="Book")
+        model_3 = await create_book(title="Bookkeeping basics")
+        await create_book(title="Tester")
+
+        response = await client.get("/books?search=book&sort_by=relevance", headers=superadmin_headers)
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert [i["id"] for i in data["data"]] == [model_2.id, model_3.id, model_1.id]
+        assert data["meta"]["total"] == 3
+
+    @pytest.mark.asyncio
+    async def test_get_books_with_cursor(self, client, create_book, superadmin_headers)->None:
+        """Получить все книги, переходя по курсору (keyset-пагинация)"""
+
+        model_1 = await create_book(title="Tom")
+        model_2 = await create_book(title="Alen")
+        model_3 = await create_book(title="John")
+
+        response = await client.get("/books?limit=2", headers=superadmin_headers)
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert [i["id"] for i in data["data"]] == [model_2.id, model_3.id]
+        assert data["meta"]["next_cursor"] is not None
+
+        response = await client.get(
+            "/books", params={"limit": 2, "cursor": data["meta"]["next_cursor"]}, headers=superadmin_headers
+        )
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert [i["id"] for i in data["data"]] == [model_1.id]
+        assert data["meta"]["count"] == 1
+        assert data["meta"]["total"] == 3
+        assert data["meta"]["next_cursor"] is None
+
+    @pytest.mark.asyncio
+    async def test_get_books_with_cursor_desc_as_page(self, client, create_book, superadmin_headers)->None:
+        """Курсор по убыванию кол-ва страниц, с одинаковыми значениями сортировки"""
+
+        model_1 = await create_book(page=100)
+        model_2 = await create_book(page=100)
+        model_3 = await create_book(page=50)
+
+        params = {"limit": 1, "sort_by": "page", "sort_order": "desc"}
+        ids = []
+        for _ in range(3):
+            response = await client.get("/books", params=params, headers=superadmin_headers)
+            assert response.status_code == status.HTTP_200_OK
+            data = response.json()
+            ids += [i["id"] for i in data["data"]]
+            params["cursor"] = data["meta"]["next_cursor"]
+
+        assert ids == [model_2.id, model_1.id, model_3.id]
+        assert params["cursor"] is None
+
+    @pytest.mark.asyncio
+    async def test_get_books_with_cursor_from_other_sort(self, client, create_books, superadmin_headers)->None:
+        """Курсор от другой сортировки не принимается"""
+
+        await create_books(count=3)
+
+        response = await client.get("/books?limit=1&sort_by=title", headers=superadmin_headers)
+        cursor = response.json()["meta"]["next_cursor"]
+
+        response = await client.get(
+            "/books", params={"limit": 1, "sort_by": "page", "cursor": cursor}, headers=superadmin_headers
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    @pytest.mark.asyncio
+    async def test_get_books_with_invalid_cursor(self, client, superadmin_headers)->None:
+        """Невалидный курсор"""
+
+        response = await client.get("/books?cursor=not-a-cursor", headers=superadmin_headers)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    @pytest.mark.asyncio
+    async def test_get_books_slim_view(self, client, create_author, create_book, superadmin_headers)->None:
+        """Облегчённый список книг: только поля списка и краткая информация об авторе"""
+
+        author = await create_author(name="Tom")
+        model_1 = await create_book(title="Alen", author=author)
+        await create_book(title="John", author=author)
+        await create_book(title="Deleted", author=author, deleted_at=datetime.now())
+
+        response = await client.get("/books?view=slim&limit=1", headers=superadmin_headers)
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+
+        assert data["meta"]["total"] == 2
+        assert data["meta"]["count"] == 1
+        assert data["meta"]["next_cursor"] is not None
+        assert len(data["data"]) == 1
+
+        item = data["data"][0]
+        assert item["id"] == model_1.id
+        assert item["title"] == "Alen"
+        assert item["author"] == {"id": author.id, "name": "Tom"}
+        assert "description" not in item
+        assert "images" not in item
+
+        response = await client.get(
+            "/books",
+            params={"view": "slim", "limit": 1, "cursor": data["meta"]["next_cursor"]},
+            headers=superadmin_headers,
+        )
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert [i["title"] for i in data["data"]] == ["John"]
+        assert data["meta"]["next_cursor"] is None
+
+    @pytest.mark.asyncio
+    async def test_get_books_slim_view_with_relevance(self, client, create_book, superadmin_headers)->None:
+        """Облегчённый список книг с сортировкой по релевантности"""
+
+        await create_book(title="My notebook")
+        await create_book(title="Book")
+        await create_book(title="Other")
+
+        response = await client.get(
+            "/books?view=slim&search=book&sort_by=relevance", headers=superadmin_headers
+        )
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert [i["title"] for i in data["data"]] == ["Book", "My notebook"]
+        assert data["meta"]["total"] == 2
+
+    @pytest.mark.asyncio
+    async def test_get_books_with_estimated_count(self, client, create_books, superadmin_headers)->None:
+        """Оценка total: для небольшой выборки считается точное значение"""
+
+        await create_books(3)
+
+        response = await client.get("/books?limit=2&count_strategy=estimated", headers=superadmin_headers)
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+
+        assert len(data["data"]) == 2
+        assert data["meta"]["total"] == 3
+        assert data["meta"]["total_is_exact"] is True
+
+    @pytest.mark.asyncio
+    async def test_get_books_with_cached_count(self, client, create_books, superadmin_headers)->None:
+        """Кеш total выключен в тестах - считается точное значение"""
+
+        await create_books(3)
+
+        response = await client.get("/books?count_strategy=cached", headers=superadmin_headers)
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+
+        assert data["meta"]["total"] == 3
+        assert data["meta"]["total_is_exact"] is True
+
+    @pytest.mark.asyncio
+    async def test_get_books_with_estimated_count_of_large_table(
+            self,
+            client,
+            create_books,
+            superadmin_headers,
+            monkeypatch,
+    ) -> None:
+        """Оценка total для большой таблицы, списки с фильтрами считаются точно"""
+
+        async def estimate_rows(session, stmt):
+            return 50_000
+
+        monkeypatch.setattr(PaginationHelper, "_estimate_rows", estimate_rows)
+        await create_books(3)
+
+        response = await client.get("/books?count_strategy=estimated", headers=superadmin_headers)
+        assert response.json()["meta"]["total"] == 50_000
+        assert response.json()["meta"]["total_is_exact"] is False
+
+        response = await client.get("/books?count_strategy=estimated&search=a&deleted=all", headers=superadmin_headers)
+        assert response.json()["meta"]["total_is_exact"] is True
+
+        response = await client.get("/authors?count_strategy=estimated&search=a", headers=superadmin_headers)
+        assert response.json()["meta"]["total_is_exact"] is True
+
+    @pytest.mark.asyncio
+    async def test_get_books_with_cached_count_in_redis(
+            self,
+            client,
+            create_books,
+            superadmin_headers,
+            cache_enabled,
+    ) -> None:
+        """total берётся из кеша до изменения книг через API"""
+
+        books = await create_books(3)
+
+        response = await client.get("/books?count_strategy=cached", headers=superadmin_headers)
+        assert response.json()["meta"]["total"] == 3
+        count_keys = [key for key in cache_enabled.data if ":count:" in key]
+        assert len(count_keys) == 1
+
+        # книга добавлена в обход API - кеш не сброшен, total из кеша
+        await create_books(1)
+        response = await client.get("/books?count_strategy=cached", headers=superadmin_headers)
+        assert response.json()["meta"]["total"] == 3
+
+        # другие фильтры - отдельная запись кеша
+        response = await client.get("/books?count_strategy=cached&deleted=all", headers=superadmin_headers)
+        assert response.json()["meta"]["total"] == 4
+        assert len([key for key in cache_enabled.data if ":count:" in key]) == 2
+
+        # удаление через API увеличивает версию кеша книг - total считается заново
+        response = await client.delete(f"/books/{books[0].id}", headers=superadmin_headers)
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+
+        response = await client.get("/books?count_strategy=cached", headers=superadmin_headers)
+        assert response.json()["meta"]["total"] == 3
+        assert len([key for key in cache_enabled.data if ":count:" in key]) == 3
+
+    @pytest.mark.asyncio
+    async def test_get_books_with_wrong_count_strategy(self, client, superadmin_headers)->None:
+        """Неизвестный способ подсчёта total"""
+
+        response = await client.get("/books?count_strategy=wrong", headers=superadmin_headers)
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_CONTENT
+
     @pytest.mark.asyncio
     async def test_not_perm(self, client, create_user, auth_header)->None:
         user = await create_user(permissions=[Permissions.BOOK_SHOW.value])
@@ -0,0 +1,130 @@
+import pytest
+from datetime import datetime
+from fastapi import status
+
+from src.core.cache import CACHE_REQUESTS
+from src.rbac.permissions import Permissions
+
+
+class TestGetBooksFacets:
+    """Тесты для счётчиков фильтров списка книг"""
+
+    @pytest.fixture
+    async def catalogue(self, create_author, create_book):
+        tom = await create_author(name="Tom")
+        alen = await create_author(name="Alen")
+
+        await create_book(title="Python basics", author=tom, is_available=True)
+        await create_book(title="Python advanced", author=tom, is_available=False)
+        await create_book(title="Old python", author=tom, is_available=True, deleted_at=datetime.now())
+        await create_book(title="Python for kids", author=alen, is_available=True)
+        await create_book(title="Rust", author=alen, is_available=True)
+
+        return tom, alen
+
+    @pytest.mark.asyncio
+    async def test_facets(self, client, catalogue, create_user, auth_header)->None:
+        """Счётчики без фильтров (по умолчанию - только не удалённые книги)"""
+        tom, alen = catalogue
+        user = await create_user(permissions=[Permissions.BOOK_LIST.value])
+        header = await auth_header(user)
+
+        response = await client.get("/books/facets", headers=header)
+        assert response.status_code == status.HTTP_200_OK
+
+        assert response.json() == {
+            "total": 4,
+            "availability": {"available": 3, "unavailable": 1},
+            "deleted": {"active": 4, "deleted": 1},
+            "authors": [
+                {"id": alen.id, "name": "Alen", "count": 2},
+                {"id": tom.id, "name": "Tom", "count": 2},
+            ],
+        }
+
+    @pytest.mark.asyncio
+    async def test_facets_with_filters(self, client, catalogue, superadmin_headers)->None:
+        """Каждый фасет учитывает все фильтры, кроме своего"""
+        tom, alen = catalogue
+
+        response = await client.get(
+            "/books/facets",
+            params={"search": "python", "author_id": tom.id, "is_available": True},
+            headers=superadmin_headers,
+        )
+        assert response.status_code == status.HTTP_200_OK
+
+        assert response.json() == {
+            "total": 1,
+            "availability": {"available": 1, "unavailable": 1},
+            "deleted": {"active": 1, "deleted": 1},
+            "authors": [
+                {"id": alen.id, "name": "Alen", "count": 1},
+                {"id": tom.id, "name": "Tom", "count": 1},
+            ],
+        }
+
+    @pytest.mark.asyncio
+    async def test_facets_with_authors_limit(self, client, catalogue, superadmin_headers)->None:
+        response = await client.get("/books/facets?deleted=all&authors_limit=1", headers=superadmin_headers)
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+
+        assert data["total"] == 5
+        assert [a["name"] for a in data["authors"]] == ["Tom"]
+        assert data["authors"][0]["count"] == 3
+
+    @pytest.mark.asyncio
+    async def test_facets_empty(self, client, superadmin_headers)->None:
+        response = await client.get("/books/facets", headers=superadmin_headers)
+        assert response.status_code == status.HTTP_200_OK
+
+        assert response.json() == {
+            "total": 0,
+            "availability": {"available": 0, "unavailable": 0},
+            "deleted": {"active": 0, "deleted": 0},
+            "authors": [],
+        }
+
+    @pytest.mark.asyncio
+    async def test_facets_cache(self, client, catalogue, create_book, superadmin_headers, cache_enabled)->None:
+        """Счётчики кешируются по фильтрам и сбрасываются при изменении книг через API"""
+        tom, alen = catalogue
+
+        def requests_count(result: str) -> float:
+            return CACHE_REQUESTS.labels(cache="facets", result=result)._value.get()
+
+        hits, misses = requests_count("hit"), requests_count("miss")
+
+        response = await client.get("/books/facets", headers=superadmin_headers)
+        assert response.json()["total"] == 4
+
+        # книга добавлена в обход API - кеш не сброшен
+        book = await create_book(title="Go", author=alen, is_available=True)
+        response = await client.get("/books/facets", headers=superadmin_headers)
+        assert response.json()["total"] == 4
+        assert (requests_count("hit"), requests_count("miss")) == (hits + 1, misses + 1)
+
+        # другие фильтры - отдельная запись кеша
+        response = await client.get("/books/facets", params={"author_id": alen.id}, headers=superadmin_headers)
+        assert response.json()["total"] == 3
+        assert requests_count("miss") == misses + 2
+
+        response = await client.delete(f"/books/{book.id}", headers=superadmin_headers)
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+
+        response = await client.get("/books/facets", headers=superadmin_headers)
+        assert response.json()["total"] == 4
+        assert response.json()["authors"] == [
+            {"id": alen.id, "name": "Alen", "count": 2},
+            {"id": tom.id, "name": "Tom", "count": 2},
+        ]
+        assert requests_count("miss") == misses + 3
+
+    @pytest.mark.asyncio
+    async def test_not_perm(self, client, create_user, auth_header)->None:
+        user = await create_user(permissions=[Permissions.BOOK_SHOW.value])
+        header = await auth_header(user)
+
+        response = await client.get("/books/facets", headers=header)
+        assert response.status_code == status.HTTP_403_FORBIDDEN
@@ -0,0 +1,124 @@
+import pytest
+from datetime import datetime
+from fastapi import status
+
+from src.books.models import BOOK_MORPH_NAME
+from src.books.stats import CatalogueStatsService, StatsRefresher
+from src.config import config
+from src.core.cache import RedisCache
+from src.media.models import Media
+from src.rbac.permissions import Permissions
+
+
+class TestGetBooksStats:
+    """Тесты статистики каталога"""
+
+    @pytest.fixture
+    async def catalogue(self, db_session, create_author, create_book):
+        tom = await create_author(name="Tom")
+        alen = await create_author(name="Alen")
+        await create_author(name="Deleted", deleted_at=datetime.now())
+
+        book = await create_book(title="Python basics", author=tom, is_available=True)
+        await create_book(title="Python advanced", author=tom, is_available=False)
+        await create_book(title="Old python", author=tom, is_available=True, deleted_at=datetime.now())
+        await create_book(title="Rust", author=alen, is_available=True)
+
+        for i in range(2):
+            db_session.add(Media(
+                filename=f"{i}.jpg",
+                path=f"books/{i}.jpg",
+                mimetype="image/jpeg",
+                size=100,
+                entity_type=BOOK_MORPH_NAME,
+                entity_id=book.id,
+            ))
+        await db_session.commit()
+
+        return tom, alen
+
+    @pytest.mark.asyncio
+    async def test_stats(self, client, db_session, catalogue, create_user, auth_header)->None:
+        """Статистика после обновления представления"""
+        tom, alen = catalogue
+        user = await create_user(permissions=[Permissions.BOOK_LIST.value])
+        header = await auth_header(user)
+
+        await CatalogueStatsService(db_session).refresh()
+
+        response = await client.get("/books/stats", headers=header)
+        assert response.status_code == status.HTTP_200_OK
+
+        assert response.json() == {
+            "authors_count": 2,
+            "books_count": 3,
+            "availability": {"available": 2, "unavailable": 1},
+            "deleted_books_count": 1,
+            "images_count": 2,
+            "authors": [
+                {
+                    "id": tom.id,
+                    "name": "Tom",
+                    "books_count": 2,
+                    "available_books_count": 1,
+                    "deleted_books_count": 1,
+                    "images_count": 2,
+                },
+                {
+                    "id": alen.id,
+                    "name": "Alen",
+                    "books_count": 1,
+                    "available_books_count": 1,
+                    "deleted_books_count": 0,
+                    "images_count": 0,
+                },
+            ],
+        }
+
+    @pytest.mark.asyncio
+    async def test_stats_until_refresh(
+        self,
+        client,
+        db_session,
+        catalogue,
+        create_book,
+        create_user,
+        auth_header
+    ) -> None:
+        """Новые книги попадают в статистику только после обновления"""
+        tom, _ = catalogue
+        user = await create_user(permissions=[Permissions.BOOK_LIST.value])
+        header = await auth_header(user)
+
+        await CatalogueStatsService(db_session).refresh()
+        await create_book(title="Go", author=tom)
+
+        response = await client.get("/books/stats", headers=header, params={"authors_limit": 1})
+        assert response.json()["books_count"] == 3
+        assert [author["name"] for author in response.json()["authors"]] == ["Tom"]
+
+        await CatalogueStatsService(db_session).refresh()
+
+        response = await client.get("/books/stats", headers=header)
+        assert response.json()["books_count"] == 4
+
+    @pytest.mark.asyncio
+    async def test_refresh_if_changed(self, db_session, fake_redis)->None:
+        """Фоновое обновление пропускается, пока версия кеша книг не изменилась"""
+        cache = RedisCache(fake_redis)
+        refresher = StatsRefresher(lambda: db_session, cache=cache)
+
+        assert await refresher.refresh_if_changed() is True
+        assert await refresher.refresh_if_changed() is False
+
+        await cache.bump(config.cache.namespace.books)
+        assert await refresher.refresh_if_changed() is True
+
+    @pytest.mark.asyncio
+    async def test_stats_forbidden(self, client, create_user, auth_header)->None:
+        """Без права на просмотр книг - 403"""
+        user = await create_user(permissions=[])
+        header = await auth_header(user)
+
+        response = await client.get("/books/stats", headers=header)
+        assert response.status_code == status.HTTP_403_FORBIDDEN
@@ -0,0 +1,173 @@
+import json
+
+import pytest
+from sqlalchemy import func, select
+
+import src.books.importer as importer
+from src.books.importer import CatalogueFormatError, iter_catalogue
+from src.books.models import Author, Book
+from src.books.service import BookService
+
+
+def write_catalogue(path, entries) -> str:
+    path.write_text(json.dumps(entries, ensure_ascii=False), encoding="utf-8")
+    return str(path)
+
+
+class TestImportBooks:
+    """Тесты загрузки каталога книг из json"""
+
+    @pytest.mark.asyncio
+    async def test_import(self, db_session, create_author, create_book, tmp_path)->None:
+        """Новые авторы и книги добавляются пачками, существующие - пропускаются"""
+
+        author = await create_author(name="Tom")
+        await create_book(title="Existing", author=author)
+
+        path = write_catalogue(tmp_path / "books.json", [
+            {
+                "author": "Tom",
+                "description": "Ignored, author exists",
+                "titles": [
+                    {"name": "Existing", "description": "Skip", "page": 10},
+                    {"name": "First", "description": "Text", "page": 100},
+                ],
+            },
+            {
+                "author": "John",
+                "description": "New author",
+                "titles": [
+                    {"name": "Second", "description": None, "page": 200},
+                    {"name": "Third", "description": None, "page": None},
+                    {"name": "First", "description": "Duplicate in file", "page": 1},
+                ],
+            },
+        ])
+
+        stats = await BookService(db_session).import_json_to_db(path, batch_size=2)
+
+        assert stats.rows == 5
+        assert stats.authors == 1
+        assert stats.books == 3
+        assert stats.skipped == 2
+        # существующие названия пропускает БД: пачки - Existing/First, Second/Third, First
+        assert stats.batches == 3
+        assert stats.rows_per_sec > 0
+
+        john = await db_session.scalar(select(Author).where(Author.name == "John"))
+        assert john.description == "New author"
+
+        books = {
+            book.title: book
+            for book in await db_session.scalars(select(Book).where(Book.title.in_(["First", "Second", "Third"])))
+        }
+        assert books["First"].author_id == author.id
+        assert books["First"].page == 100
+        assert books["Second"].author_id == john.id
+        assert books["Third"].page == 0
+
+    @pytest.mark.asyncio
+    async def test_import_twice(self, db_session, tmp_path)->None:
+        """Повторная загрузка того же файла ничего не добавляет"""
+
+        path = write_catalogue(tmp_path / "books.json", [
+            {"author": "Tom", "description": None, "titles": [{"name": "Book", "description": None, "page": 1}]},
+        ])
+
+        await BookService(db_session).import_json_to_db(path)
+        stats = await BookService(db_session).import_json_to_db(path)
+
+        assert stats.books == 0
+        assert stats.authors == 0
+        assert stats.skipped == 1
+        assert await db_session.scalar(select(func.count(Book.id))) == 1
+
+    @pytest.mark.asyncio
+    async def test_import_by_small_batches(self, db_session, tmp_path)->None:
+        """Пачка записывается посреди книг автора, авторы без книг тоже добавляются"""
+
+        path = write_catalogue(tmp_path / "books.json", [
+            {"author": "Tom", "titles": [{"name": "One", "page": 1}, {"name": "Two", "page": 2}]},
+            {"author": "John", "titles": []},
+        ])
+
+        stats = await BookService(db_session).import_json_to_db(path, batch_size=1)
+
+        assert (stats.authors, stats.books, stats.batches) == (2, 2, 3)
+        tom = await db_session.scalar(select(Author).where(Author.name == "Tom"))
+        titles = await db_session.scalars(select(Book.title).where(Book.author_id == tom.id))
+        assert sorted(titles) == ["One", "Two"]
+
+    @pytest.mark.asyncio
+    async def test_import_ndjson(self, db_session, tmp_path)->None:
+        """Загрузка NDJSON (по записи на строку)"""
+
+        path = tmp_path / "books.ndjson"
+        path.write_text(
+            '{"author": "Tom", "titles": [{"name": "One", "page": 1}]}\n'
+            "\n"
+            '{"author": "John", "titles": [{"name": "Two", "page": 2}, {"name": "Three", "page": 3}]}\n',
+            encoding="utf-8",
+        )
+
+        stats = await BookService(db_session).import_json_to_db(path)
+
+        assert stats.authors == 2
+        assert stats.books == 3
+
+
+class TestIterCatalogue:
+    """Тесты потокового чтения файла каталога"""
+
+    def test_json_array_read_by_chunks(self, tmp_path, monkeypatch)->None:
+        """Записи массива читаются по одной, даже если запись больше прочитанного куска"""
+        monkeypatch.setattr(importer, "READ_CHUNK_SIZE", 7)
+
+        entries = [
+            {"author": "Айзек Азимов", "titles": [{"name": "Я, робот", "page": 300}]},
+            {"author": "Tom, [1]", "titles": []},
+            {"author": "John \\\"quoted\\\"", "titles": [{"name": "]", "page": None}]},
+        ]
+        path = write_catalogue(tmp_path / "books.json", entries)
+
+        assert list(iter_catalogue(path)) == entries
+
+    def test_json_array_empty(self, tmp_path)->None:
+        path = tmp_path / "books.json"
+        path.write_text(" \n[ \n]\n", encoding="utf-8")
+
+        assert list(iter_catalogue(path)) == []
+
+    def test_json_array_is_lazy(self, tmp_path)->None:
+        """Ошибка в конце файла не мешает прочитать записи до неё"""
+        path = tmp_path / "books.json"
+        path.write_text('[{"author": "Tom", "titles": []}, {"author": ', encoding="utf-8")
+
+        entries = iter_catalogue(path)
+        assert next(entries) == {"author": "Tom", "titles": []}
+        with pytest.raises(CatalogueFormatError):
+            next(entries)
+
+    def test_json_array_entry_too_large(self, tmp_path, monkeypatch)->None:
+        """Битая запись не дочитывает в память весь оставшийся файл"""
+        monkeypatch.setattr(importer, "READ_CHUNK_SIZE", 7)
+        monkeypatch.setattr(importer, "MAX_ENTRY_SIZE", 50)
+
+        path = tmp_path / "books.json"
+        path.write_text('[{"author": "Tom", "titles": []}, {"author": "' + "x" * 1000 + '"}]', encoding="utf-8")
+
+        entries = iter_catalogue(path)
+        assert next(entries) == {"author": "Tom", "titles": []}
+        with pytest.raises(CatalogueFormatError, match="larger than 50"):
+            next(entries)
+
+    def test_ndjson_entry_too_large(self, tmp_path, monkeypatch)->None:
+        monkeypatch.setattr(importer, "MAX_ENTRY_SIZE", 50)
+
+        path = tmp_path / "books.ndjson"
+        path.write_text('{"author": "Tom", "titles": []}\n{"author": "' + "x" * 1000 + '"}\n', encoding="utf-8")
+
+        entries = iter_catalogue(path)
+        assert next(entries) == {"author": "Tom", "titles": []}
+        with pytest.raises(CatalogueFormatError, match="larger than 50"):
+            next(entries)
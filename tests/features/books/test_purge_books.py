@@ -0,0 +1,77 @@
+import pytest
+from datetime import datetime, timedelta
+from sqlalchemy import select
+
+from src.books.models import BOOK_MORPH_NAME, Author, Book
+from src.books.purge import CataloguePurger
+from src.media.models import Media
+from src.media.storage import LocalStorageBackend
+
+
+class TestPurgeBooks:
+    """Тесты очистки каталога от удалённых записей"""
+
+    @pytest.mark.asyncio
+    async def test_purge(self, db_session, create_author, create_book, tmp_path)->None:
+        """Удаляются только записи, удалённые раньше срока хранения, вместе с картинками"""
+        long_ago = datetime.now() - timedelta(days=40)
+        recently = datetime.now() - timedelta(days=1)
+
+        tom = await create_author(name="Tom", deleted_at=long_ago)
+        alen = await create_author(name="Alen", deleted_at=long_ago)
+        john = await create_author(name="John", deleted_at=long_ago)
+
+        old_first = await create_book(title="Old first", author=tom, deleted_at=long_ago)
+        old_second = await create_book(title="Old second", author=tom, deleted_at=long_ago)
+        recent = await create_book(title="Recent", author=alen, deleted_at=recently)
+        active = await create_book(title="Active", author=alen)
+
+        storage = LocalStorageBackend(tmp_path)
+        for book in (old_first, active):
+            await storage.save(b"image", f"book/{book.id}/image.jpg")
+            await storage.save(b"thumb", f"book/{book.id}/image_small.jpg")
+            db_session.add(Media(
+                filename="image.jpg",
+                path=f"book/{book.id}/image.jpg",
+                mimetype="image/jpeg",
+                size=5,
+                entity_type=BOOK_MORPH_NAME,
+                entity_id=book.id,
+                thumbnails={"small": f"book/{book.id}/image_small.jpg"},
+            ))
+        await db_session.commit()
+
+        purger = CataloguePurger(db_session, retention_days=30, batch_size=1, batch_pause=0)
+        purger.storage = storage
+        stats = await purger.run()
+
+        assert stats.books == 2
+        assert stats.media == 1
+        # Tom и John (без книг) удалены, у Alen остались книги
+        assert stats.authors == 2
+        assert stats.skipped_authors == 1
+        assert stats.batches == 4
+
+        book_ids = set(await db_session.scalars(select(Book.id)))
+        assert {old_first.id, old_second.id}.isdisjoint(book_ids)
+        assert {recent.id, active.id} <= book_ids
+
+        author_ids = set(await db_session.scalars(select(Author.id)))
+        assert {tom.id, john.id}.isdisjoint(author_ids)
+        assert alen.id in author_ids
+
+        assert not (tmp_path / f"book/{old_first.id}/image.jpg").exists()
+        assert not (tmp_path / f"book/{old_first.id}/image_small.jpg").exists()
+        assert (tmp_path / f"book/{active.id}/image.jpg").exists()
+        assert await db_session.scalar(select(Media.entity_id)) == active.id
+
+    @pytest.mark.asyncio
+    async def test_purge_nothing(self, db_session, create_book)->None:
+        """Без просроченных записей ничего не удаляется"""
+        await create_book(deleted_at=datetime.now())
+
+        stats = await CataloguePurger(db_session, retention_days=30, batch_pause=0).run()
+
+        assert stats.books == 0
+        assert stats.authors == 0
+        assert stats.batches == 0
@@ -0,0 +1,127 @@
+import json
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import event, text
+
+from src.books.schemas import AuthorFilterSchema, BookFilterSchema
+from src.books.service import BookService
+
+AUTHORS = 2000
+BOOKS_PER_AUTHOR = 10
+
+INDEX_SCANS = {"Index Scan", "Index Only Scan", "Bitmap Index Scan"}
+
+
+@contextmanager
+def capture_queries(db_session):
+    """Собрать SQL (с параметрами), который выполняется в сессии"""
+    queries = []
+    connection = db_session.bind.sync_connection
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        queries.append((statement, parameters))
+
+    event.listen(connection, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield queries
+    finally:
+        event.remove(connection, "before_cursor_execute", before_cursor_execute)
+
+
+def plan_nodes(plan: dict):
+    """Все узлы плана (EXPLAIN FORMAT JSON) рекурсивно"""
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from plan_nodes(child)
+
+
+async def explain_page_query(db_session, queries) -> list[dict]:
+    """Узлы плана запроса страницы (первый запрос с LIMIT)"""
+    statement, parameters = next((s, p) for s, p in queries if "LIMIT" in s)
+
+    connection = await db_session.connection()
+    result = await connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters)
+    plan = result.scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+
+    return list(plan_nodes(plan[0]["Plan"]))
+
+
+def assert_index_scan(nodes: list[dict], table: str, *indexes: str) -> None:
+    """Таблица читается без seq scan, хотя бы одним из индексов indexes"""
+    scans = [
+        (node["Node Type"], node.get("Index Name"))
+        for node in nodes
+        if node.get("Relation Name") == table or node.get("Index Name") in indexes
+    ]
+
+    assert ("Seq Scan", None) not in scans, scans
+    assert any(node_type in INDEX_SCANS and index in indexes for node_type, index in scans), scans
+
+
+class TestQueryPlans:
+    """Запросы списков на большом каталоге используют индексы, а не seq scan"""
+
+    @pytest.fixture
+    async def catalogue(self, db_session):
+        # ✨ Каталог генерируется на стороне БД: 2000 авторов по 10 книг, каждая десятая книга удалена
+        await db_session.execute(text(
+            "INSERT INTO authors (name) "
+            "SELECT 'Author ' || lpad(n::text, 5, '0') FROM generate_series(1, :authors) AS n"
+        ), {"authors": AUTHORS})
+        await db_session.execute(text(
+            "INSERT INTO books (title, page, is_available, author_id, deleted_at) "
+            "SELECT 'Book ' || lpad(n::text, 6, '0'), n % 700, n % 3 <> 0, a.id, "
+            "       CASE WHEN n % 10 = 0 THEN now() END "
+            "FROM generate_series(1, :books) AS n "
+            "JOIN authors a ON a.name = 'Author ' || lpad(((n - 1) % :authors + 1)::text, 5, '0')"
+        ), {"books": AUTHORS * BOOKS_PER_AUTHOR, "authors": AUTHORS})
+        # статистика нужна планировщику, чтобы он видел реальный размер таблиц
+        await db_session.execute(text("ANALYZE authors, books"))
+
+        return await db_session.scalar(text("SELECT min(id) FROM authors"))
+
+    @pytest.mark.asyncio
+    async def test_books_sorted_by_title(self, db_session, catalogue)->None:
+        """Первая страница списка (сортировка по названию)"""
+        with capture_queries(db_session) as queries:
+            await BookService(db_session).get_all_books(BookFilterSchema())
+
+        nodes = await explain_page_query(db_session, queries)
+        # название уникально, поэтому планировщик может выбрать и books_title_key с досортировкой по id
+        assert_index_scan(nodes, "books", "ix_books_active_title_id", "books_title_key")
+
+    @pytest.mark.asyncio
+    async def test_books_next_page(self, db_session, catalogue)->None:
+        """Страница по курсору (сортировка по количеству страниц)"""
+        service = BookService(db_session)
+        page = await service.get_books_list(BookFilterSchema(sort_by="page", sort_order="desc"))
+
+        with capture_queries(db_session) as queries:
+            await service.get_books_list(
+                BookFilterSchema(sort_by="page", sort_order="desc", cursor=page.next_cursor)
+            )
+
+        nodes = await explain_page_query(db_session, queries)
+        assert_index_scan(nodes, "books", "ix_books_active_page_id")
+
+    @pytest.mark.asyncio
+    async def test_books_by_author(self, db_session, catalogue)->None:
+        """Фильтр по автору"""
+        with capture_queries(db_session) as queries:
+            await BookService(db_session).get_books_list(BookFilterSchema(author_id=catalogue))
+
+        nodes = await explain_page_query(db_session, queries)
+        assert_index_scan(nodes, "books", "ix_books_active_author_id_title_id")
+
+    @pytest.mark.asyncio
+    async def test_authors_with_books_count(self, db_session, catalogue)->None:
+        """Список авторов с количеством книг"""
+        with capture_queries(db_session) as queries:
+            await BookService(db_session).get_all_authors(AuthorFilterSchema())
+
+        nodes = await explain_page_query(db_session, queries)
+        assert_index_scan(nodes, "authors", "ix_authors_active_name_id")
+        assert_index_scan(nodes, "books", "ix_books_active_author_id_title_id")
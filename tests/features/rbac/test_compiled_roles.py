@@ -0,0 +1,79 @@
+import pytest
+
+from src.rbac.compiled import CompiledRole, RoleRegistry, role_registry
+from src.rbac.permissions import PERMISSION_BITS, DefaultRole, Permissions
+from src.rbac.schemas import RoleUpdate
+from src.rbac.service import RbacService
+
+
+@pytest.fixture
+async def book_permissions(create_permission):
+    """Права на книги в БД"""
+    return {
+        permission.value: await create_permission(alias=permission.value, group="book")
+        for permission in (Permissions.BOOK_LIST, Permissions.BOOK_SHOW, Permissions.BOOK_DELETE)
+    }
+
+
+@pytest.fixture
+def registry_enabled(monkeypatch):
+    """Реестр ролей включён (в тестах по умолчанию выключен)"""
+    monkeypatch.setattr(RoleRegistry, "enabled", property(lambda self: True))
+    role_registry.clear()
+    yield
+    role_registry.clear()
+
+
+class TestCompiledRoles:
+    """Тесты скомпилированных наборов прав ролей"""
+
+    @pytest.mark.asyncio
+    async def test_compile(self, create_role, book_permissions)->None:
+        """Права роли - frozenset и битовая маска"""
+        role = await create_role(permissions=[Permissions.BOOK_LIST.value, Permissions.BOOK_SHOW.value])
+
+        compiled = CompiledRole.from_role(role)
+
+        assert compiled.permissions == {Permissions.BOOK_LIST.value, Permissions.BOOK_SHOW.value}
+        assert compiled.mask == (
+            PERMISSION_BITS[Permissions.BOOK_LIST.value] | PERMISSION_BITS[Permissions.BOOK_SHOW.value]
+        )
+        assert compiled.allows(Permissions.BOOK_LIST.value)
+        assert not compiled.allows(Permissions.BOOK_DELETE.value)
+        assert not compiled.is_default
+
+    @pytest.mark.asyncio
+    async def test_superadmin(self, create_role)->None:
+        """Superadmin имеет все права"""
+        role = await create_role(alias=DefaultRole.SUPERADMIN.value)
+
+        assert role.is_default
+        assert role.compiled.allows(Permissions.BOOK_DELETE.value)
+
+    @pytest.mark.asyncio
+    async def test_registry(self, create_role, book_permissions, registry_enabled)->None:
+        """Роль компилируется один раз, refresh - перекомпилирует"""
+        role = await create_role(permissions=[Permissions.BOOK_LIST.value])
+        registry = RoleRegistry(ttl=60)
+
+        compiled = registry.get(role)
+        role.permissions.clear()
+
+        assert registry.get(role) is compiled
+        assert registry.refresh(role).permissions == frozenset()
+        assert registry.get(role).permissions == frozenset()
+
+    @pytest.mark.asyncio
+    async def test_update_role_refreshes_registry(
+            self, db_session, create_role, book_permissions, registry_enabled
+    )->None:
+        """После update_role роль в реестре перекомпилирована"""
+        role = await create_role(permissions=[Permissions.BOOK_LIST.value])
+        assert role.compiled.allows(Permissions.BOOK_LIST.value)
+
+        permission = book_permissions[Permissions.BOOK_DELETE.value]
+        role = await RbacService(db_session).update_role(
+            role.id, RoleUpdate(alias=role.alias, permission_ids=[permission.id])
+        )
+
+        assert role.compiled.permissions == {Permissions.BOOK_DELETE.value}
@@ -1,8 +1,25 @@
 import pytest
+from cryptography.hazmat.primitives.asymmetric import rsa
 from faker import Faker
 from PIL import Image
 import io
 
+from src.auth.keys import KeyManager, SigningKey, get_key_manager
+
+
+@pytest.fixture(scope="session", autouse=True)
+def signing_keys():
+    """Одноразовая пара ключей JWT на тестовую сессию (jwt-*.pem в тестах не нужны)"""
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    manager = KeyManager([SigningKey.create(private_key.public_key(), private_key, "RS256")])
+
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(KeyManager, "from_config", classmethod(lambda cls: manager))
+        get_key_manager.cache_clear()
+        yield manager
+
+    get_key_manager.cache_clear()
+
 
 @pytest.fixture(scope="session")
 def fake():
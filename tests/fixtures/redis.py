@@ -0,0 +1,104 @@
+import time
+from fnmatch import fnmatch
+
+import pytest
+from redis.exceptions import ConnectionError
+
+from src.auth.principal import principal_cache
+
+
+class InMemoryRedis:
+    """Минимальная замена Redis (в тестах сервер Redis не поднимается)"""
+
+    def __init__(self, fail: bool = False):
+        self.data: dict[str, bytes] = {}
+        self.expires: dict[str, float] = {}
+        # часы для TTL ключей (тест может "перемотать" время)
+        self.clock = time.time
+        self.published: list[tuple[str, str]] = []
+        self.fail = fail
+
+    def _check(self):
+        if self.fail:
+            raise ConnectionError("redis is down")
+        self._expire()
+
+    def _expire(self):
+        now = self.clock()
+        for key in [key for key, expires_at in self.expires.items() if expires_at <= now]:
+            self.data.pop(key, None)
+            del self.expires[key]
+
+    @staticmethod
+    def _encode(value) -> bytes:
+        return value if isinstance(value, bytes) else str(value).encode()
+
+    async def get(self, key):
+        self._check()
+        return self.data.get(key)
+
+    async def set(self, key, value, ex=None, nx=False):
+        self._check()
+        if nx and key in self.data:
+            return None
+        self.data[key] = self._encode(value)
+        if ex is None:
+            self.expires.pop(key, None)
+        else:
+            self.expires[key] = self.clock() + ex
+        return True
+
+    async def mget(self, *keys):
+        self._check()
+        return [self.data.get(key) for key in keys]
+
+    async def publish(self, channel, message):
+        self._check()
+        self.published.append((channel, message))
+
+    async def scan_iter(self, match=None, count=None):
+        self._check()
+        for key in list(self.data):
+            if fnmatch(key, match or "*"):
+                yield key.encode()
+
+    async def delete(self, *keys):
+        self._check()
+        for key in keys:
+            self.data.pop(key, None)
+
+    async def incr(self, key):
+        self._check()
+        value = int(self.data.get(key, 0)) + 1
+        self.data[key] = self._encode(value)
+        return value
+
+
+@pytest.fixture
+def fake_redis():
+    """Redis в памяти"""
+    return InMemoryRedis()
+
+
+# модули, которые проверяют is_cache_enabled() (в тестах кеш выключен)
+CACHE_MODULES = (
+    "src.auth.principal",
+    "src.auth.service",
+    "src.books.purge",
+    "src.books.service",
+    "src.books.stats",
+    "src.media.service",
+    "src.utils.pagination",
+)
+
+
+@pytest.fixture
+def cache_enabled(monkeypatch, fake_redis) -> InMemoryRedis:
+    """Кеш данных включён и работает с Redis в памяти"""
+    monkeypatch.setattr("src.core.cache.get_redis", lambda: fake_redis)
+    for module in CACHE_MODULES:
+        monkeypatch.setattr(f"{module}.is_cache_enabled", lambda: True)
+
+    # версия principals, запомненная в памяти процесса другим тестом
+    monkeypatch.setattr(principal_cache, "_version", (0.0, None))
+    return fake_redis